@@ -0,0 +1,70 @@
+"""
+Compare two benchmark result files written by `benchmarks.run`.
+
+Usage:
+    python -m benchmarks.compare BASELINE.json CANDIDATE.json [--threshold 0.1]
+
+Exits with status 1 if any case got slower than the threshold allows, or
+fails in the candidate but not in the baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def _key(result: dict) -> tuple[str, str]:
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare benchmark results.")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown of the median reported as a regression.",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+    baseline_results = {_key(r): r for r in baseline["results"]}
+
+    print(f"baseline {baseline['commit'][:12]} -> candidate {candidate['commit'][:12]}")
+    regressions = 0
+    for result in candidate["results"]:
+        before = baseline_results.get(_key(result))
+        if before is None:
+            continue
+        if "error" in result and "error" not in before:
+            regressions += 1
+            print(
+                f"{result['name']:<32} {_key(result)[1]:<40} "
+                f"ERROR {result['error']}  REGRESSION"
+            )
+            continue
+        if "median_s" not in before or "median_s" not in result:
+            continue
+        ratio = result["median_s"] / before["median_s"]
+        marker = ""
+        if ratio > 1 + args.threshold:
+            marker = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 - args.threshold:
+            marker = "  improved"
+        print(
+            f"{result['name']:<32} {_key(result)[1]:<40} "
+            f"{before['median_s'] * 1e3:10.2f} ms -> {result['median_s'] * 1e3:10.2f} ms "
+            f"({ratio:5.2f}x){marker}"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+In-process stand-in for the Atriax REST API endpoints on the benchmark paths.
+
+Routes are discovered from the generated `atriax_client` endpoint modules, so
+the fake answers exactly the URLs the real client requests. Evaluation data is
+kept in memory per experiment.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+EXPERIMENT_ID = uuid.UUID("00000000-0000-4000-8000-000000000001")
+
+
+def _discover_routes() -> dict[tuple[str, str], str]:
+    """Map (method, path) of the benchmarked endpoints to handler names."""
+    from atriax_client.api.health import health_health_check
+    from atriax_client.api.metrics import metrics_read, metrics_write
+    from atriax_client.api.sample_evaluations import (
+        sample_evaluations_list_indices,
+        sample_evaluations_read,
+        sample_evaluations_write,
+    )
+
+    endpoints = {
+        "health": health_health_check._get_kwargs(),
+        "sample_evaluations_write": sample_evaluations_write._get_kwargs(
+            evaluation_experiment_id=EXPERIMENT_ID, body=[]
+        ),
+        "sample_evaluations_read": sample_evaluations_read._get_kwargs(
+            evaluation_experiment_id=EXPERIMENT_ID, body=[]
+        ),
+        "sample_evaluations_list_indices": sample_evaluations_list_indices._get_kwargs(
+            evaluation_experiment_id=EXPERIMENT_ID
+        ),
+        "metrics_write": metrics_write._get_kwargs(
+            evaluation_experiment_id=EXPERIMENT_ID, body=[]
+        ),
+        "metrics_read": metrics_read._get_kwargs(
+            evaluation_experiment_id=EXPERIMENT_ID
+        ),
+    }
+    return {
+        (kwargs["method"].upper(), urlparse(kwargs["url"]).path): name
+        for name, kwargs in endpoints.items()
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    routes: dict[tuple[str, str], str]
+    store: dict
+    lock: threading.Lock
+    wire: dict[str, int]
+    options: dict
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+    def _send(self, status: int, body) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if (
+            self.options["compress_responses"]
+            and len(data) >= 1024
+            and "gzip" in self.headers.get("Accept-Encoding", "")
+        ):
+            data = gzip.compress(data, compresslevel=5)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        with self.lock:
+            self.wire["sent"] += len(data)
+
+    def _json_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return None
+        data = self.rfile.read(length)
+        with self.lock:
+            self.wire["received"] += length
+        encoding = self.headers.get("Content-Encoding")
+        if encoding == "gzip":
+            data = gzip.decompress(data)
+        elif encoding == "zstd":
+            import zstandard
+
+            data = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+        return json.loads(data)
+
+    def _dispatch(self) -> None:
+        name = self.routes.get((self.command, urlparse(self.path).path))
+        if name is None:
+            return self._send(404, {"detail": f"no route for {self.path}"})
+        return getattr(self, name)()
+
+    do_GET = do_POST = do_PUT = do_DELETE = _dispatch
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(timezone.utc).isoformat()
+
+    def health(self):
+        self._send(200, {"status": "ok"})
+
+    def sample_evaluations_write(self):
+        items = self._json_body()
+        created = []
+        with self.lock:
+            for item in items:
+                record = {
+                    "id": str(uuid.uuid4()),
+                    "evaluation_experiment_id": str(EXPERIMENT_ID),
+                    "sample_index": item["sample_index"],
+                    "data": item["data"],
+                    "created_at": self._now(),
+                }
+                self.store["samples"][item["sample_index"]] = record
+                created.append(record)
+        self._send(200, created)
+
+    def sample_evaluations_read(self):
+        indices = self._json_body()
+        samples = self.store["samples"]
+        self._send(200, [samples[i] for i in indices if i in samples])
+
+    def sample_evaluations_list_indices(self):
+        self._send(200, sorted(self.store["samples"]))
+
+    def metrics_write(self):
+        items = self._json_body()
+        with self.lock:
+            for item in items:
+                self.store["metrics"][item["key"]] = {
+                    "id": str(uuid.uuid4()),
+                    "evaluation_experiment_id": str(EXPERIMENT_ID),
+                    "key": item["key"],
+                    "value": item["value"],
+                    "created_at": self._now(),
+                }
+        self._send(200, list(self.store["metrics"].values()))
+
+    def metrics_read(self):
+        self._send(200, list(self.store["metrics"].values()))
+
+
+class FakeAtriaxServer:
+    """
+    Runs the Atriax stand-in on a background thread.
+
+    Attributes:
+        url (str): Base URL of the server, to be used as the hub URL.
+        store (dict): The evaluation data written to the server.
+        wire (dict[str, int]): Request body bytes received and response body
+            bytes sent, as they went over the wire.
+        options (dict): `compress_responses` gzips JSON responses for clients
+            that accept it.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.store = {"samples": {}, "metrics": {}}
+        self.wire = {"received": 0, "sent": 0}
+        self.options = {"compress_responses": False}
+        handler = type(
+            "Handler",
+            (_Handler,),
+            {
+                "routes": _discover_routes(),
+                "store": self.store,
+                "lock": threading.Lock(),
+                "wire": self.wire,
+                "options": self.options,
+            },
+        )
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self.url = f"http://{host}:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self) -> FakeAtriaxServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
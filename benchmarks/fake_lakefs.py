@@ -0,0 +1,556 @@
+"""
+In-memory stand-in for the subset of the lakeFS REST API used by atria_hub.
+
+The server keeps repositories, branches, commits and object bytes in memory
+and serves them over HTTP on a local port, so the lakeFS SDK and lakefs-spec
+can be pointed at it without a real lakeFS deployment. Presigned reads and
+writes are served from the same process under `/_blobs/`.
+
+It implements only what the hub client exercises: server config, branch
+create/get, commits, diffs, reset, object stat/get/list/upload/delete, and the
+staging (physical address) API used for presigned uploads.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_API = "/api/v1"
+
+
+class LakeFSState:
+    """The repositories, refs and blobs held by the fake server."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.blobs: dict[str, bytes] = {}
+        # repo -> {"branches": {name: {"commit_id", "staged"}}, "commits": {id: commit}}
+        self.repos: dict[str, dict] = {}
+
+    def ensure_repo(self, repo: str, default_branch: str = "main") -> dict:
+        with self.lock:
+            if repo not in self.repos:
+                root = self._new_commit({}, parents=[], message="Repository created")
+                self.repos[repo] = {
+                    "default_branch": default_branch,
+                    "commits": {root["id"]: root},
+                    "branches": {
+                        default_branch: {"commit_id": root["id"], "staged": {}}
+                    },
+                }
+            return self.repos[repo]
+
+    @staticmethod
+    def _new_commit(
+        tree: dict, parents: list[str], message: str, metadata: dict | None = None
+    ) -> dict:
+        return {
+            "id": hashlib.sha256(uuid.uuid4().bytes).hexdigest(),
+            "parents": parents,
+            "committer": "bench",
+            "message": message,
+            "creation_date": int(time.time()),
+            "meta_range_id": "",
+            "metadata": metadata or {},
+            "tree": tree,
+        }
+
+    def resolve(self, repo: str, ref: str) -> tuple[dict, dict | None]:
+        """Return the tree visible at `ref` and the branch if `ref` is a branch."""
+        state = self.ensure_repo(repo)
+        branch = state["branches"].get(ref)
+        if branch is not None:
+            tree = dict(state["commits"][branch["commit_id"]]["tree"])
+            for path, obj in branch["staged"].items():
+                if obj is None:
+                    tree.pop(path, None)
+                else:
+                    tree[path] = obj
+            return tree, branch
+        for commit_id, commit in state["commits"].items():
+            if commit_id.startswith(ref):
+                return commit["tree"], None
+        raise KeyError(ref)
+
+    def put_blob(self, data: bytes) -> str:
+        address = uuid.uuid4().hex
+        with self.lock:
+            self.blobs[address] = data
+        return address
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: LakeFSState
+    base_url: str
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+    # helpers
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(
+        self,
+        status: int,
+        body: bytes | dict | list | str = b"",
+        content_type: str = "application/json",
+        headers: dict | None = None,
+    ) -> None:
+        if isinstance(body, dict | list):
+            body = json.dumps(body).encode("utf-8")
+        elif isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _error(self, status: int, message: str) -> None:
+        self._send(status, {"message": message})
+
+    def _object_stats(self, path: str, obj: dict, presign: bool = False) -> dict:
+        address = obj["physical_address"]
+        stats = {
+            "path": path,
+            "path_type": "object",
+            "physical_address": f"local://{address}",
+            "checksum": obj["checksum"],
+            "size_bytes": obj["size"],
+            "mtime": obj["mtime"],
+            "metadata": obj.get("metadata") or {},
+            "content_type": obj.get("content_type") or "application/octet-stream",
+        }
+        if presign:
+            stats["physical_address"] = f"{self.base_url}/_blobs/{address}"
+            stats["physical_address_expiry"] = int(time.time()) + 900
+        return stats
+
+    def _new_object(
+        self,
+        data: bytes | None = None,
+        address: str | None = None,
+        content_type: str | None = None,
+        metadata: dict | None = None,
+    ) -> dict:
+        if address is None:
+            address = self.state.put_blob(data)
+        data = self.state.blobs[address]
+        return {
+            "physical_address": address,
+            "checksum": hashlib.md5(data).hexdigest(),
+            "size": len(data),
+            "mtime": int(time.time()),
+            "content_type": content_type,
+            "metadata": metadata or {},
+        }
+
+    @staticmethod
+    def _paginate(items: list, query: dict, key) -> dict:
+        after = query.get("after", [""])[0]
+        amount = int(query.get("amount", ["1000"])[0])
+        items = [item for item in items if key(item) > after]
+        page = items[:amount]
+        return {
+            "pagination": {
+                "has_more": len(items) > amount,
+                "next_offset": key(page[-1]) if page else "",
+                "results": len(page),
+                "max_per_page": amount,
+            },
+            "results": page,
+        }
+
+    # routing
+    def do_GET(self):
+        self._route("GET")
+
+    def do_HEAD(self):
+        self._route("HEAD")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def do_PUT(self):
+        self._route("PUT")
+
+    def do_DELETE(self):
+        self._route("DELETE")
+
+    def _route(self, method: str) -> None:
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        path = url.path
+        try:
+            if path.startswith("/_blobs/"):
+                return self._blob(method, path.removeprefix("/_blobs/"))
+            if not path.startswith(_API):
+                return self._error(404, "not found")
+            path = path.removeprefix(_API)
+            for pattern, handler in _ROUTES:
+                match = re.fullmatch(pattern, path)
+                if match and handler.__name__.startswith(method.lower() + "_"):
+                    return handler(self, query, *match.groups())
+            if method == "HEAD":
+                for pattern, handler in _ROUTES:
+                    match = re.fullmatch(pattern, path)
+                    if match and handler.__name__.startswith("get_"):
+                        return handler(self, query, *match.groups())
+            return self._error(404, f"no route for {method} {path}")
+        except KeyError as e:
+            return self._error(404, f"not found: {e}")
+
+    def _blob(self, method: str, address: str) -> None:
+        if method == "PUT":
+            data = self._body()
+            with self.state.lock:
+                self.state.blobs[address] = data
+            return self._send(
+                200, b"", headers={"ETag": f'"{hashlib.md5(data).hexdigest()}"'}
+            )
+        data = self.state.blobs[address]
+        return self._send_bytes(data)
+
+    def _send_bytes(self, data: bytes) -> None:
+        range_header = self.headers.get("Range")
+        if range_header:
+            start, _, end = range_header.removeprefix("bytes=").partition("-")
+            start = int(start)
+            end = int(end) if end else len(data) - 1
+            return self._send(
+                206,
+                data[start : end + 1],
+                "application/octet-stream",
+                headers={"Content-Range": f"bytes {start}-{end}/{len(data)}"},
+            )
+        return self._send(200, data, "application/octet-stream")
+
+    # config
+    def get_config(self, query):
+        return self._send(
+            200,
+            {
+                "version_config": {"version": "1.0.0"},
+                "storage_config": self._storage_config(),
+            },
+        )
+
+    def get_storage_config(self, query):
+        return self._send(200, self._storage_config())
+
+    def get_version(self, query):
+        return self._send(200, {"version": "1.0.0"})
+
+    @staticmethod
+    def _storage_config() -> dict:
+        return {
+            "blockstore_type": "local",
+            "blockstore_namespace_example": "local://example",
+            "blockstore_namespace_ValidityRegex": "^local://",
+            "default_namespace_prefix": "local://",
+            "pre_sign_support": True,
+            "pre_sign_support_ui": False,
+            "import_support": False,
+            "import_validity_regex": "",
+        }
+
+    # repositories and branches
+    def get_repository(self, query, repo):
+        state = self.state.ensure_repo(repo)
+        return self._send(
+            200,
+            {
+                "id": repo,
+                "creation_date": 0,
+                "default_branch": state["default_branch"],
+                "storage_namespace": f"local://{repo}",
+            },
+        )
+
+    def post_branches(self, query, repo):
+        request = json.loads(self._body())
+        state = self.state.ensure_repo(repo)
+        with self.state.lock:
+            if request["name"] in state["branches"]:
+                return self._error(409, "branch already exists")
+            source = request["source"]
+            if source in state["branches"]:
+                commit_id = state["branches"][source]["commit_id"]
+            else:
+                commit_id = next(c for c in state["commits"] if c.startswith(source))
+            state["branches"][request["name"]] = {"commit_id": commit_id, "staged": {}}
+        return self._send(201, commit_id, "text/html")
+
+    def get_branch(self, query, repo, branch):
+        state = self.state.ensure_repo(repo)
+        return self._send(
+            200, {"id": branch, "commit_id": state["branches"][branch]["commit_id"]}
+        )
+
+    def put_branch(self, query, repo, branch):
+        request = json.loads(self._body())
+        staged = self.state.ensure_repo(repo)["branches"][branch]["staged"]
+        with self.state.lock:
+            for path in list(staged):
+                if (
+                    request["type"] == "reset"
+                    or (request["type"] == "object" and path == request["path"])
+                    or (
+                        request["type"] == "common_prefix"
+                        and path.startswith(request["path"])
+                    )
+                ):
+                    del staged[path]
+        return self._send(204)
+
+    def get_commit(self, query, repo, commit_id):
+        state = self.state.ensure_repo(repo)
+        commit = next(
+            commit
+            for cid, commit in state["commits"].items()
+            if cid.startswith(commit_id)
+        )
+        return self._send(200, {k: v for k, v in commit.items() if k != "tree"})
+
+    def post_commit(self, query, repo, branch):
+        request = json.loads(self._body())
+        state = self.state.ensure_repo(repo)
+        with self.state.lock:
+            tree, branch_state = self.state.resolve(repo, branch)
+            commit = self.state._new_commit(
+                tree,
+                parents=[branch_state["commit_id"]],
+                message=request.get("message", ""),
+                metadata=request.get("metadata"),
+            )
+            state["commits"][commit["id"]] = commit
+            branch_state["commit_id"] = commit["id"]
+            branch_state["staged"] = {}
+        return self._send(201, {k: v for k, v in commit.items() if k != "tree"})
+
+    def get_diff(self, query, repo, branch):
+        branch_state = self.state.ensure_repo(repo)["branches"][branch]
+        committed = self.state.repos[repo]["commits"][branch_state["commit_id"]]["tree"]
+        prefix = query.get("prefix", [""])[0]
+        changes = []
+        for path, obj in sorted(branch_state["staged"].items()):
+            if not path.startswith(prefix):
+                continue
+            change_type = (
+                "removed"
+                if obj is None
+                else "changed"
+                if path in committed
+                else "added"
+            )
+            changes.append(
+                {
+                    "type": change_type,
+                    "path": path,
+                    "path_type": "object",
+                    "size_bytes": None if obj is None else obj["size"],
+                }
+            )
+        return self._send(200, self._paginate(changes, query, lambda c: c["path"]))
+
+    def get_refs_diff(self, query, repo, left, right):
+        left_tree, _ = self.state.resolve(repo, left)
+        right_tree, _ = self.state.resolve(repo, right)
+        prefix = query.get("prefix", [""])[0]
+        changes = []
+        for path in sorted(set(left_tree) | set(right_tree)):
+            if not path.startswith(prefix):
+                continue
+            before, after = left_tree.get(path), right_tree.get(path)
+            if before == after:
+                continue
+            change_type = (
+                "added" if before is None else "removed" if after is None else "changed"
+            )
+            changes.append(
+                {
+                    "type": change_type,
+                    "path": path,
+                    "path_type": "object",
+                    "size_bytes": (after or before)["size"],
+                }
+            )
+        return self._send(200, self._paginate(changes, query, lambda c: c["path"]))
+
+    # objects
+    def get_stat(self, query, repo, ref):
+        tree, _ = self.state.resolve(repo, ref)
+        path = query["path"][0]
+        if path not in tree:
+            return self._error(404, "object not found")
+        presign = query.get("presign", ["false"])[0] == "true"
+        return self._send(200, self._object_stats(path, tree[path], presign))
+
+    def get_object(self, query, repo, ref):
+        tree, _ = self.state.resolve(repo, ref)
+        path = query["path"][0]
+        if path not in tree:
+            return self._error(404, "object not found")
+        address = tree[path]["physical_address"]
+        if query.get("presign", ["false"])[0] == "true":
+            return self._send(
+                302, b"", headers={"Location": f"{self.base_url}/_blobs/{address}"}
+            )
+        return self._send_bytes(self.state.blobs[address])
+
+    def get_ls(self, query, repo, ref):
+        tree, _ = self.state.resolve(repo, ref)
+        prefix = query.get("prefix", [""])[0]
+        delimiter = query.get("delimiter", [""])[0]
+        presign = query.get("presign", ["false"])[0] == "true"
+        entries: dict[str, dict] = {}
+        for path in sorted(tree):
+            if not path.startswith(prefix):
+                continue
+            rest = path[len(prefix) :]
+            if delimiter and delimiter in rest:
+                common = prefix + rest.split(delimiter, 1)[0] + delimiter
+                entries[common] = {
+                    "path": common,
+                    "path_type": "common_prefix",
+                    "physical_address": "",
+                    "checksum": "",
+                    "mtime": 0,
+                }
+            else:
+                entries[path] = self._object_stats(path, tree[path], presign)
+        return self._send(
+            200, self._paginate(list(entries.values()), query, lambda e: e["path"])
+        )
+
+    def post_object(self, query, repo, branch):
+        path = query["path"][0]
+        body = self._body()
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.startswith("multipart/form-data"):
+            boundary = content_type.split("boundary=", 1)[1].encode("utf-8")
+            part = body.split(b"--" + boundary)[1]
+            body = part.split(b"\r\n\r\n", 1)[1].rsplit(b"\r\n", 1)[0]
+            content_type = "application/octet-stream"
+        obj = self._new_object(body, content_type=content_type)
+        _, branch_state = self.state.resolve(repo, branch)
+        with self.state.lock:
+            branch_state["staged"][path] = obj
+        return self._send(201, self._object_stats(path, obj))
+
+    def put_object(self, query, repo, branch):
+        # stage an object that already exists in the object store
+        request = json.loads(self._body())
+        address = request["physical_address"].rsplit("/", 1)[-1]
+        obj = self._new_object(
+            address=address,
+            content_type=request.get("content_type"),
+            metadata=request.get("metadata"),
+        )
+        _, branch_state = self.state.resolve(repo, branch)
+        with self.state.lock:
+            branch_state["staged"][query["path"][0]] = obj
+        return self._send(201, self._object_stats(query["path"][0], obj))
+
+    def delete_object(self, query, repo, branch):
+        _, branch_state = self.state.resolve(repo, branch)
+        with self.state.lock:
+            branch_state["staged"][query["path"][0]] = None
+        return self._send(204)
+
+    def get_staging(self, query, repo, branch):
+        address = uuid.uuid4().hex
+        return self._send(
+            200,
+            {
+                "physical_address": f"local://{address}",
+                "presigned_url": f"{self.base_url}/_blobs/{address}",
+                "presigned_url_expiry": int(time.time()) + 900,
+            },
+        )
+
+    def put_staging(self, query, repo, branch):
+        request = json.loads(self._body())
+        address = request["staging"]["physical_address"].rsplit("/", 1)[-1]
+        obj = self._new_object(
+            address=address,
+            content_type=request.get("content_type"),
+            metadata=request.get("user_metadata"),
+        )
+        _, branch_state = self.state.resolve(repo, branch)
+        with self.state.lock:
+            branch_state["staged"][query["path"][0]] = obj
+        return self._send(200, self._object_stats(query["path"][0], obj))
+
+
+_SEGMENT = "([^/]+)"
+_ROUTES = [
+    (r"/config", _Handler.get_config),
+    (r"/config/storage", _Handler.get_storage_config),
+    (r"/config/version", _Handler.get_version),
+    (rf"/repositories/{_SEGMENT}", _Handler.get_repository),
+    (rf"/repositories/{_SEGMENT}/branches", _Handler.post_branches),
+    (rf"/repositories/{_SEGMENT}/branches/{_SEGMENT}", _Handler.get_branch),
+    (rf"/repositories/{_SEGMENT}/branches/{_SEGMENT}", _Handler.put_branch),
+    (rf"/repositories/{_SEGMENT}/commits/{_SEGMENT}", _Handler.get_commit),
+    (rf"/repositories/{_SEGMENT}/branches/{_SEGMENT}/commits", _Handler.post_commit),
+    (rf"/repositories/{_SEGMENT}/branches/{_SEGMENT}/diff", _Handler.get_diff),
+    (
+        rf"/repositories/{_SEGMENT}/refs/{_SEGMENT}/diff/{_SEGMENT}",
+        _Handler.get_refs_diff,
+    ),
+    (rf"/repositories/{_SEGMENT}/refs/{_SEGMENT}/objects/stat", _Handler.get_stat),
+    (rf"/repositories/{_SEGMENT}/refs/{_SEGMENT}/objects/ls", _Handler.get_ls),
+    (rf"/repositories/{_SEGMENT}/refs/{_SEGMENT}/objects", _Handler.get_object),
+    (rf"/repositories/{_SEGMENT}/branches/{_SEGMENT}/objects", _Handler.post_object),
+    (rf"/repositories/{_SEGMENT}/branches/{_SEGMENT}/objects", _Handler.put_object),
+    (rf"/repositories/{_SEGMENT}/branches/{_SEGMENT}/objects", _Handler.delete_object),
+    (
+        rf"/repositories/{_SEGMENT}/branches/{_SEGMENT}/staging/backing",
+        _Handler.get_staging,
+    ),
+    (
+        rf"/repositories/{_SEGMENT}/branches/{_SEGMENT}/staging/backing",
+        _Handler.put_staging,
+    ),
+]
+
+
+class FakeLakeFSServer:
+    """
+    Runs the lakeFS stand-in on a background thread.
+
+    Attributes:
+        state (LakeFSState): The in-memory repositories served.
+        url (str): Base URL of the server, to be used as the storage URL.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.state = LakeFSState()
+        handler = type("Handler", (_Handler,), {"state": self.state})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self.url = f"http://{host}:{self._server.server_address[1]}"
+        handler.base_url = self.url
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self) -> FakeLakeFSServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
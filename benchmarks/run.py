@@ -0,0 +1,478 @@
+"""
+Benchmarks of the atria_hub client hot paths.
+
+The benchmarks run the real client against in-process stand-ins of the Atriax
+REST API and of lakeFS, so they measure the client side (request building,
+serialization, transfer orchestration) on loopback rather than a deployment.
+Results are written as JSON, one file per commit, and can be compared with
+`python -m benchmarks.compare old.json new.json`.
+
+Usage:
+    python -m benchmarks.run [--quick] [--repeats N] [--output PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from types import SimpleNamespace
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=_REPO_ROOT, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def measure(
+    name: str,
+    params: dict,
+    fn: Callable[[], None],
+    repeats: int,
+    setup: Callable[[], None] | None = None,
+    nbytes: int | None = None,
+    items: int | None = None,
+) -> dict:
+    """Time `fn` `repeats` times and summarize the run as a result record."""
+    timings = []
+    error = None
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        try:
+            fn()
+        except Exception as e:  # record the failure and keep benchmarking
+            error = f"{type(e).__name__}: {e}"
+            break
+        timings.append(time.perf_counter() - start)
+
+    result = {"name": name, "params": params, "repeats": len(timings)}
+    if timings:
+        median = statistics.median(timings)
+        result.update(
+            median_s=median,
+            min_s=min(timings),
+            max_s=max(timings),
+            bytes_per_s=nbytes / median if nbytes and median else None,
+            items_per_s=items / median if items and median else None,
+        )
+    if error is not None:
+        result["error"] = error
+    print(
+        f"{name:<32} {json.dumps(params):<40} "
+        + (f"{result['median_s'] * 1e3:10.2f} ms" if timings else f"ERROR {error}"),
+        flush=True,
+    )
+    return result
+
+
+def bench_import(repeats: int) -> list[dict]:
+    """Measure the cold import time of the package in a fresh interpreter."""
+    results = []
+    for statement in ("import atria_hub", "from atria_hub.hub import AtriaHub"):
+        results.append(
+            measure(
+                "import_time",
+                {"statement": statement},
+                lambda statement=statement: subprocess.check_call(
+                    [sys.executable, "-c", statement], cwd=_REPO_ROOT
+                ),
+                repeats=repeats,
+            )
+        )
+    return results
+
+
+def make_hub(base_url: str, storage_url: str):
+    """Create a hub client authenticated against the stand-in servers."""
+    from atria_hub.hub import AtriaHub
+    from atria_hub.models import ReposCredentials
+
+    hub = AtriaHub(base_url=base_url, storage_url=storage_url, use_key_ring=False)
+    # the stand-ins do not check tokens, so skip the Supabase sign-in
+    hub.client.get_auth_headers = lambda: {"Authorization": "Bearer benchmark"}
+    hub.client.set_repos_access_credentials(
+        ReposCredentials(access_key_id="benchmark", secret_access_key="benchmark")
+    )
+    return hub
+
+
+def bench_rest_latency(hub, repeats: int, calls: int) -> list[dict]:
+    """Measure the per-call latency of a REST request through protected_api_client."""
+    from atriax_client.api.health import health_health_check
+
+    def run():
+        for _ in range(calls):
+            with hub.client.protected_api_client as client:
+                health_health_check.sync_detailed(client=client)
+
+    result = measure(
+        "rest_latency", {"calls": calls}, run, repeats=repeats, items=calls
+    )
+    if "median_s" in result:
+        result["per_call_s"] = result["median_s"] / calls
+    return [result]
+
+
+def bench_transfers(
+    hub, repeats: int, file_counts: list[int], file_sizes: list[int]
+) -> list[dict]:
+    """Measure dataset upload and download throughput against the lakeFS stand-in."""
+    results = []
+    dataset = SimpleNamespace(
+        repo_id="bench-dataset", default_branch="main", name="bench-dataset"
+    )
+    for count in file_counts:
+        for size in file_sizes:
+            with tempfile.TemporaryDirectory() as tmp:
+                files = []
+                for i in range(count):
+                    path = Path(tmp) / f"part-{i:06d}.parquet"
+                    path.write_bytes(os.urandom(size))
+                    files.append((str(path), f"default/delta/train/{path.name}"))
+
+                params = {"files": count, "file_size": size}
+                run_ids = iter(range(repeats))
+                branch = {}
+
+                def upload(
+                    files=files,
+                    prefix=f"bench-{count}-{size}",
+                    branch=branch,
+                    run_ids=run_ids,
+                ):
+                    branch["name"] = f"{prefix}-{next(run_ids)}"
+                    hub.datasets.upload_files(
+                        dataset=dataset,
+                        branch=branch["name"],
+                        config_dir="default",
+                        dataset_files=files,
+                        resume=False,
+                    )
+
+                results.append(
+                    measure(
+                        "upload_files",
+                        params,
+                        upload,
+                        repeats=repeats,
+                        nbytes=count * size,
+                        items=count,
+                    )
+                )
+
+                def download(tmp=tmp, branch=branch):
+                    with tempfile.TemporaryDirectory(dir=tmp) as destination:
+                        hub.datasets.download_files(
+                            dataset_repo_id=dataset.repo_id,
+                            branch=branch["name"],
+                            config_dir="default",
+                            destination_path=destination,
+                            resume=False,
+                        )
+
+                results.append(
+                    measure(
+                        "download_files",
+                        params,
+                        download,
+                        repeats=repeats,
+                        nbytes=count * size,
+                        items=count,
+                    )
+                )
+    return results
+
+
+def bench_sample_evaluations(
+    hub, repeats: int, sample_counts: list[int], experiment_id
+) -> list[dict]:
+    """Measure SampleEvaluationApi.write and read for increasing sample counts."""
+    results = []
+    api = hub.evaluations.sample_evaluations
+    for count in sample_counts:
+        data = {
+            i: {"loss": 0.25, "prediction": i % 10, "target": (i + 1) % 10}
+            for i in range(count)
+        }
+        results.append(
+            measure(
+                "sample_evaluations_write",
+                {"samples": count},
+                lambda data=data: api.write(experiment_id, data),
+                repeats=repeats,
+                items=count,
+            )
+        )
+        results.append(
+            measure(
+                "sample_evaluations_read",
+                {"samples": count},
+                lambda count=count: api.read(experiment_id, list(range(count))),
+                repeats=repeats,
+                items=count,
+            )
+        )
+    return results
+
+
+def bench_sample_evaluations_fast_json(
+    hub, repeats: int, sample_counts: list[int], experiment_id
+) -> list[dict]:
+    """Measure the FAST_JSON path of SampleEvaluationApi.write and read, with NumPy values."""
+    import numpy as np
+
+    from atria_hub.config import settings
+
+    results = []
+    api = hub.evaluations.sample_evaluations
+    fast_json = settings.FAST_JSON
+    settings.FAST_JSON = True
+    try:
+        for count in sample_counts:
+            losses = np.full(count, 0.25, dtype=np.float32)
+            data = {
+                i: {"loss": losses[i], "prediction": i % 10, "target": (i + 1) % 10}
+                for i in range(count)
+            }
+            results.append(
+                measure(
+                    "sample_evaluations_write_fast_json",
+                    {"samples": count},
+                    lambda data=data: api.write(experiment_id, data),
+                    repeats=repeats,
+                    items=count,
+                )
+            )
+            results.append(
+                measure(
+                    "sample_evaluations_read_fast_json",
+                    {"samples": count},
+                    lambda count=count: api.read(experiment_id, list(range(count))),
+                    repeats=repeats,
+                    items=count,
+                )
+            )
+    finally:
+        settings.FAST_JSON = fast_json
+    return results
+
+
+def bench_wire_bytes(
+    atriax, storage_url: str, samples: int, experiment_id
+) -> list[dict]:
+    """Measure the bytes sent over the wire by bulk evaluation requests, with and without compression."""
+    from atria_hub.config import settings
+
+    data = {
+        i: {"loss": 0.25, "prediction": i % 10, "target": (i + 1) % 10}
+        for i in range(samples)
+    }
+    results = []
+    request_compression = settings.REQUEST_COMPRESSION
+    try:
+        for encoding in (None, "gzip"):
+            settings.REQUEST_COMPRESSION = encoding
+            atriax.options["compress_responses"] = encoding is not None
+            api = make_hub(atriax.url, storage_url).evaluations.sample_evaluations
+            atriax.wire.update(received=0, sent=0)
+            result = measure(
+                "wire_bytes",
+                {"samples": samples, "encoding": encoding or "identity"},
+                lambda api=api: (
+                    api.write(experiment_id, data),
+                    api.read(experiment_id, list(range(samples))),
+                ),
+                repeats=1,
+                items=samples,
+            )
+            result.update(
+                request_bytes=atriax.wire["received"],
+                response_bytes=atriax.wire["sent"],
+            )
+            print(
+                f"{'':<32} request {result['request_bytes']} B, response {result['response_bytes']} B",
+                flush=True,
+            )
+            results.append(result)
+    finally:
+        settings.REQUEST_COMPRESSION = request_compression
+        atriax.options["compress_responses"] = False
+    return results
+
+
+def bench_checkpoint_load(hub, repeats: int, sizes: list[int]) -> list[dict]:
+    """Measure ModelsApi.load_checkpoint for checkpoints of increasing size."""
+    results = []
+    model = SimpleNamespace(repo_id="bench-model", default_branch="main")
+    for size in sizes:
+        branch = f"bench-{size}"
+        hub.models.upload_files(
+            model=model,
+            branch=branch,
+            config_name="default",
+            configs_base_path="conf/model",
+            model_checkpoint=os.urandom(size),
+            model_config={"name": "bench"},
+            dataset_metadata={"labels": ["a", "b"]},
+            overwrite_existing=True,
+        )
+        results.append(
+            measure(
+                "load_checkpoint",
+                {"size": size},
+                lambda branch=branch: hub.models.load_checkpoint(
+                    model_repo_id=model.repo_id, branch=branch, config_name="default"
+                ),
+                repeats=repeats,
+                nbytes=size,
+            )
+        )
+    return results
+
+
+def bench_sharded_checkpoint_load(hub, repeats: int, sizes: list[int]) -> list[dict]:
+    """Measure ModelsApi.load_tensors for a whole sharded checkpoint and for half of it."""
+    import numpy as np
+
+    results = []
+    model = SimpleNamespace(repo_id="bench-model", default_branch="main")
+    for size in sizes:
+        branch = f"bench-sharded-{size}"
+        tensor_size = size // 16
+        tensors = {
+            f"{part}.layer{i}.weight": np.frombuffer(
+                os.urandom(tensor_size), dtype=np.float32
+            )
+            for part in ("encoder", "decoder")
+            for i in range(8)
+        }
+        tensors["encoder.num_batches_tracked"] = np.array(3, dtype=np.int64)
+        hub.models.upload_files(
+            model=model,
+            branch=branch,
+            config_name="default",
+            configs_base_path="conf/model",
+            model_checkpoint=tensors,
+            model_config={"name": "bench"},
+            dataset_metadata={"labels": ["a", "b"]},
+            overwrite_existing=True,
+            max_shard_bytes=size // 4,
+        )
+        scalar = hub.models.load_tensors(
+            model_repo_id=model.repo_id,
+            branch=branch,
+            config_name="default",
+            names=["encoder.num_batches_tracked"],
+        )["encoder.num_batches_tracked"]
+        if scalar.shape != () or scalar != 3:
+            raise RuntimeError(f"A 0-d tensor was loaded back as {scalar!r}.")
+        for prefix, nbytes in ((None, size), ("encoder.", size // 2)):
+            results.append(
+                measure(
+                    "load_tensors",
+                    {"size": size, "prefix": prefix},
+                    lambda branch=branch, prefix=prefix: hub.models.load_tensors(
+                        model_repo_id=model.repo_id,
+                        branch=branch,
+                        config_name="default",
+                        prefix=prefix,
+                    ),
+                    repeats=repeats,
+                    nbytes=nbytes,
+                )
+            )
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quick", action="store_true", help="Run smaller cases.")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Result file, defaults to bench_results/<commit>.json.",
+    )
+    args = parser.parse_args(argv)
+
+    from benchmarks.fake_atriax import EXPERIMENT_ID, FakeAtriaxServer
+    from benchmarks.fake_lakefs import FakeLakeFSServer
+
+    commit = _git_commit()
+    results = bench_import(args.repeats)
+    with FakeAtriaxServer() as atriax, FakeLakeFSServer() as lakefs_server:
+        hub = make_hub(atriax.url, lakefs_server.url)
+        results += bench_rest_latency(hub, args.repeats, calls=50)
+        results += bench_transfers(
+            hub,
+            args.repeats,
+            file_counts=[10, 100] if args.quick else [10, 100, 1000],
+            file_sizes=[4 << 10, 256 << 10] if args.quick else [4 << 10, 1 << 20],
+        )
+        results += bench_sample_evaluations(
+            hub,
+            args.repeats,
+            sample_counts=[1_000, 10_000] if args.quick else [1_000, 100_000],
+            experiment_id=EXPERIMENT_ID,
+        )
+        results += bench_sample_evaluations_fast_json(
+            hub,
+            args.repeats,
+            sample_counts=[1_000, 10_000] if args.quick else [1_000, 100_000],
+            experiment_id=EXPERIMENT_ID,
+        )
+        results += bench_wire_bytes(
+            atriax,
+            lakefs_server.url,
+            samples=10_000 if args.quick else 100_000,
+            experiment_id=EXPERIMENT_ID,
+        )
+        results += bench_checkpoint_load(
+            hub,
+            args.repeats,
+            sizes=[1 << 20, 16 << 20] if args.quick else [1 << 20, 64 << 20],
+        )
+        results += bench_sharded_checkpoint_load(
+            hub,
+            args.repeats,
+            sizes=[1 << 20, 16 << 20] if args.quick else [1 << 20, 64 << 20],
+        )
+
+    output = args.output or _REPO_ROOT / "bench_results" / f"{commit[:12]}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(
+            {
+                "commit": commit,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "quick": args.quick,
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
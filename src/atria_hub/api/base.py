@@ -1,16 +1,472 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any, TypeVar
+
 from atria_hub.client import AtriaHubClient
+from atria_hub.governor import Priority
+
+if TYPE_CHECKING:
+    from atria_hub.content_index import ContentEntry
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 
 class BaseApi:
     def __init__(self, client: AtriaHubClient):
         self._client = client
 
+    def get_commit_id(self, repo_id: str, branch: str) -> str:
+        import lakefs
+
+        commit_id = self._client.ref_cache.get_commit(repo_id, branch)
+        if commit_id is None:
+            commit_id = (
+                lakefs.repository(repo_id, client=self._client.lakefs_client)
+                .branch(branch)
+                .get_commit()
+                .id
+            )
+            self._client.ref_cache.set_commit(repo_id, branch, commit_id)
+        return commit_id
+
     def get_commit_sha(self, repo_id: str, branch: str) -> str:
+        return self.get_commit_id(repo_id, branch)[:7]
+
+    def _read_ref(self, repo_id: str, branch: str, *prefixes: str) -> str:
+        """
+        Return the ref to read related objects under `prefixes` of a branch from.
+
+        Reads are pinned to the head commit, so that the objects always match
+        each other, unless the branch has uncommitted changes under one of the
+        prefixes, e.g. an upload that was not committed yet, which only the
+        branch sees.
+        """
         import lakefs
 
+        staged_branch = lakefs.repository(
+            repo_id, client=self._client.lakefs_client
+        ).branch(branch)
+        for prefix in prefixes:
+            staged = staged_branch.uncommitted(max_amount=1, prefix=prefix)
+            if next(iter(staged), None) is not None:
+                return branch
+        return self.get_commit_id(repo_id, branch)
+
+    def _ensure_branch(self, repo_id: str, branch: str, source_reference: str) -> str:
+        """Create a branch unless it is known to exist, and return its name."""
+        import lakefs
+
+        if not self._client.ref_cache.has_branch(repo_id, branch):
+            lakefs.repository(repo_id, client=self._client.lakefs_client).branch(
+                branch
+            ).create(source_reference=source_reference, exist_ok=True)
+            self._client.ref_cache.add_branch(repo_id, branch)
+        return branch
+
+    def _commit(self, repo_id: str, branch: str, message: str, metadata=None):
+        """Commit a branch and record its new head in the ref cache."""
+        import lakefs
+
+        try:
+            commit = (
+                lakefs.repository(repo_id, client=self._client.lakefs_client)
+                .branch(branch)
+                .commit(message=message, metadata=metadata)
+            )
+        except Exception:
+            self._client.ref_cache.invalidate(repo_id, branch)
+            raise
+        self._client.ref_cache.set_commit(repo_id, branch, commit.id)
+        return commit
+
+    def _stage_physical_address(
+        self,
+        repo_id: str,
+        branch: str,
+        path: str,
+        physical_address: str,
+        checksum: str,
+        size_bytes: int,
+        content_type: str | None = None,
+        metadata: dict[str, str] | None = None,
+    ) -> None:
+        """Stage an object that already exists in the object store, without copying it."""
+        from lakefs_sdk.models import ObjectStageCreation
+
+        self._client.lakefs_client.sdk_client.objects_api.stage_object(
+            repository=repo_id,
+            branch=branch,
+            path=path,
+            object_stage_creation=ObjectStageCreation(
+                physical_address=physical_address,
+                checksum=checksum,
+                size_bytes=size_bytes,
+                content_type=content_type,
+                metadata=metadata,
+            ),
+        )
+
+    def _link_duplicate(
+        self, repo_id: str, branch: str, path: str, digest: str, size: int
+    ) -> bool:
+        """
+        Stage `path` as a link to an identical object already stored in the repository.
+
+        Returns:
+            bool: Whether the link was staged. If not, the bytes must be uploaded.
+        """
+        from atria_hub.config import settings
+
+        if not settings.DEDUPLICATE_UPLOADS:
+            return False
+        index = self._client.content_index
+        entry = index.get(repo_id, digest)
+        if entry is None or entry.size != size:
+            return False
+        if not self._is_referenced(repo_id, entry):
+            index.discard(repo_id, digest)
+            return False
+        try:
+            self._stage_physical_address(
+                repo_id,
+                branch,
+                path,
+                physical_address=entry.physical_address,
+                checksum=entry.checksum,
+                size_bytes=entry.size,
+                content_type=entry.content_type,
+            )
+        except Exception:
+            index.discard(repo_id, digest)
+            return False
+        return True
+
+    def _is_referenced(self, repo_id: str, entry: ContentEntry) -> bool:
+        """Check that the object of an index entry is still referenced where it was uploaded."""
+        import lakefs
+        from lakefs.exceptions import NotFoundException
+
+        # lakeFS stages any physical address without checking that it exists, so
+        # only link objects a branch still references, which garbage collection keeps
+        if entry.branch is None or entry.path is None:
+            return False
+        try:
+            stats = (
+                lakefs.repository(repo_id, client=self._client.lakefs_client)
+                .branch(entry.branch)
+                .object(entry.path)
+                .stat()
+            )
+        except NotFoundException:
+            return False
         return (
-            lakefs.repository(repo_id, client=self._client.lakefs_client)
-            .branch(branch)
-            .get_commit()
-            .id[:7]
+            stats.physical_address == entry.physical_address
+            and stats.checksum == entry.checksum
+        )
+
+    def _record_content(
+        self, repo_id: str, branch: str, path: str, digest: str, stats=None
+    ) -> None:
+        """Record an uploaded object in the content index, so later duplicates are linked."""
+        import lakefs
+
+        from atria_hub.config import settings
+        from atria_hub.content_index import ContentEntry
+
+        if not settings.DEDUPLICATE_UPLOADS:
+            return
+        if stats is None:
+            stats = (
+                lakefs.repository(repo_id, client=self._client.lakefs_client)
+                .branch(branch)
+                .object(path)
+                .stat()
+            )
+        self._client.content_index.add(
+            repo_id,
+            digest,
+            ContentEntry(
+                physical_address=stats.physical_address,
+                checksum=stats.checksum,
+                size=stats.size_bytes,
+                content_type=stats.content_type,
+                branch=branch,
+                path=path,
+            ),
+        )
+
+    def _write_object(
+        self,
+        repo_id: str,
+        branch: str,
+        path: str,
+        data: bytes | bytearray | memoryview | str,
+        content_type: str | None = None,
+        priority: Priority = Priority.BULK,
+    ):
+        """
+        Upload bytes, or the local file at `data` if it is a path, to a branch.
+
+        The bytes go directly to the object store through a presigned URL when the
+        storage supports it, and through the lakeFS API otherwise.
+
+        Returns:
+            The stats of the written object if they are known, or None.
+        """
+        import lakefs
+
+        from atria_hub.presign import PresignUnavailableError
+
+        try:
+            return self._client.direct_transport.write(
+                repo_id,
+                branch,
+                path,
+                data,
+                content_type=content_type,
+                priority=priority,
+            )
+        except PresignUnavailableError:
+            pass
+
+        if isinstance(data, bytes | bytearray | memoryview):
+            with self._client.storage_governor.request(
+                self._client.storage_host, priority=priority, nbytes=len(data)
+            ):
+                lakefs.repository(repo_id, client=self._client.lakefs_client).branch(
+                    branch
+                ).object(path).upload(data, content_type=content_type)
+        else:
+            import os
+
+            with self._client.storage_governor.request(
+                self._client.storage_host,
+                priority=priority,
+                nbytes=os.path.getsize(data),
+            ):
+                self._client.fs.put_file(
+                    lpath=data,
+                    rpath=f"{repo_id}/{branch}/{path}",
+                    precheck=False,
+                    content_type=content_type,
+                )
+        return None
+
+    def _read_object(
+        self,
+        repo_id: str,
+        ref: str,
+        path: str,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> bytes:
+        """Read an object from a repository through the storage governor."""
+        import lakefs
+
+        from atria_hub.presign import PresignUnavailableError
+
+        try:
+            return self._client.direct_transport.read(
+                repo_id, ref, path, priority=priority
+            )
+        except (PresignUnavailableError, FileNotFoundError):
+            # missing objects are read through lakeFS too, for its usual errors
+            pass
+
+        governor = self._client.storage_governor
+        with governor.request(self._client.storage_host, priority=priority):
+            with (
+                lakefs.repository(repo_id, client=self._client.lakefs_client)
+                .ref(ref)
+                .object(path)
+                .reader(pre_sign=True)
+            ) as f:
+                data = f.read()
+            governor.throttle(len(data), priority=priority)
+        return data
+
+    def _read_yaml(
+        self, repo_id: str, ref: str, path: str, unsafe: bool = False
+    ) -> Any:
+        """
+        Read and parse a YAML object at a ref.
+
+        Parsed values are memoized per commit when `ref` is a commit ID, and
+        by content otherwise, so a file read again from a branch is fetched
+        but not parsed again. Files of at least
+        `settings.PARSED_SIDECAR_MIN_BYTES` that were uploaded with a JSON
+        sidecar, stored under the sha256 of the YAML, are decoded from it
+        instead of parsing the YAML. The sidecars of a ref are listed once, so
+        repositories without sidecars cost no request per file.
+        """
+        import hashlib
+
+        from lakefs.exceptions import ObjectNotFoundException
+
+        from atria_hub import parsed_config
+        from atria_hub.config import settings
+
+        cache = self._client.parsed_configs
+        pinned = parsed_config.is_commit_id(ref)
+        if pinned:
+            value = cache.get(repo_id, ref, path)
+            if value is not None:
+                return value
+        data = self._read_object(repo_id, ref, path)
+        digest = hashlib.sha256(data).hexdigest()
+        value = cache.get_content(digest, unsafe)
+        if (
+            value is None
+            and len(data) >= settings.PARSED_SIDECAR_MIN_BYTES
+            and digest in self._parsed_sidecars(repo_id, ref)
+        ):
+            try:
+                value = parsed_config.decode_sidecar(
+                    self._read_object(repo_id, ref, parsed_config.sidecar_path(digest))
+                )
+            except ObjectNotFoundException:
+                pass
+        if value is None:
+            value = parsed_config.yaml_loads(data, unsafe=unsafe)
+        if value is not None:
+            cache.put_content(digest, unsafe, value)
+            if pinned:
+                cache.put(repo_id, ref, path, value)
+        return value
+
+    def _parsed_sidecars(self, repo_id: str, ref: str) -> set[str]:
+        """Return the YAML digests that have a parsed sidecar on a ref."""
+        import lakefs
+
+        from atria_hub import parsed_config
+
+        cache = self._client.parsed_configs
+        digests = cache.sidecars(repo_id, ref)
+        if digests is None:
+            objects = (
+                lakefs.repository(repo_id, client=self._client.lakefs_client)
+                .ref(ref)
+                .objects(prefix=f"{parsed_config.SIDECAR_DIR}/")
+            )
+            digests = {
+                digest
+                for digest in (
+                    parsed_config.sidecar_digest(obj.path) for obj in objects
+                )
+                if digest is not None
+            }
+            cache.put_sidecars(repo_id, ref, digests)
+        return digests
+
+    def _write_parsed_sidecar(
+        self, repo_id: str, branch: str, digest: str, value: Any
+    ) -> bool:
+        """Write the JSON sidecar of the YAML with sha256 `digest`, returning whether its value could be encoded."""
+        from atria_hub import parsed_config
+
+        data = parsed_config.encode_sidecar(value)
+        if data is None:
+            return False
+        self._write_object(
+            repo_id,
+            branch,
+            parsed_config.sidecar_path(digest),
+            data,
+            content_type="application/json",
         )
+        self._client.parsed_configs.add_sidecar(repo_id, branch, digest)
+        return True
+
+    def _read_object_range(
+        self,
+        repo_id: str,
+        ref: str,
+        path: str,
+        offset: int,
+        buffer: memoryview,
+        priority: Priority = Priority.INTERACTIVE,
+        chunk_size: int = 64 << 20,
+    ) -> None:
+        """Fill `buffer` with the bytes of an object starting at `offset`, using ranged reads."""
+        import lakefs
+
+        from atria_hub.presign import PresignUnavailableError
+
+        try:
+            return self._client.direct_transport.read_range(
+                repo_id, ref, path, offset, buffer, priority=priority
+            )
+        except (PresignUnavailableError, FileNotFoundError):
+            pass
+
+        # the bytes are charged as they arrive, not upfront
+        governor = self._client.storage_governor
+        with governor.request(self._client.storage_host, priority=priority):
+            with (
+                lakefs.repository(repo_id, client=self._client.lakefs_client)
+                .ref(ref)
+                .object(path)
+                .reader(pre_sign=True)
+            ) as f:
+                f.seek(offset)
+                position = 0
+                while position < len(buffer):
+                    data = f.read(min(chunk_size, len(buffer) - position))
+                    if not data:
+                        raise RuntimeError(
+                            f"Unexpected end of {path} at byte {offset + position}."
+                        )
+                    buffer[position : position + len(data)] = data
+                    position += len(data)
+                    governor.throttle(len(data), priority=priority)
+
+    def _map_concurrently(
+        self,
+        fn: Callable[[T], R],
+        items: Iterable[T],
+        max_workers: int | None = None,
+        desc: str | None = None,
+    ) -> list[R]:
+        """
+        Apply `fn` to every item on a thread pool and return the results in order.
+
+        Args:
+            fn (Callable[[T], R]): The function to apply.
+            items (Iterable[T]): The items to process.
+            max_workers (int | None): Size of the thread pool. Defaults to
+                `settings.STORAGE_TRANSFER_WORKERS`.
+            desc (str | None): Show a progress bar with this description.
+
+        Returns:
+            list[R]: The results, in the order of `items`.
+
+        Raises:
+            Exception: The first exception raised by `fn`, after the pending
+                items have been cancelled.
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        import tqdm
+
+        from atria_hub.config import settings
+
+        items = list(items)
+        results: list = [None] * len(items)
+        with ThreadPoolExecutor(
+            max_workers=max_workers or settings.STORAGE_TRANSFER_WORKERS
+        ) as executor:
+            futures = {executor.submit(fn, item): i for i, item in enumerate(items)}
+            try:
+                for future in tqdm.tqdm(
+                    as_completed(futures),
+                    total=len(futures),
+                    desc=desc,
+                    disable=desc is None,
+                ):
+                    results[futures[future]] = future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        return results
@@ -8,6 +8,7 @@ if TYPE_CHECKING:
     import uuid
 
     from atriax_client.models.config import Config
+    from atriax_client.models.config_base import ConfigBase
 
 
 class ConfigSnapshotsApi(BaseApi):
@@ -25,6 +26,43 @@ class ConfigSnapshotsApi(BaseApi):
             print("response", response, response.parsed, flush=True)
             return response.parsed
 
+    def create(self, config: ConfigBase) -> Config:
+        """Register a config snapshot in the hub."""
+
+        from atriax_client.api.config_snapshots import config_snapshots_create
+
+        with self._client.protected_api_client as client:
+            response = config_snapshots_create.sync_detailed(client=client, body=config)
+            if response.status_code not in (200, 201):
+                raise RuntimeError(
+                    f"Failed to create config_snapshot: {response.status_code} - {response.content.decode('utf-8')}"
+                )
+            return response.parsed
+
+    def intern(self, config: ConfigBase) -> uuid.UUID:
+        """
+        Return the ID of the snapshot of a config, registering it on first use.
+
+        Configs are identified by the hash of their canonical JSON encoding, and
+        the snapshot IDs are cached in memory and on disk, so a config is sent to
+        the hub once and later writes only need to reference its ID.
+
+        Args:
+            config (ConfigBase): The config.
+
+        Returns:
+            uuid.UUID: The ID of the config snapshot.
+        """
+        from atria_hub.snapshot_cache import config_digest
+
+        cache = self._client.config_snapshot_cache
+        digest = config_digest(config)
+        snapshot_id = cache.get(self._client.base_url, digest)
+        if snapshot_id is None:
+            snapshot_id = self.create(config).id
+            cache.put(self._client.base_url, digest, snapshot_id)
+        return snapshot_id
+
     def delete(self, id: uuid.UUID) -> None:
         """Delete a config_snapshot from the hub."""
 
@@ -36,3 +74,4 @@ class ConfigSnapshotsApi(BaseApi):
                 raise RuntimeError(
                     f"Failed to delete config_snapshot: {response.status_code} - {response.content.decode('utf-8')}"
                 )
+            self._client.config_snapshot_cache.discard(self._client.base_url, id)
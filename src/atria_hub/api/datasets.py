@@ -1,18 +1,26 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from atria_hub.api.base import BaseApi
-from atria_hub.utilities import get_logger
+from atria_hub.governor import Priority
+from atria_hub.utilities import _get_content_type_from_filename, get_logger
 
 if TYPE_CHECKING:
     import uuid
+    from pathlib import Path
 
     from atria_core.types.common import DatasetSplitType
     from atriax_client.models.data_instance_type import DataInstanceType
     from atriax_client.models.dataset import Dataset
 
     from atria_hub.api.base import BaseApi
+    from atria_hub.dataset_cache import MaterializedSplitCache
+    from atria_hub.delta import DeltaFile
+    from atria_hub.incremental import IncrementalPlan
+    from atria_hub.sharding import SplitShard
+    from atria_hub.transfer_journal import JournalEntry
     from atria_hub.utilities import get_logger
 
 logger = get_logger(__name__)
@@ -27,6 +35,148 @@ class DatasetNotFoundError(Exception):
         self.name = name
 
 
+def _has_parsed_sidecar(file_tgt: str) -> bool:
+    """Whether an uploaded file is a config read with `get_config` or `get_metadata`."""
+    return file_tgt == "metadata.yaml" or (
+        file_tgt.startswith("conf/dataset/") and file_tgt.endswith(".yaml")
+    )
+
+
+def _checksum_matches(remote_object: dict, entry: JournalEntry) -> bool:
+    """Check a journal entry against the checksum reported by the storage."""
+    checksum = remote_object.get("checksum")
+    if checksum is None or entry.checksum is None or "-" in checksum:
+        # multipart etags are not content checksums, fall back to the size
+        return remote_object.get("size") == entry.size
+    return checksum.strip('"') == entry.checksum
+
+
+@dataclass
+class UploadSummary:
+    """
+    Summary of the objects transferred by an upload.
+
+    Attributes:
+        objects (int): Number of objects uploaded.
+        bytes (int): Number of bytes uploaded.
+        skipped_objects (int): Number of objects skipped because a previous,
+            interrupted upload already transferred them.
+        deduplicated_objects (int): Number of objects linked to identical content
+            already stored in the repository instead of being uploaded.
+        deduplicated_bytes (int): Number of bytes not uploaded thanks to linking.
+    """
+
+    objects: int = 0
+    bytes: int = 0
+    skipped_objects: int = 0
+    deduplicated_objects: int = 0
+    deduplicated_bytes: int = 0
+
+    def as_commit_metadata(self) -> dict[str, str]:
+        """Return the summary as lakeFS commit metadata."""
+        return {
+            "atria.uploaded_objects": str(self.objects),
+            "atria.uploaded_bytes": str(self.bytes),
+            "atria.skipped_objects": str(self.skipped_objects),
+            "atria.deduplicated_objects": str(self.deduplicated_objects),
+            "atria.deduplicated_bytes": str(self.deduplicated_bytes),
+        }
+
+
+class EvalOutputSession:
+    """
+    Stages evaluation outputs on an evaluation branch and commits them at once.
+
+    lakeFS commits are expensive, so instead of one commit per metrics file the
+    session uploads every output without committing and creates a single
+    commit covering all of them on `flush` or when the context exits cleanly.
+    Evaluation tables written directly to `eval_table_path` (e.g. with a Delta
+    writer) are registered with `add_table` so that they are part of the
+    commit as well. lakeFS commits everything staged on a branch, so the
+    commit also includes outputs staged on the evaluation branch by others.
+
+    Attributes:
+        dataset_repo_id (str): The repository of the dataset.
+        eval_branch (str): The evaluation branch written to.
+        message (str | None): The commit message.
+    """
+
+    def __init__(
+        self,
+        datasets_api: DatasetsApi,
+        dataset_repo_id: str,
+        eval_branch: str,
+        message: str | None = None,
+    ):
+        self._datasets_api = datasets_api
+        self.dataset_repo_id = dataset_repo_id
+        self.eval_branch = eval_branch
+        self.message = message
+        self._prefixes: set[str] = set()
+
+    def _base_key(self, config_name: str, split: str, output_path: str) -> str:
+        return f"{config_name}/eval/{split}/{output_path}/"
+
+    def write_metrics(
+        self, config_name: str, split: str, output_path: str, data: dict
+    ) -> str:
+        """Stage a metrics file and return its object key."""
+        import json
+
+        import lakefs
+
+        key = self._datasets_api.eval_metrics_path(
+            dataset_repo_id=self.dataset_repo_id,
+            eval_branch=self.eval_branch,
+            config_name=config_name,
+            split=split,
+            output_path=output_path,
+        )
+        branch = lakefs.repository(
+            self.dataset_repo_id, client=self._datasets_api._client.lakefs_client
+        ).branch(self.eval_branch)
+        branch.object(key).upload(
+            json.dumps(data).encode("utf-8"), content_type="application/json"
+        )
+        self._prefixes.add(self._base_key(config_name, split, output_path))
+        return key
+
+    def add_table(self, config_name: str, split: str, output_path: str) -> str:
+        """Register an evaluation table for the commit and return the path to write it to."""
+        self._prefixes.add(self._base_key(config_name, split, output_path))
+        return self._datasets_api.eval_table_path(
+            dataset_repo_id=self.dataset_repo_id,
+            eval_branch=self.eval_branch,
+            config_name=config_name,
+            split=split,
+            output_path=output_path,
+        )
+
+    def flush(self):
+        """Commit everything staged by the session so far in one commit."""
+        if not self._prefixes:
+            return None
+        commit = self._datasets_api.commit_changes(
+            self.dataset_repo_id,
+            self.eval_branch,
+            message=self.message
+            or f"Write {len(self._prefixes)} evaluation outputs to {self.eval_branch}",
+        )
+        self._prefixes.clear()
+        return commit
+
+    def __enter__(self) -> EvalOutputSession:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+        elif self._prefixes:
+            logger.warning(
+                f"Evaluation outputs under {sorted(self._prefixes)} were left uncommitted on {self.eval_branch} after an error."
+            )
+
+
 class DatasetsApi(BaseApi):
     def get(self, id: uuid.UUID) -> Dataset:
         """Retrieve a dataset from the hub by its name."""
@@ -117,31 +267,71 @@ class DatasetsApi(BaseApi):
         config_dir: str,
         dataset_files: list[tuple[str, str]],
         overwrite_existing: bool = False,
-    ) -> None:
-        import mimetypes
-
-        import lakefs
-        import tqdm
-
-        branch: lakefs.Branch = (
-            lakefs.repository(dataset.repo_id, client=self._client.lakefs_client)
-            .branch(branch)
-            .create(source_reference=dataset.default_branch, exist_ok=True)
-        ).id
+        resume: bool = True,
+        max_workers: int | None = None,
+    ) -> UploadSummary:
+        """
+        Upload files to a dataset branch.
+
+        Every object is recorded in the client's transfer journal, so if the
+        upload is interrupted a later call with the same arguments skips the
+        objects that were already uploaded and verified.
+
+        Args:
+            dataset (Dataset): The dataset to upload to.
+            branch (str): The branch to upload to, created from the default branch
+                if missing.
+            config_dir (str): The dataset configuration directory.
+            dataset_files (list[tuple[str, str]]): Pairs of local path and target
+                path relative to the branch root.
+            overwrite_existing (bool): Upload even if the config already has a
+                delta directory.
+            resume (bool): Resume an interrupted upload recorded in the journal.
+            max_workers (int | None): Number of files uploaded concurrently.
+                Defaults to `settings.STORAGE_TRANSFER_WORKERS`.
+
+        Returns:
+            UploadSummary: The number of objects and bytes uploaded by this call.
+
+        Raises:
+            RuntimeError: If the delta directory already exists and the upload is
+                neither an overwrite nor a resumed upload.
+        """
+
+        branch = self._ensure_branch(dataset.repo_id, branch, dataset.default_branch)
 
         # get target repository path
         self._client.fs.source_branch = branch
         tgt = f"{dataset.repo_id}/{branch}/"
 
+        journal = self._client.transfer_journal
+        transfer_key = journal.key("upload", dataset.repo_id, branch, config_dir)
+        journal_entries = journal.entries(transfer_key) if resume else {}
+        if not resume:
+            journal.clear(transfer_key)
+
         # first verify that delta directory already does not exist
         deltadir = f"{tgt}{config_dir}/delta/"
-        if self._client.fs.exists(deltadir) and not overwrite_existing:
+        if (
+            self._client.fs.exists(deltadir)
+            and not overwrite_existing
+            and not journal_entries
+        ):
             raise RuntimeError(
                 f"Delta directory {deltadir} already exists. "
                 f"Either choose a different branch or set overwrite_existing=True to overwrite. "
                 f"to overwrite the dataset."
             )
 
+        total_files = len(dataset_files)
+        if journal_entries:
+            dataset_files = self._skip_uploaded_files(
+                dataset.repo_id, branch, dataset_files, journal_entries
+            )
+            logger.info(
+                f"Resuming upload to {dataset.name}/{branch}, {len(journal_entries)} objects recorded in the transfer journal."
+            )
+
         # iterate over the dataset files and upload them to the hub
         logger.info(
             f"Uploading {len(dataset_files)} files to dataset {dataset.name} in repo/branch {dataset.name}/{branch}..."
@@ -152,39 +342,270 @@ class DatasetsApi(BaseApi):
         logger.info(
             f"Files to be uploaded:\n{pretty_repr(dataset_files, max_length=4)}, dataset.repo_id={dataset.repo_id}, branch={branch}, config_dir={config_dir}"
         )
-        for file in tqdm.tqdm(dataset_files, desc="Uploading"):
-            # if it is a yaml file, we need to set the content type
-            src, file_tgt = file
-
-            content_type = mimetypes.guess_type(src)
-            if content_type is None:
-                content_type = "application/octet-stream"
-            else:
-                content_type = content_type[0]
-
-            # this is slow but for now it works, in future we could use s3 gateway with async boto3 client instead
-            self._client.fs.put_file(
-                lpath=src,
-                rpath=f"{tgt}{file_tgt}",
-                precheck=False,
-                content_type=content_type,
+        uploads = self._map_concurrently(
+            lambda file: self._upload_file(
+                dataset.repo_id, branch, file[0], file[1], transfer_key
+            ),
+            dataset_files,
+            max_workers=max_workers,
+            desc="Uploading",
+        )
+        journal.clear(transfer_key)
+        return UploadSummary(
+            objects=len(dataset_files),
+            bytes=sum(size for size, linked in uploads if not linked),
+            skipped_objects=total_files - len(dataset_files),
+            deduplicated_objects=sum(linked for _, linked in uploads),
+            deduplicated_bytes=sum(size for size, linked in uploads if linked),
+        )
+
+    def _upload_file(
+        self, repo_id: str, branch: str, src: str, file_tgt: str, transfer_key: str
+    ) -> tuple[int, bool]:
+        """Upload a file, or link it if identical content is stored already, and return (size, linked)."""
+        import os
+
+        from atria_hub.utilities import compute_file_hashes
+
+        # if it is a yaml file, we need to set the content type
+        content_type = _get_content_type_from_filename(src)
+
+        journal = self._client.transfer_journal
+        stat = os.stat(src)
+        hashes = compute_file_hashes(src, "md5", "sha256")
+        journal.mark_pending(transfer_key, file_tgt)
+        linked = self._link_duplicate(
+            repo_id, branch, file_tgt, hashes["sha256"], stat.st_size
+        )
+        if not linked:
+            stats = self._write_object(
+                repo_id, branch, file_tgt, src, content_type=content_type
+            )
+            self._record_content(
+                repo_id, branch, file_tgt, hashes["sha256"], stats=stats
             )
+        if _has_parsed_sidecar(file_tgt):
+            self._write_config_sidecar(repo_id, branch, src, file_tgt, hashes["sha256"])
+        journal.mark_done(
+            transfer_key,
+            file_tgt,
+            size=stat.st_size,
+            checksum=hashes["md5"],
+            mtime_ns=stat.st_mtime_ns,
+        )
+        return stat.st_size, linked
+
+    def _write_config_sidecar(
+        self, repo_id: str, branch: str, src: str, file_tgt: str, digest: str
+    ) -> None:
+        """Store the parsed value of a large uploaded config, so readers skip the YAML parse."""
+        from pathlib import Path
+
+        import yaml
+
+        from atria_hub.config import settings
+        from atria_hub.parsed_config import yaml_loads
+
+        data = Path(src).read_bytes()
+        if len(data) < settings.PARSED_SIDECAR_MIN_BYTES:
+            return
+        try:
+            value = yaml_loads(data)
+        except yaml.YAMLError:
+            logger.warning(f"{file_tgt} is not valid YAML, it is uploaded as is")
+            return
+        self._write_parsed_sidecar(repo_id, branch, digest, value)
+
+    def _skip_uploaded_files(
+        self,
+        repo_id: str,
+        branch: str,
+        dataset_files: list[tuple[str, str]],
+        journal_entries: dict[str, JournalEntry],
+    ) -> list[tuple[str, str]]:
+        """Drop files whose upload is recorded and verified against the remote objects."""
+        import os
+
+        remote = self._remote_objects(
+            f"{repo_id}/{branch}/",
+            [entry.path for entry in journal_entries.values() if entry.state == "done"],
+        )
+        remaining = []
+        for src, file_tgt in dataset_files:
+            entry = journal_entries.get(file_tgt)
+            if entry is None or entry.state != "done":
+                remaining.append((src, file_tgt))
+                continue
+
+            stat = os.stat(src)
+            remote_object = remote.get(file_tgt)
+            if (
+                remote_object is None
+                or stat.st_size != entry.size
+                or stat.st_mtime_ns != entry.mtime_ns
+                or not _checksum_matches(remote_object, entry)
+            ):
+                remaining.append((src, file_tgt))
+        return remaining
+
+    def _remote_objects(self, tgt: str, paths: list[str]) -> dict[str, dict]:
+        """List the remote objects under the top-level directories of `paths`."""
+        remote = {}
+        prefixes = {path.split("/", 1)[0] for path in paths if "/" in path}
+        for prefix in prefixes:
+            for name, info in self._client.fs.find(
+                f"{tgt}{prefix}/", detail=True
+            ).items():
+                remote[name.removeprefix(tgt)] = info
+        for path in paths:
+            if "/" not in path and self._client.fs.exists(f"{tgt}{path}"):
+                remote[path] = self._client.fs.info(f"{tgt}{path}")
+        return remote
 
     def download_files(
-        self, dataset_repo_id: str, branch: str, config_dir: str, destination_path: str
+        self,
+        dataset_repo_id: str,
+        branch: str,
+        config_dir: str,
+        destination_path: str,
+        resume: bool = True,
+        max_workers: int | None = None,
     ) -> None:
-        """Download files from a dataset."""
+        """
+        Download files from a dataset.
+
+        Downloaded objects are recorded in the client's transfer journal, so an
+        interrupted download resumes with the objects that are missing or whose
+        remote checksum changed.
+
+        Args:
+            dataset_repo_id (str): The repository of the dataset.
+            branch (str): The dataset branch.
+            config_dir (str): The dataset configuration directory.
+            destination_path (str): The local directory to download to.
+            resume (bool): Resume an interrupted download recorded in the journal.
+            max_workers (int | None): Number of files downloaded concurrently.
+                Defaults to `settings.STORAGE_TRANSFER_WORKERS`.
+        """
         from pathlib import Path
 
-        from fsspec.callbacks import TqdmCallback
+        from atria_hub.presign import PresignUnavailableError
 
         src = f"{dataset_repo_id}/{branch}/{config_dir}/"
-        tgt = str(Path(destination_path) / config_dir)
-        self._client.fs.get(
-            src,
-            tgt,
-            recursive=True,
-            callback=TqdmCallback(tqdm_kwargs={"desc": "Downloading files"}),
+        tgt = Path(destination_path) / config_dir
+
+        journal = self._client.transfer_journal
+        transfer_key = journal.key("download", dataset_repo_id, branch, config_dir)
+        journal_entries = journal.entries(transfer_key) if resume else {}
+
+        remote = {
+            name.removeprefix(src): info
+            for name, info in self._client.fs.find(src, detail=True).items()
+        }
+        pending = []
+        for path, info in remote.items():
+            entry = journal_entries.get(path)
+            local_path = tgt / path
+            if (
+                entry is not None
+                and entry.state == "done"
+                and local_path.exists()
+                and local_path.stat().st_size == info["size"]
+                and _checksum_matches(info, entry)
+            ):
+                continue
+            pending.append(path)
+
+        def download(path: str) -> None:
+            local_path = tgt / path
+            local_path.parent.mkdir(parents=True, exist_ok=True)
+            journal.mark_pending(transfer_key, path)
+            try:
+                self._client.direct_transport.download_file(
+                    dataset_repo_id,
+                    branch,
+                    f"{config_dir}/{path}",
+                    f"{local_path}.partial",
+                )
+            except (PresignUnavailableError, FileNotFoundError):
+                with self._client.storage_governor.request(
+                    self._client.storage_host,
+                    priority=Priority.BULK,
+                    nbytes=remote[path]["size"],
+                ):
+                    self._client.fs.get_file(f"{src}{path}", f"{local_path}.partial")
+            Path(f"{local_path}.partial").rename(local_path)
+            journal.mark_done(
+                transfer_key,
+                path,
+                size=remote[path]["size"],
+                checksum=remote[path].get("checksum"),
+            )
+
+        self._map_concurrently(
+            download, pending, max_workers=max_workers, desc="Downloading files"
+        )
+        journal.clear(transfer_key)
+
+    def materialize_split(
+        self,
+        dataset_repo_id: str,
+        branch: str,
+        config_name: str,
+        split: str,
+        destination_path: str,
+        cache: MaterializedSplitCache | None = None,
+    ) -> list[Path]:
+        """
+        Materialize a split as memory-mappable Arrow IPC files shared on the node.
+
+        The split is converted from the files already downloaded with
+        `download_files` to `destination_path`; missing files are downloaded
+        first. The entry is keyed by the branch's head commit, so a new commit
+        produces a new entry.
+
+        Args:
+            dataset_repo_id (str): The repository of the dataset.
+            branch (str): The dataset branch.
+            config_name (str): The dataset configuration.
+            split (str): The split to materialize.
+            destination_path (str): The directory passed to `download_files`.
+            cache (MaterializedSplitCache | None): The cache to use. Defaults to
+                one under `settings.CACHE_DIR`.
+
+        Returns:
+            list[Path]: The IPC files, to be opened with `MaterializedSplitCache.open`.
+        """
+        from pathlib import Path
+
+        from atria_hub.dataset_cache import MaterializedSplitCache
+        from atria_hub.delta import read_delta_files
+
+        cache = cache or MaterializedSplitCache()
+        commit_id = self.get_commit_id(dataset_repo_id, branch)
+        cached = cache.get(dataset_repo_id, commit_id, config_name, split)
+        if cached is not None:
+            return cached
+
+        def download_split() -> list[Path]:
+            table_path = f"{dataset_repo_id}/{commit_id}/{config_name}/delta/{split}/"
+            local_dir = Path(destination_path) / config_name / "delta" / split
+            parquet_files = []
+            for delta_file in read_delta_files(self._client.fs, table_path):
+                local_path = local_dir / delta_file.path
+                if (
+                    not local_path.exists()
+                    or local_path.stat().st_size != delta_file.size
+                ):
+                    local_path.parent.mkdir(parents=True, exist_ok=True)
+                    self._client.fs.get_file(
+                        f"{table_path}{delta_file.path}", str(local_path)
+                    )
+                parquet_files.append(local_path)
+            return parquet_files
+
+        return cache.materialize(
+            dataset_repo_id, commit_id, config_name, split, download_split
         )
 
     def get_splits(
@@ -215,9 +636,6 @@ class DatasetsApi(BaseApi):
     def get_config(self, dataset_repo_id: str, branch: str, config_name: str) -> dict:
         from pathlib import Path
 
-        import lakefs
-        import yaml
-
         # list all configs in the branch
         dir_ls = self._client.fs.ls(f"{dataset_repo_id}/{branch}/conf/dataset/")
         if not any(Path(x["name"]).name == f"{config_name}.yaml" for x in dir_ls):
@@ -225,13 +643,10 @@ class DatasetsApi(BaseApi):
                 f"Configuration '{config_name}' not found in the dataset on branch {branch}."
                 f"Available configurations: {[Path(x['name']).name.replace('.yaml', '') for x in dir_ls]}"
             )
-        branch: lakefs.Branch = lakefs.repository(
-            dataset_repo_id, client=self._client.lakefs_client
-        ).branch(branch)
-        with branch.object(f"conf/dataset/{config_name}.yaml").reader(
-            pre_sign=True
-        ) as f:
-            config = yaml.safe_load(f.read().decode("utf-8"))
+        # read from the branch that was listed, so the check and the read agree
+        config = self._read_yaml(
+            dataset_repo_id, branch, f"conf/dataset/{config_name}.yaml"
+        )
         if not isinstance(config, dict):
             raise RuntimeError(
                 f"The dataset configuration {config_name} is not a valid dictionary. "
@@ -239,14 +654,7 @@ class DatasetsApi(BaseApi):
         return config
 
     def get_metadata(self, dataset_repo_id: str, branch: str) -> dict:
-        import lakefs
-        import yaml
-
-        branch: lakefs.Branch = lakefs.repository(
-            dataset_repo_id, client=self._client.lakefs_client
-        ).branch(branch)
-        with branch.object("metadata.yaml").reader(pre_sign=True) as f:
-            config = yaml.safe_load(f.read().decode("utf-8"))
+        config = self._read_yaml(dataset_repo_id, branch, "metadata.yaml")
         if not isinstance(config, dict):
             raise ValueError(
                 "The dataset metadata is not a valid dictionary. "
@@ -261,35 +669,368 @@ class DatasetsApi(BaseApi):
         metadata = self.get_metadata(dataset_repo_id, branch)
         return config, metadata
 
-    def commit_changes(self, dataset_repo_id: str, branch: str, message: str) -> None:
-        """Commit changes to the dataset."""
+    def has_uncommitted_changes(
+        self, dataset_repo_id: str, branch: str, prefixes: list[str] | None = None
+    ) -> bool:
+        """Check for uncommitted changes, stopping at the first one found."""
         import lakefs
-        from lakefs.branch import Branch
 
-        branch: Branch = lakefs.repository(
+        branch: lakefs.Branch = lakefs.repository(
             dataset_repo_id, client=self._client.lakefs_client
         ).branch(branch)
-        uncommitted_changes = list(branch.uncommitted())
-        if len(uncommitted_changes) == 0:
-            return
-        return branch.commit(message=message)
+        for prefix in prefixes or [None]:
+            if next(iter(branch.uncommitted(max_amount=1, prefix=prefix)), None):
+                return True
+        return False
+
+    def commit_changes(
+        self,
+        dataset_repo_id: str,
+        branch: str,
+        message: str,
+        metadata: dict[str, str] | None = None,
+    ):
+        """
+        Commit changes to the dataset.
+
+        lakeFS commits everything staged on a branch, so the commit includes all
+        uncommitted changes of the branch, whoever staged them. Use
+        `upload_and_commit` to commit an upload on its own.
+
+        Args:
+            dataset_repo_id (str): The repository of the dataset.
+            branch (str): The branch to commit.
+            message (str): The commit message.
+            metadata (dict[str, str] | None): Metadata attached to the commit.
+
+        Returns:
+            The created commit, or None if there was nothing to commit.
+        """
+        if not self.has_uncommitted_changes(dataset_repo_id, branch):
+            return None
+        return self._commit(dataset_repo_id, branch, message, metadata)
+
+    def upload_and_commit(
+        self,
+        dataset: Dataset,
+        branch: str,
+        config_dir: str,
+        dataset_files: list[tuple[str, str]],
+        message: str,
+        overwrite_existing: bool = False,
+        max_workers: int | None = None,
+    ):
+        """
+        Upload files and commit them as one transactional operation.
+
+        The files are uploaded to a temporary branch created from `branch`,
+        committed there with the upload summary as metadata and merged into
+        `branch`, so the commit only contains the uploaded files and if the
+        upload, the commit or the merge fails `branch` is left as it was. The
+        temporary branch is deleted in any case. lakeFS does not merge into a
+        branch with uncommitted changes, so `branch` must have none.
+
+        Every call uploads to a new temporary branch, so an interrupted upload
+        is not resumed; it is uploaded again from the start by the next call.
+
+        Args:
+            dataset (Dataset): The dataset to upload to.
+            branch (str): The branch to upload to.
+            config_dir (str): The dataset configuration directory.
+            dataset_files (list[tuple[str, str]]): Pairs of local path and target
+                path relative to the branch root.
+            message (str): The commit message.
+            overwrite_existing (bool): Upload even if the config already has a
+                delta directory.
+            max_workers (int | None): Number of files uploaded concurrently.
+
+        Returns:
+            The merge commit of the upload on `branch`, or None if there was
+            nothing to commit.
+
+        Raises:
+            RuntimeError: If `branch` has uncommitted changes.
+        """
+        import uuid
+
+        import lakefs
+
+        branch = self._ensure_branch(dataset.repo_id, branch, dataset.default_branch)
+        if self.has_uncommitted_changes(dataset.repo_id, branch):
+            raise RuntimeError(
+                f"{dataset.name}/{branch} has uncommitted changes, which lakeFS does "
+                "not merge into. Commit or reset them before upload_and_commit."
+            )
+        repository = lakefs.repository(
+            dataset.repo_id, client=self._client.lakefs_client
+        )
+        upload_branch = self._ensure_branch(
+            dataset.repo_id, f"{branch}-upload-{uuid.uuid4().hex[:12]}", branch
+        )
+        try:
+            summary = self.upload_files(
+                dataset=dataset,
+                branch=upload_branch,
+                config_dir=config_dir,
+                dataset_files=dataset_files,
+                overwrite_existing=overwrite_existing,
+                resume=False,
+                max_workers=max_workers,
+            )
+            commit = self.commit_changes(
+                dataset.repo_id,
+                upload_branch,
+                message=message,
+                metadata=summary.as_commit_metadata(),
+            )
+            if commit is None:
+                return None
+            try:
+                merge_id = repository.branch(upload_branch).merge_into(
+                    branch, message=message, metadata=summary.as_commit_metadata()
+                )
+            except Exception:
+                self._client.ref_cache.invalidate(dataset.repo_id, branch)
+                raise
+            self._client.ref_cache.set_commit(dataset.repo_id, branch, merge_id)
+            # the temporary branch is deleted, the merged objects stay linkable
+            self._client.content_index.move_branch(
+                dataset.repo_id, upload_branch, branch
+            )
+            return repository.ref(merge_id).get_commit()
+        except BaseException:
+            logger.error(
+                f"Upload to {dataset.name}/{branch} failed, {branch} was left unchanged"
+            )
+            raise
+        finally:
+            self._client.content_index.discard_branch(dataset.repo_id, upload_branch)
+            repository.branch(upload_branch).delete()
+            self._client.ref_cache.invalidate(dataset.repo_id, upload_branch)
+            self._client.transfer_journal.clear(
+                self._client.transfer_journal.key(
+                    "upload", dataset.repo_id, upload_branch, config_dir
+                )
+            )
 
     def dataset_table_path(
         self, dataset_repo_id: str, branch: str, config_name: str, split: str
     ) -> str:
         return f"lakefs://{dataset_repo_id}/{branch}/{config_name}/delta/{split}/"
 
+    def get_split_shard(
+        self,
+        dataset_repo_id: str,
+        branch: str,
+        config_name: str,
+        split: str,
+        rank: int,
+        world_size: int,
+        epoch: int = 0,
+        seed: int = 0,
+        split_row_groups: bool = False,
+        state: dict | None = None,
+    ) -> SplitShard:
+        """
+        Compute the slice of a split's Delta files that a rank should read.
+
+        The branch is resolved to its head commit and the active data files are
+        read from the Delta log, so each rank only needs to download its own
+        units. All ranks compute the same assignment independently.
+
+        Args:
+            dataset_repo_id (str): The repository of the dataset.
+            branch (str): The dataset branch.
+            config_name (str): The dataset configuration.
+            split (str): The split to read.
+            rank (int): Rank of the calling process.
+            world_size (int): Total number of ranks.
+            epoch (int): Epoch used to reshuffle the assignment.
+            seed (int): Base seed of the shuffle.
+            split_row_groups (bool): Assign parquet row groups instead of whole
+                files. This reads every file footer, but balances splits made of
+                few large files.
+            state (dict | None): A state returned by `SplitShard.state_dict` to
+                resume from.
+
+        Returns:
+            SplitShard: The units assigned to `rank`.
+
+        Raises:
+            ValueError: If `rank` is out of range or `state` does not match.
+        """
+        from atria_hub.delta import read_delta_files
+        from atria_hub.sharding import ShardUnit, SplitShard, assign_units_to_ranks
+
+        if not 0 <= rank < world_size:
+            raise ValueError(f"rank must be in [0, {world_size}), got {rank}.")
+
+        commit_id = (
+            state["commit_id"]
+            if state is not None
+            else self.get_commit_id(dataset_repo_id, branch)
+        )
+        table_path = f"{dataset_repo_id}/{commit_id}/{config_name}/delta/{split}/"
+        units = []
+        for delta_file in read_delta_files(self._client.fs, table_path):
+            if not split_row_groups:
+                units.append(
+                    ShardUnit(
+                        path=delta_file.path,
+                        size=delta_file.size,
+                        num_rows=delta_file.num_records,
+                    )
+                )
+                continue
+
+            import pyarrow.parquet as pq
+
+            with self._client.fs.open(f"{table_path}{delta_file.path}", "rb") as f:
+                metadata = pq.ParquetFile(f).metadata
+            for row_group in range(metadata.num_row_groups):
+                row_group_metadata = metadata.row_group(row_group)
+                units.append(
+                    ShardUnit(
+                        path=delta_file.path,
+                        size=row_group_metadata.total_byte_size,
+                        row_group=row_group,
+                        num_rows=row_group_metadata.num_rows,
+                    )
+                )
+
+        shard = SplitShard(
+            table_path=table_path,
+            commit_id=commit_id,
+            rank=rank,
+            world_size=world_size,
+            epoch=epoch,
+            seed=seed,
+            units=assign_units_to_ranks(
+                units, world_size=world_size, epoch=epoch, seed=seed
+            )[rank],
+        )
+        if state is not None:
+            shard.load_state_dict(state)
+        return shard
+
+    def download_shard(self, shard: SplitShard, destination_path: str) -> list[str]:
+        """
+        Download the files of the remaining units of a shard.
+
+        Args:
+            shard (SplitShard): The shard returned by `get_split_shard`.
+            destination_path (str): Local directory the table files are written to.
+
+        Returns:
+            list[str]: Local paths of the downloaded files, in reading order.
+        """
+        from pathlib import Path
+
+        local_paths = []
+        for unit in shard.remaining_units():
+            local_path = str(Path(destination_path) / unit.path)
+            if local_path in local_paths:
+                continue
+            if not Path(local_path).exists():
+                # download next to the target and rename so interrupted
+                # downloads are never mistaken for complete files
+                Path(local_path).parent.mkdir(parents=True, exist_ok=True)
+                self._client.fs.get_file(
+                    f"{shard.table_path}{unit.path}", f"{local_path}.partial"
+                )
+                Path(f"{local_path}.partial").rename(local_path)
+            local_paths.append(local_path)
+        return local_paths
+
+    def _split_files_with_row_counts(
+        self, dataset_repo_id: str, commit_id: str, config_name: str, split: str
+    ) -> list[DeltaFile]:
+        """List the Delta files of a split, reading the parquet footers of files without row statistics."""
+        from dataclasses import replace
+
+        from atria_hub.delta import read_delta_files
+
+        table_path = f"{dataset_repo_id}/{commit_id}/{config_name}/delta/{split}/"
+        files = read_delta_files(self._client.fs, table_path)
+        for position, delta_file in enumerate(files):
+            if delta_file.num_records is None:
+                import pyarrow.parquet as pq
+
+                with self._client.fs.open(f"{table_path}{delta_file.path}", "rb") as f:
+                    files[position] = replace(
+                        delta_file, num_records=pq.ParquetFile(f).metadata.num_rows
+                    )
+        return files
+
+    def plan_incremental_evaluation(
+        self,
+        dataset_repo_id: str,
+        config_name: str,
+        split: str,
+        old_reference: str,
+        new_reference: str,
+    ) -> IncrementalPlan:
+        """
+        Work out which samples of a split changed between two dataset commits.
+
+        The commits are diffed by lakeFS under the split's table, so an unchanged
+        split costs a single request, and otherwise the Delta logs of both commits
+        are read to map the added, removed and overwritten data files to sample
+        indices.
+
+        Args:
+            dataset_repo_id (str): The repository of the dataset.
+            config_name (str): The dataset configuration.
+            split (str): The split.
+            old_reference (str): The evaluated branch or commit.
+            new_reference (str): The branch or commit to evaluate.
+
+        Returns:
+            IncrementalPlan: The samples to copy from the old evaluation and the
+                ones to recompute.
+        """
+        import lakefs
+
+        from atria_hub.incremental import plan_incremental
+
+        repository = lakefs.repository(
+            dataset_repo_id, client=self._client.lakefs_client
+        )
+        old_commit_id = self.get_commit_id(dataset_repo_id, old_reference)
+        new_commit_id = self.get_commit_id(dataset_repo_id, new_reference)
+        prefix = f"{config_name}/delta/{split}/"
+        changes = (
+            list(repository.ref(old_commit_id).diff(new_commit_id, prefix=prefix))
+            if old_commit_id != new_commit_id
+            else []
+        )
+        new_files = self._split_files_with_row_counts(
+            dataset_repo_id, new_commit_id, config_name, split
+        )
+        if not changes:
+            return plan_incremental(old_commit_id, new_commit_id, new_files, new_files)
+        old_files = self._split_files_with_row_counts(
+            dataset_repo_id, old_commit_id, config_name, split
+        )
+        return plan_incremental(
+            old_commit_id,
+            new_commit_id,
+            old_files,
+            new_files,
+            changed_paths=[
+                change.path.removeprefix(prefix)
+                for change in changes
+                if change.type == "changed"
+            ],
+        )
+
     def get_or_create_eval_branch(
         self, dataset_repo_id: str, dataset_branch: str
     ) -> str:
-        import lakefs
-
         commit_sha = self.get_commit_sha(dataset_repo_id, dataset_branch)
-        eval_branch = f"eval-{dataset_branch}-{commit_sha[:7]}"
-        lakefs.repository(dataset_repo_id, client=self._client.lakefs_client).branch(
-            eval_branch
-        ).create(source_reference=dataset_branch, exist_ok=True)
-        return eval_branch
+        return self._ensure_branch(
+            dataset_repo_id, f"eval-{dataset_branch}-{commit_sha[:7]}", dataset_branch
+        )
 
     def eval_base_path(
         self,
@@ -339,6 +1080,30 @@ class DatasetsApi(BaseApi):
             + "/metrics.json"
         )
 
+    def eval_output_session(
+        self, dataset_repo_id: str, eval_branch: str, message: str | None = None
+    ) -> EvalOutputSession:
+        """
+        Start a session that stages evaluation outputs and commits them together.
+
+        Use it as a context manager; the staged outputs are committed in a single
+        commit when the block exits without an exception, or on `flush`.
+
+        Args:
+            dataset_repo_id (str): The repository of the dataset.
+            eval_branch (str): The evaluation branch to write to.
+            message (str | None): The commit message.
+
+        Returns:
+            EvalOutputSession: The session.
+        """
+        return EvalOutputSession(
+            self,
+            dataset_repo_id=dataset_repo_id,
+            eval_branch=eval_branch,
+            message=message,
+        )
+
     def write_eval_metrics(
         self,
         dataset_repo_id: str,
@@ -348,27 +1113,21 @@ class DatasetsApi(BaseApi):
         output_path: str,
         data: dict,
     ) -> str:
-        import json
-
-        import lakefs
-        from lakefs.branch import Branch
-
-        eval_branch: Branch = lakefs.repository(
-            dataset_repo_id, client=self._client.lakefs_client
-        ).branch(eval_branch)
-        eval_metrics_path = self.eval_metrics_path(
+        with self.eval_output_session(
+            dataset_repo_id,
+            eval_branch,
+            message=f"Write evaluation metrics for {dataset_repo_id} on {eval_branch} for split {split}",
+        ) as session:
+            session.write_metrics(
+                config_name=config_name, split=split, output_path=output_path, data=data
+            )
+        return self.eval_metrics_path(
             dataset_repo_id=dataset_repo_id,
-            eval_branch=eval_branch.id,
+            eval_branch=eval_branch,
             config_name=config_name,
             split=split,
             output_path=output_path,
         )
-        eval_branch.object(eval_metrics_path).upload(json.dumps(data).encode("utf-8"))
-        eval_branch.commit(
-            message=f"Write evaluation metrics for {dataset_repo_id} on {eval_branch.id} for split {split}",
-            paths=[eval_metrics_path],
-        )
-        return eval_metrics_path
 
     def read_eval_metrics(
         self,
@@ -395,9 +1154,55 @@ class DatasetsApi(BaseApi):
 
         if not eval_branch.object(eval_metrics_path).exists():
             return None, {}
+        return eval_metrics_path, self._read_object(
+            dataset_repo_id, eval_branch.id, eval_metrics_path
+        ).decode("utf-8")
 
-        with eval_branch.object(eval_metrics_path).reader(pre_sign=True) as f:
-            return eval_metrics_path, f.read().decode("utf-8")
+    def read_all_eval_metrics(
+        self,
+        dataset_repo_id: str,
+        eval_branch: str,
+        config_name: str,
+        max_workers: int | None = None,
+    ) -> dict[str, dict]:
+        """
+        Read all evaluation metrics of a configuration on an evaluation branch.
+
+        The `eval/` tree is listed once and the metrics files are fetched
+        concurrently.
+
+        Args:
+            dataset_repo_id (str): The repository of the dataset.
+            eval_branch (str): The evaluation branch.
+            config_name (str): The dataset configuration.
+            max_workers (int | None): Number of files fetched concurrently.
+
+        Returns:
+            dict[str, dict]: The metrics keyed by `<split>/<output_path>`.
+        """
+        import json
+
+        import lakefs
+
+        ref = lakefs.repository(dataset_repo_id, client=self._client.lakefs_client).ref(
+            eval_branch
+        )
+        # metrics are stored under their full lakefs:// uri as the key
+        prefix = f"lakefs://{dataset_repo_id}/{eval_branch}/{config_name}/eval/"
+        keys = {}
+        for obj in ref.objects(prefix=prefix):
+            if obj.path.endswith("/metrics.json"):
+                name = obj.path.removeprefix(prefix).removesuffix("/metrics.json")
+                keys[name] = obj.path
+        contents = self._map_concurrently(
+            lambda key: self._read_object(dataset_repo_id, eval_branch, key),
+            keys.values(),
+            max_workers=max_workers,
+        )
+        return {
+            name: json.loads(content)
+            for name, content in zip(keys, contents, strict=True)
+        }
 
     def delete(self, dataset: Dataset) -> None:
         """Delete a dataset from the hub."""
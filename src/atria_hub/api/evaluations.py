@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import io
 import json
+import threading
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
@@ -16,11 +18,53 @@ from atria_hub.client import AtriaHubClient
 from atria_hub.exceptions import api_error_handler
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
     from atriax_client.models.evaluation_experiment import EvaluationExperiment
 
+    from atria_hub.experiment_cache import ExperimentSpec
+    from atria_hub.explanations import ExplanationHandle
+    from atria_hub.incremental import IncrementalPlan
+    from atria_hub.index_ranges import IndexRanges
+    from atria_hub.spool import SpooledEvaluationWriter
+
 logger = get_logger(__name__)
 
 
+def _as_dict(record: Any) -> dict:
+    return record if isinstance(record, dict) else record.to_dict()
+
+
+@lru_cache
+def _accepts_argument(target: Callable, name: str) -> bool:
+    import inspect
+
+    return name in inspect.signature(target).parameters
+
+
+@lru_cache
+def _accepts_config_id(model_class: type) -> bool:
+    """Whether a request body takes a config ID in place of the config."""
+    import inspect
+
+    parameters = inspect.signature(model_class).parameters
+    return "config_id" in parameters and (
+        "config" not in parameters
+        or parameters["config"].default is not inspect.Parameter.empty
+    )
+
+
+def _config_reference(
+    client: AtriaHubClient, model_class: type, config: ConfigBase, as_json: bool = False
+) -> dict[str, Any]:
+    """Reference a config by its interned snapshot ID when the request body allows it."""
+    if not _accepts_config_id(model_class):
+        return {"config": config.to_dict() if as_json else config}
+    from atria_hub.api.config_snapshots import ConfigSnapshotsApi
+
+    return {"config_id": ConfigSnapshotsApi(client).intern(config)}
+
+
 @dataclass
 class MetricData:
     name: str
@@ -28,6 +72,37 @@ class MetricData:
     data: dict[str, Any]
 
 
+@dataclass
+class ExplanationMetrics:
+    """
+    Metrics of one sample explanation.
+
+    Attributes:
+        evaluation_experiment_id (UUID): The experiment of the explanation.
+        sample_explanation_id (UUID): The explanation.
+        metric_data (list[MetricData]): The metrics.
+    """
+
+    evaluation_experiment_id: UUID
+    sample_explanation_id: UUID
+    metric_data: list[MetricData]
+
+
+@dataclass
+class BatchWriteResult:
+    """
+    Outcome of a batch write.
+
+    Attributes:
+        written (int): Number of metrics written.
+        failures (list[tuple[ExplanationMetrics, Exception]]): One entry per failed
+            request, holding exactly the metrics it carried, with its error.
+    """
+
+    written: int = 0
+    failures: list[tuple[ExplanationMetrics, Exception]] = field(default_factory=list)
+
+
 class SampleExplanationsApi(BaseApi):
     @api_error_handler
     def write(
@@ -45,15 +120,17 @@ class SampleExplanationsApi(BaseApi):
             BodySampleExplanationsWrite,
         )
 
-        print("config", type(config), flush=True)
+        config_reference = _config_reference(
+            self._client, BodySampleExplanationsWrite, config
+        )
         with self._client.protected_api_client as client:
-            return sample_explanations_write.sync_detailed(
+            response = sample_explanations_write.sync_detailed(
                 client=client,
                 evaluation_experiment_id=evaluation_experiment_id,
                 body=BodySampleExplanationsWrite(
                     name=name,
                     sample_index=sample_index,
-                    config=config,
+                    **config_reference,
                     explanation_metadata=json.dumps(explanation_metadata),
                     explanation_file=File(
                         payload=io.BytesIO(explanation_payload),
@@ -62,6 +139,11 @@ class SampleExplanationsApi(BaseApi):
                     ),
                 ),
             )
+        # the write may replace a payload cached under the same name
+        self._client.explanation_payload_cache.discard(
+            evaluation_experiment_id, sample_index, name
+        )
+        return response
 
     @api_error_handler
     def read(
@@ -69,6 +151,7 @@ class SampleExplanationsApi(BaseApi):
         evaluation_experiment_id: UUID,
         sample_index: int,
         config_id: UUID | None = None,
+        include_payload: bool = True,
     ) -> list[dict]:
         """Read a batch of sample results from an evaluation."""
         from atriax_client.api.sample_explanations import sample_explanations_read
@@ -77,6 +160,10 @@ class SampleExplanationsApi(BaseApi):
             kwargs = {}
             if config_id is not None:
                 kwargs["config_id"] = config_id
+            if not include_payload and _accepts_argument(
+                sample_explanations_read.sync_detailed, "include_payload"
+            ):
+                kwargs["include_payload"] = False
             return sample_explanations_read.sync_detailed(
                 client=client,
                 evaluation_experiment_id=evaluation_experiment_id,
@@ -84,6 +171,83 @@ class SampleExplanationsApi(BaseApi):
                 **kwargs,
             )
 
+    def read_metadata(
+        self,
+        evaluation_experiment_id: UUID,
+        sample_index: int,
+        config_id: UUID | None = None,
+    ) -> list[ExplanationHandle]:
+        """
+        Read the metadata of the explanations of a sample, without their payloads.
+
+        Each explanation is returned as a handle that downloads its payload, or a
+        byte range of it, on first access and keeps whole payloads in the
+        on-disk payload cache, so browsing and filtering explanations by
+        metadata does not transfer any attribution map.
+
+        Args:
+            evaluation_experiment_id (UUID): The experiment.
+            sample_index (int): The explained sample.
+            config_id (UUID | None): Only read the explanations of this config.
+
+        Returns:
+            list[ExplanationHandle]: The explanations of the sample.
+        """
+        from atria_hub.explanations import ExplanationHandle
+
+        return [
+            ExplanationHandle.from_record(
+                self, evaluation_experiment_id, {"sample_index": sample_index, **record}
+            )
+            for record in map(
+                _as_dict,
+                self.read(
+                    evaluation_experiment_id,
+                    sample_index,
+                    config_id=config_id,
+                    include_payload=False,
+                ),
+            )
+        ]
+
+    def prefetch(
+        self, handles: Iterable[ExplanationHandle], max_workers: int | None = None
+    ) -> None:
+        """Download the payloads of a subset of explanations into the cache concurrently."""
+        self._map_concurrently(
+            lambda handle: handle.payload(),
+            [handle for handle in handles if not handle.cached],
+            max_workers=max_workers,
+            desc="Prefetching explanations",
+        )
+
+    def _fetch_payload(
+        self, url: str, offset: int = 0, length: int | None = None
+    ) -> bytes:
+        import httpx
+
+        headers = {}
+        if offset or length is not None:
+            end = "" if length is None else offset + length - 1
+            headers["Range"] = f"bytes={offset}-{end}"
+        target = httpx.URL(url)
+        if (
+            target.is_absolute_url
+            and target.host != httpx.URL(self._client.base_url).host
+        ):
+            # e.g. presigned object store URLs, which reject any other credentials
+            response = self._client.direct_transport.http.get(url, headers=headers)
+        else:
+            with self._client.protected_api_client as client:
+                response = client.get_httpx_client().get(url, headers=headers)
+        response.raise_for_status()
+        if headers and response.status_code != 206:
+            # the server ignored the range, slice the full payload
+            return response.content[
+                offset : None if length is None else offset + length
+            ]
+        return response.content
+
 
 class SampleExplanationMetricsApi(BaseApi):
     def __init__(self, client: AtriaHubClient):
@@ -107,21 +271,154 @@ class SampleExplanationMetricsApi(BaseApi):
             SampleExplanationMetricCreateData,
         )
 
+        from atria_hub.config import settings
+
+        if settings.FAST_JSON:
+            from atria_hub import fast_json
+
+            return fast_json.request(
+                self._client,
+                sample_explanation_metrics_write,
+                body=[
+                    {
+                        "name": d.name,
+                        "data": d.data,
+                        **_config_reference(
+                            self._client,
+                            SampleExplanationMetricCreate,
+                            d.config,
+                            as_json=True,
+                        ),
+                    }
+                    for d in metric_data
+                ],
+                evaluation_experiment_id=evaluation_experiment_id,
+                sample_explanation_id=sample_explanation_id,
+            )
+        body = [
+            SampleExplanationMetricCreate(
+                name=d.name,
+                data=SampleExplanationMetricCreateData.from_dict(d.data),
+                **_config_reference(
+                    self._client, SampleExplanationMetricCreate, d.config
+                ),
+            )
+            for d in metric_data
+        ]
         with self._client.protected_api_client as client:
             return sample_explanation_metrics_write.sync_detailed(
                 client=client,
                 evaluation_experiment_id=evaluation_experiment_id,
-                body=[
-                    SampleExplanationMetricCreate(
-                        name=d.name,
-                        config=d.config,
-                        data=SampleExplanationMetricCreateData.from_dict(d.data),
-                    )
-                    for d in metric_data
-                ],
+                body=body,
                 sample_explanation_id=sample_explanation_id,
             )
 
+    def write_many(
+        self,
+        items: Iterable[ExplanationMetrics],
+        batch_size: int | None = None,
+        max_workers: int | None = None,
+    ) -> BatchWriteResult:
+        """
+        Write the metrics of many explanations, possibly of several experiments.
+
+        Items of the same explanation are merged, the metrics of every explanation
+        are split into requests of at most `batch_size` metrics, and the requests
+        are sent concurrently. A failed request does not stop the others; the
+        metrics it carried are reported in the result instead, so retrying the
+        failures writes exactly the metrics that are missing.
+
+        Args:
+            items (Iterable[ExplanationMetrics]): The metrics to write.
+            batch_size (int | None): Largest number of metrics per request. Defaults
+                to `settings.METRICS_BATCH_SIZE`.
+            max_workers (int | None): Number of concurrent requests.
+
+        Returns:
+            BatchWriteResult: The number of metrics written and the failed requests.
+        """
+        from atria_hub.config import settings
+
+        batch_size = batch_size or settings.METRICS_BATCH_SIZE
+        grouped: dict[tuple[UUID, UUID], list[ExplanationMetrics]] = {}
+        for item in items:
+            grouped.setdefault(
+                (item.evaluation_experiment_id, item.sample_explanation_id), []
+            ).append(item)
+        requests = []
+        for (experiment_id, explanation_id), group in grouped.items():
+            metric_data = [d for item in group for d in item.metric_data]
+            for position in range(0, len(metric_data), batch_size):
+                requests.append(
+                    (
+                        experiment_id,
+                        explanation_id,
+                        metric_data[position : position + batch_size],
+                    )
+                )
+
+        def send(request: tuple[UUID, UUID, list[MetricData]]) -> Exception | None:
+            try:
+                self.write(*request)
+            except Exception as e:
+                return e
+            return None
+
+        errors = self._map_concurrently(
+            send, requests, max_workers=max_workers, desc="Writing explanation metrics"
+        )
+        result = BatchWriteResult()
+        for request, error in zip(requests, errors, strict=True):
+            if error is None:
+                result.written += len(request[2])
+            else:
+                result.failures.append((ExplanationMetrics(*request), error))
+        if result.failures:
+            logger.warning(
+                f"Failed {len(result.failures)} of {len(requests)} explanation metric requests"
+            )
+        return result
+
+    def read_many(
+        self,
+        evaluation_experiment_id: UUID,
+        sample_ranges: Iterable[tuple[int, int]],
+        config_id: UUID | None = None,
+        max_workers: int | None = None,
+    ) -> dict[int, list[dict]]:
+        """
+        Read the explanation metrics of every sample in `[start, end)` index ranges concurrently.
+
+        The hub reads the metrics of one sample per request, so this sends one
+        request per sample index, at most `max_workers` at a time; it saves
+        waiting on them one by one, not round trips.
+
+        Args:
+            evaluation_experiment_id (UUID): The experiment.
+            sample_ranges (Iterable[tuple[int, int]]): The sample index ranges, e.g.
+                `IndexRanges.ranges()`.
+            config_id (UUID | None): Only read the metrics of this config.
+            max_workers (int | None): Number of concurrent requests.
+
+        Returns:
+            dict[int, list[dict]]: The metrics of every sample index.
+        """
+        indices = [index for start, end in sample_ranges for index in range(start, end)]
+        return dict(
+            zip(
+                indices,
+                self._map_concurrently(
+                    lambda index: self.read(
+                        evaluation_experiment_id, index, config_id=config_id
+                    ),
+                    indices,
+                    max_workers=max_workers,
+                    desc="Reading explanation metrics",
+                ),
+                strict=True,
+            )
+        )
+
     @api_error_handler
     def read(
         self,
@@ -146,6 +443,11 @@ class SampleExplanationMetricsApi(BaseApi):
 
 
 class SampleEvaluationApi(BaseApi):
+    def __init__(self, client: AtriaHubClient):
+        self._client = client
+        self._completed: dict[UUID, IndexRanges] = {}
+        self._completed_lock = threading.Lock()
+
     @api_error_handler
     def list_indices(self, evaluation_experiment_id: UUID) -> list[int]:
         """Read a batch of sample results from an evaluation."""
@@ -156,17 +458,94 @@ class SampleEvaluationApi(BaseApi):
                 client=client, evaluation_experiment_id=evaluation_experiment_id
             )
 
-    @api_error_handler
+    def completed_indices(
+        self, evaluation_experiment_id: UUID, refresh: bool = False
+    ) -> IndexRanges:
+        """
+        Return the evaluated sample indices of an experiment as compact runs.
+
+        The indices are fetched once per experiment and then kept up to date with
+        the writes made through this client, so callers can test membership and
+        skip done work without holding a set of every index.
+
+        Args:
+            evaluation_experiment_id (UUID): The evaluation experiment.
+            refresh (bool): Fetch the indices again, e.g. to see writes of other
+                processes.
+        """
+        from atria_hub.index_ranges import IndexRanges
+
+        with self._completed_lock:
+            completed = self._completed.get(evaluation_experiment_id)
+        if completed is None or refresh:
+            completed = IndexRanges.from_indices(
+                self.list_indices(evaluation_experiment_id)
+            )
+            with self._completed_lock:
+                self._completed[evaluation_experiment_id] = completed
+        return completed
+
+    def pending_ranges(
+        self,
+        evaluation_experiment_id: UUID,
+        num_samples: int,
+        start: int = 0,
+        refresh: bool = False,
+    ) -> Iterator[tuple[int, int]]:
+        """
+        Yield the `[start, end)` runs of sample indices of a split that still need evaluating.
+
+        Args:
+            evaluation_experiment_id (UUID): The evaluation experiment.
+            num_samples (int): Number of samples of the split.
+            start (int): First sample index to consider.
+            refresh (bool): Fetch the evaluated indices again first.
+        """
+        return self.completed_indices(
+            evaluation_experiment_id, refresh=refresh
+        ).missing(start, num_samples)
+
+    def _set_completed(
+        self, evaluation_experiment_id: UUID, completed: IndexRanges
+    ) -> None:
+        with self._completed_lock:
+            self._completed[evaluation_experiment_id] = completed
+
     def write(
         self, evaluation_experiment_id: UUID, data_per_sample_index: dict[int, dict]
     ) -> None:
         """Write a sample result to an evaluation."""
+        result = self._write(evaluation_experiment_id, data_per_sample_index)
+        with self._completed_lock:
+            completed = self._completed.get(evaluation_experiment_id)
+            if completed is not None:
+                completed.update(data_per_sample_index)
+        return result
+
+    @api_error_handler
+    def _write(
+        self, evaluation_experiment_id: UUID, data_per_sample_index: dict[int, dict]
+    ) -> None:
         from atriax_client.api.sample_evaluations import sample_evaluations_write
         from atriax_client.models import (
             SampleEvaluationCreate,
             SampleEvaluationCreateData,
         )
 
+        from atria_hub.config import settings
+
+        if settings.FAST_JSON:
+            from atria_hub import fast_json
+
+            return fast_json.request(
+                self._client,
+                sample_evaluations_write,
+                body=[
+                    {"sample_index": sample_index, "data": data}
+                    for sample_index, data in data_per_sample_index.items()
+                ],
+                evaluation_experiment_id=evaluation_experiment_id,
+            )
         with self._client.protected_api_client as client:
             return sample_evaluations_write.sync_detailed(
                 client=client,
@@ -187,6 +566,17 @@ class SampleEvaluationApi(BaseApi):
         """Read a batch of sample results from an evaluation."""
         from atriax_client.api.sample_evaluations import sample_evaluations_read
 
+        from atria_hub.config import settings
+
+        if settings.FAST_JSON:
+            from atria_hub import fast_json
+
+            return fast_json.request(
+                self._client,
+                sample_evaluations_read,
+                body=sample_indices,
+                evaluation_experiment_id=evaluation_experiment_id,
+            )
         with self._client.protected_api_client as client:
             return sample_evaluations_read.sync_detailed(
                 client=client,
@@ -205,7 +595,18 @@ class EvaluationMetricsApi(BaseApi):
         from atriax_client.api.metrics import metrics_write
         from atriax_client.models.evaluation_metric_create import EvaluationMetricCreate
 
+        from atria_hub.config import settings
+
         logger.info("metrics %s", metrics)
+        if settings.FAST_JSON:
+            from atria_hub import fast_json
+
+            return fast_json.request(
+                self._client,
+                metrics_write,
+                body=[{"key": key, "value": value} for key, value in metrics.items()],
+                evaluation_experiment_id=evaluation_experiment_id,
+            )
         with self._client.protected_api_client as client:
             return metrics_write.sync_detailed(
                 client=client,
@@ -221,6 +622,16 @@ class EvaluationMetricsApi(BaseApi):
         """Read a batch of sample results from an evaluation."""
         from atriax_client.api.metrics import metrics_read
 
+        from atria_hub.config import settings
+
+        if settings.FAST_JSON:
+            from atria_hub import fast_json
+
+            return fast_json.request(
+                self._client,
+                metrics_read,
+                evaluation_experiment_id=evaluation_experiment_id,
+            )
         with self._client.protected_api_client as client:
             return metrics_read.sync_detailed(
                 client=client, evaluation_experiment_id=evaluation_experiment_id
@@ -255,6 +666,31 @@ class EvaluationsApi(BaseApi):
         """Access to sample explanation metrics API."""
         return self._sample_explanation_metrics
 
+    def spooled_writer(
+        self, spool_path: str | None = None, batch_size: int | None = None
+    ) -> SpooledEvaluationWriter:
+        """
+        Open a writer that spools results to local disk and uploads them in the background.
+
+        Args:
+            spool_path (str | None): Location of the spool database. Defaults to one
+                per hub URL under `settings.CACHE_DIR`, shared by all processes of
+                the user. A spool must only be used with a single hub.
+            batch_size (int | None): Largest number of results uploaded per request.
+                Defaults to `settings.SPOOL_BATCH_SIZE`.
+
+        Returns:
+            SpooledEvaluationWriter: The writer, to be closed (or used as a context
+                manager) to wait for the remaining uploads.
+        """
+        from atria_hub.spool import EvaluationSpool, SpooledEvaluationWriter
+
+        return SpooledEvaluationWriter(
+            self,
+            spool=EvaluationSpool(spool_path, base_url=self._client.base_url),
+            batch_size=batch_size,
+        )
+
     @api_error_handler
     def get_or_create(
         self,
@@ -289,9 +725,252 @@ class EvaluationsApi(BaseApi):
                 ),
             )
 
+    def get_or_create_grid(
+        self,
+        datasets: list[tuple[UUID, str, str, str]],
+        models: list[tuple[UUID, str, str]],
+        max_workers: int | None = None,
+        use_cache: bool = True,
+    ) -> dict[ExperimentSpec, UUID]:
+        """
+        Provision the experiments of every pair of dataset split and model.
+
+        Experiments already provisioned by an earlier sweep are read from the
+        on-disk experiment cache without contacting the hub. For the others, the
+        referenced datasets and models are looked up once each, which fails early
+        on a wrong reference, and the experiments are then looked up or created
+        concurrently.
+
+        Args:
+            datasets (list[tuple[UUID, str, str, str]]): (dataset id, branch, config
+                name, split) of every evaluated dataset split.
+            models (list[tuple[UUID, str, str]]): (model id, branch, config name) of
+                every evaluated model.
+            max_workers (int | None): Number of concurrent requests.
+            use_cache (bool): Read experiment IDs from the experiment cache.
+
+        Returns:
+            dict[ExperimentSpec, UUID]: The experiment ID of every pair.
+        """
+        from dataclasses import asdict
+
+        from atria_hub.experiment_cache import experiment_grid
+
+        specs = experiment_grid(datasets, models)
+        cache = self._client.experiment_cache
+        experiment_ids = (
+            cache.get_many(self._client.base_url, specs) if use_cache else {}
+        )
+        missing = [spec for spec in specs if spec not in experiment_ids]
+        if missing:
+            self._resolve_grid_references(missing, max_workers=max_workers)
+            created = dict(
+                zip(
+                    missing,
+                    self._map_concurrently(
+                        lambda spec: self.get_or_create(**asdict(spec)).id,
+                        missing,
+                        max_workers=max_workers,
+                        desc="Provisioning experiments",
+                    ),
+                    strict=True,
+                )
+            )
+            cache.put_many(self._client.base_url, created)
+            experiment_ids.update(created)
+        return {spec: experiment_ids[spec] for spec in specs}
+
+    def _resolve_grid_references(
+        self, specs: list[ExperimentSpec], max_workers: int | None = None
+    ) -> None:
+        """Look up every referenced dataset and model once, failing early on a wrong reference."""
+        from atria_hub.api.datasets import DatasetsApi
+        from atria_hub.api.models import ModelsApi
+
+        datasets_api = DatasetsApi(self._client)
+        models_api = ModelsApi(self._client)
+        references = list(
+            {("dataset", spec.dataset_id) for spec in specs}
+            | {("model", spec.model_id) for spec in specs}
+        )
+        self._map_concurrently(
+            lambda reference: (
+                datasets_api if reference[0] == "dataset" else models_api
+            ).get(reference[1]),
+            references,
+            max_workers=max_workers,
+        )
+
+    def carry_forward(
+        self,
+        previous_experiment_id: UUID,
+        experiment_id: UUID,
+        plan: IncrementalPlan,
+        batch_size: int | None = None,
+        explanations: bool = True,
+        max_workers: int | None = None,
+    ) -> IndexRanges:
+        """
+        Copy the results of unchanged samples from a previous evaluation and return the samples left to evaluate.
+
+        Results of the samples carried by `plan` (see
+        `DatasetsApi.plan_incremental_evaluation`) are read from the previous
+        experiment and written to the new one under their new sample indices.
+        Samples that changed, and carried samples that the previous experiment
+        never evaluated, are returned. The experiments may be the same, in which
+        case only moved samples are rewritten. The stale results left at indices
+        that no carried sample occupies anymore cannot be deleted from the hub, so
+        they are only dropped from the cached `completed_indices` of this client;
+        callers must evaluate the returned indices rather than refreshing the
+        completed indices of the experiment.
+
+        Args:
+            previous_experiment_id (UUID): The experiment of the old commit.
+            experiment_id (UUID): The experiment of the new commit.
+            plan (IncrementalPlan): How the samples of the old commit map to the new one.
+            batch_size (int | None): Largest number of results read or written per
+                request. Defaults to `settings.SPOOL_BATCH_SIZE`.
+            explanations (bool): Also copy the sample explanations.
+            max_workers (int | None): Number of concurrent explanation copies.
+
+        Returns:
+            IndexRanges: The sample indices of the new commit to evaluate.
+        """
+        from atria_hub.config import settings
+        from atria_hub.index_ranges import IndexRanges
+
+        batch_size = batch_size or settings.SPOOL_BATCH_SIZE
+        completed = self.sample_evaluations.completed_indices(
+            previous_experiment_id, refresh=True
+        )
+        in_place = previous_experiment_id == experiment_id
+        moves, missing, kept = [], [], []
+        for run in plan.carried:
+            if in_place and run.old_start == run.new_start:
+                kept.extend(
+                    index
+                    for index in range(run.new_start, run.new_start + run.length)
+                    if index in completed
+                )
+                continue
+            for old_index, new_index in run.pairs():
+                if old_index in completed:
+                    moves.append((old_index, new_index))
+                else:
+                    missing.append(new_index)
+
+        def read_batches() -> Iterator[dict[int, dict]]:
+            for position in range(0, len(moves), batch_size):
+                batch = dict(moves[position : position + batch_size])
+                records = self.sample_evaluations.read(
+                    previous_experiment_id, list(batch)
+                )
+                yield {
+                    batch[record["sample_index"]]: record["data"]
+                    for record in map(_as_dict, records)
+                }
+
+        # moving results within one experiment must not overwrite unread ones
+        batches = list(read_batches()) if in_place else read_batches()
+        for data_per_sample_index in batches:
+            self.sample_evaluations.write(experiment_id, data_per_sample_index)
+        if in_place:
+            # only unmoved and rewritten results are valid for the new commit
+            self.sample_evaluations._set_completed(
+                experiment_id,
+                IndexRanges.from_indices(
+                    [*kept, *(new_index for _, new_index in moves)]
+                ),
+            )
+        if explanations and moves:
+            self._copy_explanations(
+                previous_experiment_id,
+                experiment_id,
+                moves,
+                batch_size=batch_size,
+                max_workers=max_workers,
+            )
+
+        logger.info(
+            f"Carried {len(moves)} of {plan.num_samples} samples forward from "
+            f"{plan.old_commit_id[:7]} to {plan.new_commit_id[:7]}"
+        )
+        recompute = IndexRanges(plan.recompute.ranges())
+        recompute.update(missing)
+        return recompute
+
+    def _copy_explanations(
+        self,
+        previous_experiment_id: UUID,
+        experiment_id: UUID,
+        moves: list[tuple[int, int]],
+        batch_size: int,
+        max_workers: int | None = None,
+    ) -> None:
+        """
+        Copy the explanations of samples between experiments, batch by batch.
+
+        The explanation endpoints take one sample per request, so each batch of
+        samples is read concurrently first, without payloads, and then every
+        payload is fetched and written concurrently. Identical configs share one
+        `ConfigBase`, so each is interned once. The writes discard the cached
+        payloads of the destination samples, which an in-place copy replaces.
+        """
+        configs = {}
+
+        def config_of(record: dict) -> ConfigBase:
+            key = json.dumps(record["config"], sort_keys=True, default=str)
+            if key not in configs:
+                configs[key] = ConfigBase.from_dict(record["config"])
+            return configs[key]
+
+        def copy(item: tuple[int, dict]) -> None:
+            new_index, record = item
+            self.sample_explanations.write(
+                experiment_id,
+                name=record["name"],
+                config=config_of(record),
+                sample_index=new_index,
+                explanation_metadata=record["explanation_metadata"],
+                explanation_payload=self.sample_explanations._fetch_payload(
+                    record["explanation_file_url"]
+                ),
+            )
+
+        for position in range(0, len(moves), batch_size):
+            batch = moves[position : position + batch_size]
+            records = self._map_concurrently(
+                lambda move: [
+                    (move[1], record)
+                    for record in map(
+                        _as_dict,
+                        self.sample_explanations.read(
+                            previous_experiment_id, move[0], include_payload=False
+                        ),
+                    )
+                ],
+                batch,
+                max_workers=max_workers,
+            )
+            self._map_concurrently(
+                copy,
+                [item for items in records for item in items],
+                max_workers=max_workers,
+                desc="Copying explanations",
+            )
+
     @api_error_handler
     def delete(self, id: uuid.UUID) -> None:
-        from atriax_client.api.dataset import dataset_delete
+        """Delete an evaluation experiment from the hub."""
+
+        from atriax_client.api.evaluation_experiments import (
+            evaluation_experiments_delete,
+        )
 
         with self._client.protected_api_client as client:
-            return dataset_delete.sync_detailed(client=client, id=id)
+            response = evaluation_experiments_delete.sync_detailed(id=id, client=client)
+            if response.status_code != 204:
+                raise RuntimeError(
+                    f"Failed to delete evaluation experiment: {response.status_code} - {response.content.decode('utf-8')}"
+                )
+        self._client.experiment_cache.discard(self._client.base_url, id)
@@ -3,14 +3,27 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from atria_hub.api.base import BaseApi
+from atria_hub.governor import Priority
+from atria_hub.utilities import get_logger
 
 if TYPE_CHECKING:
     import uuid
+    from collections.abc import Iterable, Mapping
+    from typing import Any
 
+    import lakefs
+    import numpy as np
     from atriax_client.models.body_model_create import BodyModelCreate
     from atriax_client.models.model import Model
     from atriax_client.models.task_type import TaskType
 
+    from atria_hub.bundle import ModelBundle
+    from atria_hub.checkpoint import CheckpointIndex
+    from atria_hub.chunking import ChunkManifest, ChunkUploadSummary
+    from atria_hub.shared_checkpoint import SharedCheckpoint
+
+logger = get_logger(__name__)
+
 
 class ModelNotFoundError(Exception):
     """Custom exception for model not found errors."""
@@ -30,6 +43,27 @@ class InvalidModelConfigError(Exception):
     pass
 
 
+def _parse_config(data: bytes) -> dict:
+    import yaml
+
+    from atria_hub.parsed_config import yaml_loads
+
+    try:
+        config = yaml_loads(data, unsafe=True)  # unsafe load!!
+    except yaml.YAMLError:
+        raise InvalidModelConfigError("Failed to parse model configuration.")
+    return _check_config(config)
+
+
+def _check_config(config) -> dict:
+    if not isinstance(config, dict):
+        raise InvalidModelConfigError(
+            "The model configuration is not a valid dictionary. "
+            "Please ensure the model was saved with the configuration."
+        )
+    return config
+
+
 class ModelsApi(BaseApi):
     def get(self, id: uuid.UUID) -> Model:
         """Retrieve a model from the hub by its name."""
@@ -104,19 +138,49 @@ class ModelsApi(BaseApi):
         branch: str,
         config_name: str,
         configs_base_path: str,
-        model_checkpoint: bytes,
+        model_checkpoint: bytes | Mapping[str, Any],
         model_config: dict,
         dataset_metadata: dict,
         overwrite_existing: bool = False,
-    ) -> Model:
+        max_shard_bytes: int | None = None,
+        chunked: bool = False,
+    ) -> ChunkUploadSummary | None:
+        """
+        Upload a model checkpoint together with its config and dataset metadata.
+
+        A checkpoint given as bytes is stored as a single `model.bin`, or with
+        `chunked=True` as content-defined chunks shared by all versions in the
+        repository plus a `model.manifest.json` listing them. A checkpoint given as
+        a mapping of tensor names to arrays is stored in the sharded layout
+        instead, which `load_tensors` can read partially. A `bundle.json` listing
+        the checkpoint, config and dataset metadata objects with their sizes and
+        checksums is written last, for `load_bundle`.
+
+        Args:
+            model (Model): The model to upload to.
+            branch (str): The branch to upload to, created from the default branch if needed.
+            config_name (str): Name of the model configuration.
+            configs_base_path (str): Directory of the model configuration files.
+            model_checkpoint (bytes | Mapping[str, Any]): The serialized checkpoint,
+                or its tensors by name.
+            model_config (dict): The model configuration.
+            dataset_metadata (dict): Metadata of the dataset the model was trained on.
+            overwrite_existing (bool): Overwrite an existing model configuration.
+            max_shard_bytes (int | None): Target shard size of a sharded checkpoint.
+                Defaults to `settings.CHECKPOINT_MAX_SHARD_BYTES`.
+            chunked (bool): Store a serialized checkpoint as deduplicated chunks, so
+                that only the chunks changed since earlier versions are uploaded.
+
+        Returns:
+            ChunkUploadSummary | None: The chunks and bytes uploaded, for a chunked upload.
+        """
         import lakefs
         import yaml
 
-        branch: lakefs.Branch = (
-            lakefs.repository(model.repo_id, client=self._client.lakefs_client)
-            .branch(branch)
-            .create(source_reference=model.default_branch, exist_ok=True)
-        ).id
+        from atria_hub import bundle
+        from atria_hub.config import settings
+
+        branch = self._ensure_branch(model.repo_id, branch, model.default_branch)
 
         # get target repository path
         self._client.fs.source_branch = branch
@@ -133,18 +197,183 @@ class ModelsApi(BaseApi):
         branch: lakefs.Branch = lakefs.repository(
             model.repo_id, client=self._client.lakefs_client
         ).branch(branch)
-        branch.create(model.default_branch, exist_ok=True)
-        branch.object(f"{config_name}/model.bin").upload(
-            model_checkpoint, content_type="application/octet-stream"
+        summary = None
+        parts = {}
+        if not isinstance(model_checkpoint, bytes | bytearray | memoryview):
+            from atria_hub.checkpoint import CHECKPOINT_INDEX_FILE
+
+            checkpoint_format = bundle.CHECKPOINT_SHARDED
+            index = self._upload_sharded_checkpoint(
+                branch, config_name, model_checkpoint, max_shard_bytes
+            )
+            parts[bundle.CHECKPOINT] = bundle.BundlePart.from_bytes(
+                f"{config_name}/checkpoint/{CHECKPOINT_INDEX_FILE}", index.to_json()
+            )
+        elif chunked:
+            checkpoint_format = bundle.CHECKPOINT_CHUNKED
+            summary, manifest = self._upload_chunked_checkpoint(
+                branch, config_name, model_checkpoint
+            )
+            parts[bundle.CHECKPOINT] = bundle.BundlePart.from_bytes(
+                f"{config_name}/model.manifest.json", manifest.to_json()
+            )
+        else:
+            checkpoint_format = bundle.CHECKPOINT_BIN
+            parts[bundle.CHECKPOINT] = bundle.BundlePart.from_bytes(
+                f"{config_name}/model.bin", model_checkpoint
+            )
+            self._upload_object(
+                branch,
+                parts[bundle.CHECKPOINT].path,
+                model_checkpoint,
+                content_type="application/octet-stream",
+                digest=parts[bundle.CHECKPOINT].sha256,
+            )
+        for name, path, value in (
+            (
+                bundle.DATASET_METADATA,
+                f"{config_name}/dataset_metadata.yaml",
+                dataset_metadata,
+            ),
+            (bundle.CONFIG, f"{configs_base_path}/{config_name}.yaml", model_config),
+        ):
+            data = yaml.dump(value, sort_keys=False).encode("utf-8")
+            parts[name] = bundle.BundlePart.from_bytes(path, data)
+            self._upload_object(
+                branch,
+                path,
+                data,
+                content_type="application/x-yaml",
+                digest=parts[name].sha256,
+            )
+            if len(data) >= settings.PARSED_SIDECAR_MIN_BYTES:
+                self._write_parsed_sidecar(
+                    branch.repo_id, branch.id, parts[name].sha256, value
+                )
+        # the bundle goes last, so that a readable bundle implies complete parts
+        self._upload_object(
+            branch,
+            f"{config_name}/{bundle.BUNDLE_FILE}",
+            bundle.BundleManifest(checkpoint_format, parts).to_json(),
+            content_type="application/json",
+        )
+        return summary
+
+    def _upload_object(
+        self,
+        branch: lakefs.Branch,
+        path: str,
+        data: bytes,
+        content_type: str,
+        digest: str | None = None,
+    ) -> bool:
+        """Upload an object, or link it if identical content is stored already, and return whether it was linked."""
+        import hashlib
+
+        digest = digest or hashlib.sha256(data).hexdigest()
+        if self._link_duplicate(branch.repo_id, branch.id, path, digest, len(data)):
+            return True
+        stats = self._write_object(
+            branch.repo_id, branch.id, path, data, content_type=content_type
         )
-        branch.object(f"{config_name}/dataset_metadata.yaml").upload(
-            yaml.dump(dataset_metadata, sort_keys=False).encode("utf-8"),
-            content_type="application/x-yaml",
+        self._record_content(branch.repo_id, branch.id, path, digest, stats=stats)
+        return False
+
+    def _upload_chunked_checkpoint(
+        self, branch: lakefs.Branch, config_name: str, checkpoint: bytes
+    ) -> tuple[ChunkUploadSummary, ChunkManifest]:
+        from atria_hub.chunking import (
+            CHUNKS_DIR,
+            ChunkManifest,
+            ChunkUploadSummary,
+            chunk_path,
+        )
+
+        manifest, chunks = ChunkManifest.from_bytes(checkpoint)
+        stored = {
+            obj.path.rsplit("/", 1)[-1]
+            for obj in branch.objects(prefix=f"{CHUNKS_DIR}/")
+        }
+        new_chunks: dict[str, memoryview] = {}
+        for ref, chunk in zip(manifest.chunks, chunks, strict=True):
+            if ref.digest not in stored:
+                new_chunks.setdefault(ref.digest, chunk)
+
+        # chunks stored on other branches are linked rather than uploaded again
+        linked = self._map_concurrently(
+            lambda item: self._upload_object(
+                branch,
+                chunk_path(item[0]),
+                bytes(item[1]),
+                content_type="application/octet-stream",
+            ),
+            new_chunks.items(),
+            desc="Uploading checkpoint chunks",
+        )
+        model_bin = branch.object(f"{config_name}/model.bin")
+        if model_bin.exists():
+            # load_checkpoint prefers model.bin, so drop the previous version
+            model_bin.delete()
+        self._upload_object(
+            branch,
+            f"{config_name}/model.manifest.json",
+            manifest.to_json(),
+            content_type="application/json",
+        )
+
+        summary = ChunkUploadSummary(
+            chunks=len(manifest.chunks),
+            new_chunks=linked.count(False),
+            bytes=manifest.size,
+            uploaded_bytes=sum(
+                len(chunk)
+                for chunk, was_linked in zip(new_chunks.values(), linked, strict=True)
+                if not was_linked
+            ),
         )
-        branch.object(f"{configs_base_path}/{config_name}.yaml").upload(
-            yaml.dump(model_config, sort_keys=False).encode("utf-8"),
-            content_type="application/x-yaml",
+        logger.info(
+            f"Uploaded {summary.new_chunks}/{summary.chunks} chunks "
+            f"({summary.uploaded_bytes}/{summary.bytes} bytes) of {config_name}, "
+            f"dedupe ratio {summary.dedupe_ratio:.1%}."
         )
+        return summary, manifest
+
+    def _upload_sharded_checkpoint(
+        self,
+        branch: lakefs.Branch,
+        config_name: str,
+        tensors: Mapping[str, Any],
+        max_shard_bytes: int | None = None,
+    ) -> CheckpointIndex:
+        from atria_hub.checkpoint import CHECKPOINT_INDEX_FILE, build_sharded_checkpoint
+        from atria_hub.config import settings
+
+        index, shards = build_sharded_checkpoint(
+            tensors, max_shard_bytes or settings.CHECKPOINT_MAX_SHARD_BYTES
+        )
+        for name in ("model.bin", "model.manifest.json"):
+            previous = branch.object(f"{config_name}/{name}")
+            if previous.exists():
+                # load_checkpoint prefers these, so drop the previous version
+                previous.delete()
+        self._map_concurrently(
+            lambda item: self._upload_object(
+                branch,
+                f"{config_name}/checkpoint/{item[0]}",
+                item[1],
+                content_type="application/octet-stream",
+            ),
+            zip(index.shards, shards, strict=True),
+            desc="Uploading checkpoint shards",
+        )
+        # the index goes last, so that a readable index implies complete shards
+        self._upload_object(
+            branch,
+            f"{config_name}/checkpoint/{CHECKPOINT_INDEX_FILE}",
+            index.to_json(),
+            content_type="application/json",
+        )
+        return index
 
     def get_available_configs(
         self, dataset_repo_id: str, branch: str, configs_base_path: str
@@ -158,82 +387,406 @@ class ModelsApi(BaseApi):
     def load_checkpoint(
         self, model_repo_id: str, branch: str, config_name: str
     ) -> bytes:
+        from lakefs.exceptions import ObjectNotFoundException
+
+        try:
+            return self._read_object(
+                model_repo_id,
+                branch,
+                f"{config_name}/model.bin",
+                priority=Priority.BULK,
+            )
+        except ObjectNotFoundException:
+            pass
+
+        # pin the reads to a commit, so that the manifest and the chunks match
+        return self._load_chunked_checkpoint(
+            model_repo_id,
+            self._read_ref(model_repo_id, branch, f"{config_name}/"),
+            config_name,
+        )
+
+    def _load_checkpoint_at(
+        self, model_repo_id: str, ref: str, config_name: str
+    ) -> bytes:
+        from lakefs.exceptions import ObjectNotFoundException
+
+        try:
+            return self._read_object(
+                model_repo_id, ref, f"{config_name}/model.bin", priority=Priority.BULK
+            )
+        except ObjectNotFoundException:
+            return self._load_chunked_checkpoint(model_repo_id, ref, config_name)
+
+    def _staged_checkpoint_version(
+        self, model_repo_id: str, branch: str, config_name: str
+    ) -> str:
+        """Return the checksum identifying an uncommitted checkpoint of a branch."""
         import lakefs
+        from lakefs.exceptions import NotFoundException
+
+        staged = lakefs.repository(
+            model_repo_id, client=self._client.lakefs_client
+        ).branch(branch)
+        for name in ("model.bin", "model.manifest.json"):
+            try:
+                return staged.object(f"{config_name}/{name}").stat().checksum
+            except NotFoundException:
+                continue
+        raise ModelNotFoundError("Model checkpoint not found.")
+
+    def _load_chunked_checkpoint(
+        self, model_repo_id: str, ref: str, config_name: str
+    ) -> bytes:
         from lakefs.exceptions import ObjectNotFoundException
 
+        from atria_hub.chunking import ChunkManifest
+
         try:
-            branch: lakefs.Branch = lakefs.repository(
-                model_repo_id, client=self._client.lakefs_client
-            ).branch(branch)
-            with branch.object(f"{config_name}/model.bin").reader(pre_sign=True) as f:
-                return f.read()
+            manifest = ChunkManifest.from_json(
+                self._read_object(
+                    model_repo_id, ref, f"{config_name}/model.manifest.json"
+                )
+            )
         except ObjectNotFoundException:
             raise ModelNotFoundError("Model checkpoint not found.")
+        return self._assemble_chunks(model_repo_id, ref, manifest)
 
-    def load_config(
-        self, model_repo_id: str, branch: str, config_name: str, configs_base_path: str
+    def load_checkpoint_shared(
+        self, model_repo_id: str, branch: str, config_name: str
+    ) -> SharedCheckpoint:
+        """
+        Load a checkpoint into host-wide shared memory and map it read-only.
+
+        The branch is resolved to its head commit, or to the checksum of the
+        checkpoint if it was uploaded but not committed yet, and the first
+        process on the host that asks for that version downloads it into a
+        shared file, on tmpfs when available. Every other process maps the same file without
+        copying, so N workers hold one copy of the checkpoint. The file is
+        removed when the last process using it closes it or exits.
+
+        Args:
+            model_repo_id (str): The repository of the model.
+            branch (str): The model branch.
+            config_name (str): The model configuration.
+
+        Returns:
+            SharedCheckpoint: The checkpoint, whose `buffer` is a read-only
+                memoryview. Close it, or use it as a context manager, when done.
+        """
+        ref = self._read_ref(model_repo_id, branch, f"{config_name}/")
+        version = ref
+        if ref == branch:
+            # staged objects have no commit, identify them by their content
+            version = self._staged_checkpoint_version(
+                model_repo_id, branch, config_name
+            )
+        return self._client.shared_checkpoints.open(
+            f"{model_repo_id}/{version}/{config_name}",
+            lambda: self._load_checkpoint_at(model_repo_id, ref, config_name),
+        )
+
+    def _assemble_chunks(
+        self, model_repo_id: str, ref: str, manifest: ChunkManifest
     ) -> bytes:
-        import lakefs
-        import yaml
+        """Assemble a chunked checkpoint, fetching only the chunks missing from the local cache."""
+        import hashlib
+
+        from atria_hub.chunking import chunk_path
+
+        offsets: dict[str, list[int]] = {}
+        position = 0
+        for chunk in manifest.chunks:
+            offsets.setdefault(chunk.digest, []).append(position)
+            position += chunk.size
+
+        cache = self._client.chunk_cache
+        checkpoint = bytearray(manifest.size)
+
+        def fill(digest: str) -> bool:
+            data = cache.get(digest)
+            fetched = data is None
+            if fetched:
+                data = self._read_object(
+                    model_repo_id, ref, chunk_path(digest), priority=Priority.BULK
+                )
+                if hashlib.sha256(data).hexdigest() != digest:
+                    raise RuntimeError(f"Checkpoint chunk {digest} is corrupt.")
+                cache.put(digest, data)
+            for offset in offsets[digest]:
+                checkpoint[offset : offset + len(data)] = data
+            return fetched
+
+        fetched = self._map_concurrently(
+            fill, offsets, desc="Loading checkpoint chunks"
+        )
+        logger.info(
+            f"Loaded checkpoint from {len(offsets)} chunks, "
+            f"{len(offsets) - sum(fetched)} of them from the local cache."
+        )
+        return bytes(checkpoint)
+
+    def load_checkpoint_index(
+        self, model_repo_id: str, branch: str, config_name: str
+    ) -> CheckpointIndex:
+        """Load the tensor index of a sharded checkpoint."""
         from lakefs.exceptions import ObjectNotFoundException
 
+        from atria_hub.checkpoint import CHECKPOINT_INDEX_FILE, CheckpointIndex
+
         try:
-            branch: lakefs.Branch = lakefs.repository(
-                model_repo_id, client=self._client.lakefs_client
-            ).branch(branch)
-            with branch.object(f"{configs_base_path}/{config_name}.yaml").reader(
-                pre_sign=True
-            ) as f:
-                config = f.read().decode("utf-8")
-                config = yaml.load(config, Loader=yaml.Loader)  # unsafe load!!
-                if not isinstance(config, dict):
-                    raise InvalidModelConfigError(
-                        "The model configuration is not a valid dictionary. "
-                        "Please ensure the model was saved with the configuration."
-                    )
-                return config
+            return CheckpointIndex.from_json(
+                self._read_object(
+                    model_repo_id,
+                    branch,
+                    f"{config_name}/checkpoint/{CHECKPOINT_INDEX_FILE}",
+                )
+            )
         except ObjectNotFoundException:
-            raise ModelConfigNotFoundError("Model configuration not found.")
-        except yaml.YAMLError:
-            raise InvalidModelConfigError("Failed to parse model configuration.")
+            raise ModelNotFoundError("Sharded model checkpoint not found.")
+
+    def load_tensors(
+        self,
+        model_repo_id: str,
+        branch: str,
+        config_name: str,
+        names: Iterable[str] | None = None,
+        prefix: str | None = None,
+        max_workers: int | None = None,
+    ) -> dict[str, np.ndarray]:
+        """
+        Load some or all tensors of a sharded checkpoint.
+
+        Only the byte ranges of the requested tensors are fetched. Neighbouring
+        tensors of a shard are merged into a single ranged read, and the reads run
+        in parallel, each filling a preallocated buffer that the returned arrays
+        are views of.
+
+        Args:
+            model_repo_id (str): The model repository.
+            branch (str): The branch to read from.
+            config_name (str): Name of the model configuration.
+            names (Iterable[str] | None): Names of the tensors to load.
+            prefix (str | None): Load every tensor whose name starts with this prefix,
+                e.g. `encoder.`.
+            max_workers (int | None): Number of parallel reads.
+
+        Returns:
+            dict[str, np.ndarray]: The tensors by name. All tensors are loaded if
+                neither `names` nor `prefix` is given.
+        """
+        import numpy as np
+
+        from atria_hub.checkpoint import coalesce_reads
+        from atria_hub.config import settings
+
+        # pin the reads to a commit, so that the index and the shards match
+        ref = self._read_ref(model_repo_id, branch, f"{config_name}/")
+        index = self.load_checkpoint_index(model_repo_id, ref, config_name)
+        entries = index.select(names=names, prefix=prefix)
+        reads = coalesce_reads(entries, max_gap=settings.CHECKPOINT_READ_MAX_GAP)
+
+        def read(item: tuple[str, int, int, list[str]]) -> dict[str, np.ndarray]:
+            shard, offset, length, tensor_names = item
+            buffer = bytearray(length)
+            self._read_object_range(
+                model_repo_id,
+                ref,
+                f"{config_name}/checkpoint/{shard}",
+                offset,
+                memoryview(buffer),
+                priority=Priority.BULK,
+            )
+            tensors = {}
+            for name in tensor_names:
+                entry = entries[name]
+                dtype = np.dtype(entry.dtype)
+                tensors[name] = np.frombuffer(
+                    buffer,
+                    dtype=dtype,
+                    count=entry.length // dtype.itemsize,
+                    offset=entry.offset - offset,
+                ).reshape(entry.shape)
+            return tensors
+
+        tensors = {}
+        for result in self._map_concurrently(
+            read, reads, max_workers=max_workers, desc="Loading tensors"
+        ):
+            tensors.update(result)
+        return {name: tensors[name] for name in entries}
+
+    def load_config(
+        self, model_repo_id: str, branch: str, config_name: str, configs_base_path: str
+    ) -> bytes:
+        return self._read_config(
+            model_repo_id, branch, f"{configs_base_path}/{config_name}.yaml"
+        )
 
     def load_dataset_metadata(
         self, model_repo_id: str, branch: str, config_name: str
     ) -> bytes:
-        import lakefs
+        return self._read_config(
+            model_repo_id, branch, f"{config_name}/dataset_metadata.yaml"
+        )
+
+    def _read_config(self, model_repo_id: str, ref: str, path: str) -> dict:
         import yaml
         from lakefs.exceptions import ObjectNotFoundException
 
         try:
-            branch: lakefs.Branch = lakefs.repository(
-                model_repo_id, client=self._client.lakefs_client
-            ).branch(branch)
-            with branch.object(f"{config_name}/dataset_metadata.yaml").reader(
-                pre_sign=True
-            ) as f:
-                config = f.read().decode("utf-8")
-                config = yaml.load(config, Loader=yaml.Loader)  # unsafe load!!
-                if not isinstance(config, dict):
-                    raise InvalidModelConfigError(
-                        "The model configuration is not a valid dictionary. "
-                        "Please ensure the model was saved with the configuration."
-                    )
-                return config
+            config = self._read_yaml(model_repo_id, ref, path, unsafe=True)
         except ObjectNotFoundException:
             raise ModelConfigNotFoundError("Model configuration not found.")
         except yaml.YAMLError:
             raise InvalidModelConfigError("Failed to parse model configuration.")
+        return _check_config(config)
 
     def load_checkpoint_and_config(
         self, model_repo_id: str, branch: str, config_name: str, configs_base_path: str
     ) -> tuple[bytes, dict]:
-        checkpoint = self.load_checkpoint(
-            model_repo_id=model_repo_id, branch=branch, config_name=config_name
+        """
+        Load the checkpoint and config of a model configuration concurrently.
+
+        Both are read from the same ref: the head commit of the branch, or the
+        branch itself if the configuration was uploaded but not committed yet.
+        """
+        ref = self._read_ref(
+            model_repo_id, branch, f"{config_name}/", f"{configs_base_path}/"
         )
-        config = self.load_config(
-            model_repo_id=model_repo_id,
-            branch=branch,
-            config_name=config_name,
-            configs_base_path=configs_base_path,
+        checkpoint, config = self._map_concurrently(
+            lambda load: load(),
+            [
+                lambda: self._load_checkpoint_at(model_repo_id, ref, config_name),
+                lambda: self._read_config(
+                    model_repo_id, ref, f"{configs_base_path}/{config_name}.yaml"
+                ),
+            ],
         )
         return checkpoint, config
+
+    def load_bundle(
+        self,
+        model_repo_id: str,
+        branch: str,
+        config_name: str,
+        configs_base_path: str | None = None,
+        verify: bool = False,
+        max_workers: int | None = None,
+    ) -> ModelBundle:
+        """
+        Load the checkpoint, config and dataset metadata of a model configuration at once.
+
+        The branch is resolved to a single commit, or kept as is if the
+        configuration was uploaded but not committed yet, and its `bundle.json`
+        is read once, then all parts are fetched concurrently from that ref, so
+        the parts always belong together and the bundle loads in about the time
+        of its largest part. Models uploaded before bundles existed are loaded from
+        their well-known paths when `configs_base_path` is given.
+
+        Args:
+            model_repo_id (str): The repository of the model.
+            branch (str): The model branch.
+            config_name (str): The model configuration.
+            configs_base_path (str | None): Directory of the model configuration
+                files, only needed for models without a bundle.
+            verify (bool): Check the parts against the sizes and checksums of the
+                bundle.
+            max_workers (int | None): Number of concurrent reads.
+
+        Returns:
+            ModelBundle: The loaded parts and the ref they were read from.
+        """
+        from lakefs.exceptions import ObjectNotFoundException
+
+        from atria_hub import bundle
+        from atria_hub.checkpoint import CheckpointIndex
+
+        prefixes = [f"{config_name}/"]
+        if configs_base_path is not None:
+            prefixes.append(f"{configs_base_path}/")
+        ref = self._read_ref(model_repo_id, branch, *prefixes)
+        try:
+            manifest = bundle.BundleManifest.from_json(
+                self._read_object(
+                    model_repo_id, ref, f"{config_name}/{bundle.BUNDLE_FILE}"
+                )
+            )
+        except ObjectNotFoundException:
+            if configs_base_path is None:
+                raise ModelNotFoundError(
+                    f"Model {config_name} has no bundle, pass configs_base_path to load it."
+                )
+            manifest = None
+
+        if manifest is None:
+            # no sizes or checksums, read the parts from their usual paths
+            checkpoint_format = bundle.CHECKPOINT_BIN
+            paths = {
+                bundle.CHECKPOINT: f"{config_name}/model.bin",
+                bundle.CONFIG: f"{configs_base_path}/{config_name}.yaml",
+                bundle.DATASET_METADATA: f"{config_name}/dataset_metadata.yaml",
+            }
+        else:
+            checkpoint_format = manifest.checkpoint_format
+            paths = {name: part.path for name, part in manifest.parts.items()}
+
+        def read(name: str) -> bytes | dict | None:
+            if name != bundle.CHECKPOINT and not (verify and manifest is not None):
+                # parsed configs are memoized, verified ones are read as bytes
+                try:
+                    return self._read_config(model_repo_id, ref, paths[name])
+                except ModelConfigNotFoundError:
+                    if manifest is None and name == bundle.DATASET_METADATA:
+                        # older models were uploaded without dataset metadata
+                        return None
+                    raise
+            try:
+                data = self._read_object(
+                    model_repo_id, ref, paths[name], priority=Priority.BULK
+                )
+            except ObjectNotFoundException:
+                if manifest is None:
+                    return self._load_chunked_checkpoint(
+                        model_repo_id, ref, config_name
+                    )
+                if name == bundle.CHECKPOINT:
+                    raise ModelNotFoundError("Model checkpoint not found.")
+                raise ModelConfigNotFoundError("Model configuration not found.")
+            if verify and manifest is not None:
+                expected = manifest.parts[name]
+                if bundle.BundlePart.from_bytes(expected.path, data) != expected:
+                    raise RuntimeError(
+                        f"{expected.path} does not match the bundle of {config_name}."
+                    )
+            if (
+                name == bundle.CHECKPOINT
+                and checkpoint_format == bundle.CHECKPOINT_CHUNKED
+            ):
+                from atria_hub.chunking import ChunkManifest
+
+                return self._assemble_chunks(
+                    model_repo_id, ref, ChunkManifest.from_json(data)
+                )
+            if name != bundle.CHECKPOINT:
+                return _parse_config(data)
+            return data
+
+        names = list(paths)
+        parts = dict(
+            zip(
+                names,
+                self._map_concurrently(read, names, max_workers=max_workers),
+                strict=True,
+            )
+        )
+        sharded = checkpoint_format == bundle.CHECKPOINT_SHARDED
+        return bundle.ModelBundle(
+            commit_id=ref,
+            config=parts[bundle.CONFIG],
+            dataset_metadata=parts[bundle.DATASET_METADATA],
+            checkpoint=None if sharded else parts[bundle.CHECKPOINT],
+            checkpoint_index=CheckpointIndex.from_json(parts[bundle.CHECKPOINT])
+            if sharded
+            else None,
+        )
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from atria_hub.checkpoint import CheckpointIndex
+
+BUNDLE_FILE = "bundle.json"
+
+# parts of a model bundle
+CHECKPOINT = "checkpoint"
+CONFIG = "config"
+DATASET_METADATA = "dataset_metadata"
+
+# layouts of the checkpoint part
+CHECKPOINT_BIN = "bin"
+CHECKPOINT_CHUNKED = "chunked"
+CHECKPOINT_SHARDED = "sharded"
+
+
+@dataclass(frozen=True)
+class BundlePart:
+    """
+    An object of a model bundle.
+
+    Attributes:
+        path (str): Path of the object in the model repository.
+        size (int): Size of the object in bytes.
+        sha256 (str): Sha256 of the object.
+    """
+
+    path: str
+    size: int
+    sha256: str
+
+    @classmethod
+    def from_bytes(
+        cls, path: str, data: bytes | memoryview, sha256: str | None = None
+    ) -> BundlePart:
+        return cls(
+            path=path, size=len(data), sha256=sha256 or hashlib.sha256(data).hexdigest()
+        )
+
+
+@dataclass
+class BundleManifest:
+    """
+    The objects a model configuration is made of, written when it is uploaded.
+
+    Attributes:
+        checkpoint_format (str): Layout of the checkpoint: a single `model.bin`,
+            a chunk manifest or a sharded checkpoint index, in which case the
+            checkpoint part is the manifest or index.
+        parts (dict[str, BundlePart]): The parts of the bundle by name.
+    """
+
+    checkpoint_format: str
+    parts: dict[str, BundlePart]
+
+    def to_json(self) -> bytes:
+        return json.dumps(
+            {
+                "version": 1,
+                "checkpoint_format": self.checkpoint_format,
+                "parts": {name: asdict(part) for name, part in self.parts.items()},
+            }
+        ).encode("utf-8")
+
+    @classmethod
+    def from_json(cls, data: bytes) -> BundleManifest:
+        raw = json.loads(data)
+        return cls(
+            checkpoint_format=raw["checkpoint_format"],
+            parts={name: BundlePart(**part) for name, part in raw["parts"].items()},
+        )
+
+
+@dataclass
+class ModelBundle:
+    """
+    A model configuration loaded from a single commit.
+
+    Attributes:
+        commit_id (str): The commit all parts were read from, or the branch if
+            the configuration was uploaded but not committed yet.
+        config (dict): The model configuration.
+        dataset_metadata (dict | None): Metadata of the dataset the model was
+            trained on, None for older models uploaded without it.
+        checkpoint (bytes | None): The serialized checkpoint, unless it is sharded.
+        checkpoint_index (CheckpointIndex | None): The index of a sharded
+            checkpoint, whose tensors are read with `ModelsApi.load_tensors`.
+    """
+
+    commit_id: str
+    config: dict
+    dataset_metadata: dict | None
+    checkpoint: bytes | None = None
+    checkpoint_index: CheckpointIndex | None = field(default=None, repr=False)
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+CHECKPOINT_INDEX_FILE = "index.json"
+
+# tensors are aligned inside a shard so that they can be viewed without copying
+_ALIGNMENT = 64
+
+
+def shard_file_name(shard: int, num_shards: int) -> str:
+    """Return the object name of a checkpoint shard."""
+    return f"shard-{shard:05d}-of-{num_shards:05d}.bin"
+
+
+@dataclass(frozen=True)
+class TensorEntry:
+    """
+    The location of a tensor inside a sharded checkpoint.
+
+    Attributes:
+        shard (str): Object name of the shard holding the tensor.
+        offset (int): Byte offset of the tensor inside the shard.
+        length (int): Size of the tensor in bytes.
+        dtype (str): Numpy dtype string of the tensor, e.g. `<f4`.
+        shape (tuple[int, ...]): Shape of the tensor.
+    """
+
+    shard: str
+    offset: int
+    length: int
+    dtype: str
+    shape: tuple[int, ...]
+
+
+@dataclass
+class CheckpointIndex:
+    """
+    The index of a sharded checkpoint, mapping tensor names to their location.
+
+    Attributes:
+        shards (list[str]): Object names of the shards, relative to the checkpoint directory.
+        tensors (dict[str, TensorEntry]): Location of every tensor.
+        metadata (dict[str, str]): Free-form metadata stored with the checkpoint.
+    """
+
+    shards: list[str]
+    tensors: dict[str, TensorEntry]
+    metadata: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(entry.length for entry in self.tensors.values())
+
+    def select(
+        self, names: Iterable[str] | None = None, prefix: str | None = None
+    ) -> dict[str, TensorEntry]:
+        """
+        Return the entries of the requested tensors.
+
+        Args:
+            names (Iterable[str] | None): Exact tensor names to select.
+            prefix (str | None): Select every tensor whose name starts with this prefix,
+                e.g. `encoder.`.
+
+        Returns:
+            dict[str, TensorEntry]: The selected entries, all of them if neither
+                `names` nor `prefix` is given.
+
+        Raises:
+            KeyError: If one of `names` is not in the checkpoint.
+        """
+        if names is None and prefix is None:
+            return dict(self.tensors)
+        selected = {}
+        for name in names or ():
+            if name not in self.tensors:
+                raise KeyError(f"Tensor {name} is not in the checkpoint.")
+            selected[name] = self.tensors[name]
+        if prefix is not None:
+            selected.update(
+                (name, entry)
+                for name, entry in self.tensors.items()
+                if name.startswith(prefix)
+            )
+        return selected
+
+    def to_json(self) -> bytes:
+        return json.dumps(
+            {
+                "shards": self.shards,
+                "tensors": {
+                    name: asdict(entry) for name, entry in self.tensors.items()
+                },
+                "metadata": self.metadata,
+            }
+        ).encode("utf-8")
+
+    @classmethod
+    def from_json(cls, data: bytes) -> CheckpointIndex:
+        raw = json.loads(data)
+        return cls(
+            shards=raw["shards"],
+            tensors={
+                name: TensorEntry(**{**entry, "shape": tuple(entry["shape"])})
+                for name, entry in raw["tensors"].items()
+            },
+            metadata=raw.get("metadata", {}),
+        )
+
+
+def build_sharded_checkpoint(
+    tensors: Mapping[str, Any],
+    max_shard_bytes: int,
+    metadata: dict[str, str] | None = None,
+) -> tuple[CheckpointIndex, list[bytearray]]:
+    """
+    Pack tensors into shards of at most `max_shard_bytes` and index them.
+
+    Tensors are packed in the order of `tensors`, so that tensors that are
+    usually loaded together (e.g. all of an encoder) end up contiguous and can be
+    fetched with a few large ranged reads. A tensor larger than `max_shard_bytes`
+    gets a shard of its own.
+
+    Args:
+        tensors (Mapping[str, Any]): Numpy arrays, or array-likes accepted by
+            `numpy.asarray`, by name. Torch tensors should be passed as
+            `tensor.detach().cpu().numpy()`.
+        max_shard_bytes (int): Target size of a shard.
+        metadata (dict[str, str] | None): Metadata stored in the index.
+
+    Returns:
+        tuple[CheckpointIndex, list[bytearray]]: The index and the shard contents.
+    """
+    import numpy as np
+
+    placements: list[list[tuple[str, Any, int]]] = [[]]
+    shard_sizes = [0]
+    for name, tensor in tensors.items():
+        # ascontiguousarray would turn 0-d tensors, e.g. num_batches_tracked, into 1-d
+        array = np.require(np.asarray(tensor), requirements="C")
+        offset = -(-shard_sizes[-1] // _ALIGNMENT) * _ALIGNMENT
+        if placements[-1] and offset + array.nbytes > max_shard_bytes:
+            placements.append([])
+            shard_sizes.append(0)
+            offset = 0
+        placements[-1].append((name, array, offset))
+        shard_sizes[-1] = offset + array.nbytes
+
+    shard_names = [shard_file_name(i, len(placements)) for i in range(len(placements))]
+    entries = {}
+    shards = []
+    for shard_name, placement, size in zip(
+        shard_names, placements, shard_sizes, strict=True
+    ):
+        buffer = bytearray(size)
+        for name, array, offset in placement:
+            target = np.frombuffer(
+                buffer, dtype=np.uint8, count=array.nbytes, offset=offset
+            )
+            target[:] = array.reshape(-1).view(np.uint8)
+            entries[name] = TensorEntry(
+                shard=shard_name,
+                offset=offset,
+                length=array.nbytes,
+                dtype=array.dtype.str,
+                shape=tuple(array.shape),
+            )
+        shards.append(buffer)
+    return CheckpointIndex(
+        shards=shard_names, tensors=entries, metadata=dict(metadata or {})
+    ), shards
+
+
+def coalesce_reads(
+    entries: Mapping[str, TensorEntry], max_gap: int
+) -> list[tuple[str, int, int, list[str]]]:
+    """
+    Group the tensors to load into as few ranged reads as possible.
+
+    Tensors of the same shard are merged into a single read when the gap between
+    them is at most `max_gap` bytes, since one slightly larger request is cheaper
+    than two round trips.
+
+    Args:
+        entries (Mapping[str, TensorEntry]): The tensors to load.
+        max_gap (int): Largest number of unneeded bytes read to merge two ranges.
+
+    Returns:
+        list[tuple[str, int, int, list[str]]]: (shard, offset, length, tensor names)
+            of every read.
+    """
+    by_shard: dict[str, list[tuple[str, TensorEntry]]] = {}
+    for name, entry in entries.items():
+        by_shard.setdefault(entry.shard, []).append((name, entry))
+
+    reads = []
+    for shard, shard_entries in by_shard.items():
+        shard_entries.sort(key=lambda item: item[1].offset)
+        start, end, names = None, None, []
+        for name, entry in shard_entries:
+            if start is not None and entry.offset - end <= max_gap:
+                end = max(end, entry.offset + entry.length)
+                names.append(name)
+                continue
+            if start is not None:
+                reads.append((shard, start, end - start, names))
+            start, end, names = entry.offset, entry.offset + entry.length, [name]
+        if start is not None:
+            reads.append((shard, start, end - start, names))
+    return reads
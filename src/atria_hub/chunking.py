@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from atria_hub.config import settings
+
+CHUNK_MIN_BYTES = 256 << 10
+CHUNK_AVG_BYTES = 1 << 20
+CHUNK_MAX_BYTES = 4 << 20
+
+# chunks are content addressed at the repository root, so that every branch and
+# config of a model repository shares them
+CHUNKS_DIR = "_chunks"
+
+_WINDOW = 64
+_BLOCK = 8 << 20
+
+
+def chunk_path(digest: str) -> str:
+    """Return the repository path of a chunk."""
+    return f"{CHUNKS_DIR}/{digest[:2]}/{digest}"
+
+
+@lru_cache(maxsize=1)
+def _gear_table():
+    import numpy as np
+
+    # derived from sha256 rather than a random generator, so that boundaries
+    # never change between numpy versions
+    return np.array(
+        [
+            int.from_bytes(hashlib.sha256(bytes([i])).digest()[:4], "little")
+            for i in range(256)
+        ],
+        dtype=np.uint32,
+    )
+
+
+def chunk_boundaries(
+    data: bytes | memoryview,
+    min_size: int = CHUNK_MIN_BYTES,
+    avg_size: int = CHUNK_AVG_BYTES,
+    max_size: int = CHUNK_MAX_BYTES,
+) -> list[int]:
+    """
+    Split data into content-defined chunks and return the end offset of each chunk.
+
+    A cut point is placed where a rolling hash over the last `_WINDOW` bytes has
+    its low bits unset, so boundaries depend on the local content only and an
+    edit in one place of a checkpoint moves the boundaries around it but leaves
+    the other chunks identical. The hash is computed with numpy in fixed-size
+    blocks, and chunk sizes are kept between `min_size` and `max_size`.
+
+    Args:
+        data (bytes | memoryview): The data to split.
+        min_size (int): Smallest chunk size, except for the last chunk.
+        avg_size (int): Expected chunk size.
+        max_size (int): Largest chunk size.
+
+    Returns:
+        list[int]: The exclusive end offset of every chunk, the last one being `len(data)`.
+    """
+    import numpy as np
+
+    size = len(data)
+    if size <= min_size:
+        return [size] if size else []
+
+    mask = np.uint32((1 << max(1, (avg_size - min_size).bit_length() - 1)) - 1)
+    gear = _gear_table()
+    array = np.frombuffer(data, dtype=np.uint8)
+    candidates = []
+    for start in range(0, size, _BLOCK):
+        # overlap the blocks by a window so that the hash is continuous
+        lead = min(start, _WINDOW)
+        values = gear[array[start - lead : start + _BLOCK]]
+        sums = np.cumsum(values, dtype=np.uint32)
+        hashes = sums[_WINDOW:] - sums[:-_WINDOW]
+        offset = start - lead + _WINDOW + 1
+        hits = np.flatnonzero((hashes & mask) == 0) + offset
+        candidates.extend(hits[hits > start].tolist())
+
+    boundaries = []
+    last = 0
+    for candidate in candidates:
+        while candidate - last > max_size:
+            last += max_size
+            boundaries.append(last)
+        if candidate - last >= min_size:
+            last = candidate
+            boundaries.append(last)
+    while size - last > max_size:
+        last += max_size
+        boundaries.append(last)
+    if last < size:
+        boundaries.append(size)
+    return boundaries
+
+
+@dataclass(frozen=True)
+class ChunkRef:
+    """
+    A chunk of a chunked checkpoint.
+
+    Attributes:
+        digest (str): Sha256 of the chunk, which is also its storage key.
+        size (int): Size of the chunk in bytes.
+    """
+
+    digest: str
+    size: int
+
+
+@dataclass
+class ChunkManifest:
+    """
+    The list of chunks a checkpoint version is assembled from.
+
+    Attributes:
+        size (int): Size of the assembled checkpoint in bytes.
+        digest (str): Sha256 of the assembled checkpoint.
+        chunks (list[ChunkRef]): The chunks, in order.
+    """
+
+    size: int
+    digest: str
+    chunks: list[ChunkRef]
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes | memoryview
+    ) -> tuple[ChunkManifest, list[memoryview]]:
+        """Chunk `data` and return its manifest together with the chunk contents."""
+        view = memoryview(data)
+        chunks, refs = [], []
+        start = 0
+        for end in chunk_boundaries(view):
+            chunk = view[start:end]
+            chunks.append(chunk)
+            refs.append(ChunkRef(hashlib.sha256(chunk).hexdigest(), end - start))
+            start = end
+        return cls(
+            size=len(view), digest=hashlib.sha256(view).hexdigest(), chunks=refs
+        ), chunks
+
+    def to_json(self) -> bytes:
+        return json.dumps(
+            {
+                "version": 1,
+                "size": self.size,
+                "digest": self.digest,
+                "chunks": [asdict(chunk) for chunk in self.chunks],
+            }
+        ).encode("utf-8")
+
+    @classmethod
+    def from_json(cls, data: bytes) -> ChunkManifest:
+        raw = json.loads(data)
+        return cls(
+            size=raw["size"],
+            digest=raw["digest"],
+            chunks=[ChunkRef(**chunk) for chunk in raw["chunks"]],
+        )
+
+
+@dataclass
+class ChunkUploadSummary:
+    """
+    Summary of a chunked checkpoint upload.
+
+    Attributes:
+        chunks (int): Number of chunks of the checkpoint.
+        new_chunks (int): Number of chunks that had to be uploaded.
+        bytes (int): Size of the checkpoint in bytes.
+        uploaded_bytes (int): Number of bytes uploaded.
+    """
+
+    chunks: int = 0
+    new_chunks: int = 0
+    bytes: int = 0
+    uploaded_bytes: int = 0
+
+    @property
+    def dedupe_ratio(self) -> float:
+        """Fraction of the checkpoint bytes that were already stored."""
+        return 1 - self.uploaded_bytes / self.bytes if self.bytes else 0.0
+
+
+class ChunkCache:
+    """
+    A local, content-addressed cache of checkpoint chunks.
+
+    Chunks are immutable and named by their sha256, so they are shared by every
+    model, branch and version and never need to be invalidated.
+
+    Attributes:
+        cache_dir (Path): Directory of the cached chunks.
+    """
+
+    def __init__(self, cache_dir: str | None = None):
+        self.cache_dir = Path(cache_dir or Path(settings.CACHE_DIR) / "chunks")
+
+    def _path(self, digest: str) -> Path:
+        return self.cache_dir / digest[:2] / digest
+
+    def get(self, digest: str) -> bytes | None:
+        """Return a cached chunk, or None if it is missing or corrupt."""
+        path = self._path(digest)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        if hashlib.sha256(data).hexdigest() != digest:
+            path.unlink(missing_ok=True)
+            return None
+        return data
+
+    def put(self, digest: str, data: bytes | memoryview) -> None:
+        """Add a chunk to the cache."""
+        path = self._path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
@@ -15,8 +15,20 @@ if TYPE_CHECKING:
     from lakefs_spec import LakeFSFileSystem
     from supabase import Client as SupabaseClient
 
+    from atria_hub.chunking import ChunkCache
+    from atria_hub.compression import CompressingTransport
+    from atria_hub.content_index import ContentIndex
     from atria_hub.credentials_storage import CredentialsStorage
+    from atria_hub.experiment_cache import ExperimentCache
+    from atria_hub.explanations import ExplanationPayloadCache
+    from atria_hub.governor import StorageGovernor
     from atria_hub.models import ReposCredentials
+    from atria_hub.parsed_config import ParsedConfigCache
+    from atria_hub.presign import DirectTransport
+    from atria_hub.ref_cache import RefCache
+    from atria_hub.shared_checkpoint import SharedCheckpointStore
+    from atria_hub.snapshot_cache import ConfigSnapshotCache
+    from atria_hub.transfer_journal import TransferJournal
 
 logger = get_logger(__name__)
 
@@ -33,13 +45,20 @@ class AtriaHubClient:
         from supabase import Client as AuthClient, ClientOptions, create_client
 
         from atria_hub.credentials_storage import CredentialsStorage
+        from atria_hub.ref_cache import RefCache
 
         self._base_url = base_url
         self._storage_url = storage_url
         self._service_name = service_name
         self._auth_headers: dict[str, str] = {}
         self._credentials_storage = CredentialsStorage(service_name)
-        self._api_client = AtriaxClient(base_url=base_url)
+        self._transport = self._create_transport()
+        self._api_client = AtriaxClient(
+            base_url=base_url,
+            httpx_args={}
+            if self._transport is None
+            else {"transport": self._transport},
+        )
         self._auth_client: AuthClient = create_client(
             supabase_url=base_url,
             supabase_key="dummy-key",
@@ -49,6 +68,31 @@ class AtriaHubClient:
         )
         self._lakefs_client: LakeFSClient | None = None
         self._lakefs_fs: LakeFSFileSystem | None = None
+        self._ref_cache = RefCache(ttl=settings.REF_CACHE_TTL_SECONDS)
+
+    def _create_transport(self) -> CompressingTransport | None:
+        """Return the transport of the REST API, if requests are compressed."""
+        if settings.REQUEST_COMPRESSION is None:
+            return None
+        from atria_hub.compression import CompressingTransport
+
+        # one transport, and so one connection pool, for every protected client;
+        # it is shared, so leaving a client's `with` block does not close it
+        return CompressingTransport(
+            settings.REQUEST_COMPRESSION,
+            min_bytes=settings.REQUEST_COMPRESSION_MIN_BYTES,
+            shared=True,
+        )
+
+    def close(self) -> None:
+        """Close the connection pool shared by the REST API clients."""
+        if self._transport is not None:
+            self._transport.shutdown()
+
+    @property
+    def base_url(self) -> str:
+        """Return the URL of the hub API."""
+        return self._base_url
 
     @property
     def credentials_storage(self) -> CredentialsStorage:
@@ -89,6 +133,90 @@ class AtriaHubClient:
             self._lakefs_fs.client = self._lakefs_client
         return self._lakefs_fs
 
+    @property
+    def ref_cache(self) -> RefCache:
+        """Return the cache of branch to commit resolutions."""
+        return self._ref_cache
+
+    @property
+    def storage_host(self) -> str:
+        """Return the host of the storage server."""
+        from urllib.parse import urlparse
+
+        return urlparse(self._storage_url).netloc
+
+    @property
+    def storage_governor(self) -> StorageGovernor:
+        """Return the process-wide governor of storage traffic."""
+        from atria_hub.governor import get_storage_governor
+
+        return get_storage_governor()
+
+    @cached_property
+    def transfer_journal(self) -> TransferJournal:
+        """Return the journal of resumable uploads and downloads."""
+        from atria_hub.transfer_journal import TransferJournal
+
+        return TransferJournal()
+
+    @cached_property
+    def content_index(self) -> ContentIndex:
+        """Return the index of uploaded content used to deduplicate uploads."""
+        from atria_hub.content_index import ContentIndex
+
+        return ContentIndex()
+
+    @cached_property
+    def direct_transport(self) -> DirectTransport:
+        """Return the transport moving bytes directly to and from the object store."""
+        from atria_hub.presign import DirectTransport
+
+        return DirectTransport(self)
+
+    @cached_property
+    def experiment_cache(self) -> ExperimentCache:
+        """Return the cache of provisioned evaluation experiment IDs."""
+        from atria_hub.experiment_cache import ExperimentCache
+
+        return ExperimentCache()
+
+    @cached_property
+    def chunk_cache(self) -> ChunkCache:
+        """Return the local cache of checkpoint chunks."""
+        from atria_hub.chunking import ChunkCache
+
+        return ChunkCache()
+
+    @cached_property
+    def config_snapshot_cache(self) -> ConfigSnapshotCache:
+        """Return the cache of registered config snapshot IDs."""
+        from atria_hub.snapshot_cache import ConfigSnapshotCache
+
+        return ConfigSnapshotCache()
+
+    @cached_property
+    def explanation_payload_cache(self) -> ExplanationPayloadCache:
+        """Return the on-disk cache of fetched explanation payloads."""
+        from atria_hub.explanations import ExplanationPayloadCache
+
+        return ExplanationPayloadCache()
+
+    @cached_property
+    def shared_checkpoints(self) -> SharedCheckpointStore:
+        """Return the host-wide store of checkpoints shared between processes."""
+        from atria_hub.shared_checkpoint import SharedCheckpointStore
+
+        return SharedCheckpointStore()
+
+    @cached_property
+    def parsed_configs(self) -> ParsedConfigCache:
+        """Return the memo of parsed config files."""
+        from atria_hub.parsed_config import ParsedConfigCache
+
+        return ParsedConfigCache(
+            settings.PARSED_CONFIG_CACHE_ENTRIES, ttl=settings.REF_CACHE_TTL_SECONDS
+        )
+
     def set_repos_access_credentials(self, credentials: ReposCredentials):
         """Set the credentials in the storage."""
         self.lakefs_client._conf.username = credentials.access_key_id
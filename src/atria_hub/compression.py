@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import gzip
+
+import httpx
+
+from atria_hub.utilities import get_logger
+
+logger = get_logger(__name__)
+
+_METHODS_WITH_BODY = frozenset({"POST", "PUT", "PATCH"})
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress a request body with a `Content-Encoding` of "gzip" or "zstd"."""
+    if encoding == "gzip":
+        # mtime=0 keeps the output deterministic
+        return gzip.compress(data, compresslevel=5, mtime=0)
+    if encoding == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    raise ValueError(f"Unsupported request encoding: {encoding}")
+
+
+class CompressingTransport(httpx.BaseTransport):
+    """
+    An HTTP transport that compresses large request bodies.
+
+    Bodies of at least `min_bytes` are sent compressed with a `Content-Encoding`
+    header when that makes them smaller. If the server answers a compressed
+    request with 415 Unsupported Media Type, the request is sent again
+    uncompressed and compression is turned off for the transport. Responses
+    need nothing here: httpx advertises the encodings it can decode in
+    `Accept-Encoding` and decompresses response streams as they are read.
+
+    A shared transport outlives the httpx clients using it: closing a client
+    leaves its connection pool open, and only `shutdown` closes it.
+
+    Attributes:
+        encoding (str | None): "gzip" or "zstd", or None once the server rejected it.
+        min_bytes (int): Smallest body size that is compressed.
+        shared (bool): Whether closing a client using the transport keeps it open.
+    """
+
+    def __init__(
+        self,
+        encoding: str,
+        min_bytes: int,
+        transport: httpx.BaseTransport | None = None,
+        shared: bool = False,
+    ):
+        self.encoding: str | None = encoding
+        self.min_bytes = min_bytes
+        self.shared = shared
+        self._transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        encoding = self.encoding
+        if (
+            encoding is None
+            or request.method not in _METHODS_WITH_BODY
+            or "Content-Encoding" in request.headers
+        ):
+            return self._transport.handle_request(request)
+
+        body = request.read()
+        if len(body) < self.min_bytes:
+            return self._transport.handle_request(request)
+        compressed = compress(body, encoding)
+        if len(compressed) >= len(body):
+            return self._transport.handle_request(request)
+
+        headers = request.headers.copy()
+        headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(len(compressed))
+        response = self._transport.handle_request(
+            httpx.Request(
+                request.method,
+                request.url,
+                headers=headers,
+                content=compressed,
+                extensions=request.extensions,
+            )
+        )
+        if response.status_code != 415:
+            return response
+        response.close()
+        logger.warning(
+            f"{request.url.host} does not accept {encoding} request bodies, sending them uncompressed"
+        )
+        self.encoding = None
+        return self._transport.handle_request(request)
+
+    def close(self) -> None:
+        if not self.shared:
+            self._transport.close()
+
+    def shutdown(self) -> None:
+        """Close the connection pool, even of a shared transport."""
+        self._transport.close()
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 from pydantic_settings import BaseSettings
 
 
@@ -9,5 +11,33 @@ class Settings(BaseSettings):
     LOG_FORMAT: str = "%(message)s"
     DATE_FORMAT: str = "[%X]"
 
+    CACHE_DIR: str = str(Path.home() / ".cache" / "atria_hub")
+    MATERIALIZED_CACHE_MAX_BYTES: int | None = None
+    EXPLANATION_CACHE_MAX_BYTES: int | None = 2 << 30
+
+    STORAGE_MAX_BYTES_PER_SEC: int | None = None
+    STORAGE_MAX_IN_FLIGHT_PER_HOST: int = 16
+    STORAGE_INTERACTIVE_RESERVED_SLOTS: int = 2
+    STORAGE_TRANSFER_WORKERS: int = 8
+    REF_CACHE_TTL_SECONDS: float = 30.0
+    CHECKPOINT_MAX_SHARD_BYTES: int = 1 << 30
+    CHECKPOINT_READ_MAX_GAP: int = 1 << 20
+    DEDUPLICATE_UPLOADS: bool = True
+    STORAGE_DIRECT_TRANSFERS: bool = True
+    PRESIGN_BATCH_SIZE: int = 1000
+    PRESIGN_EXPIRY_MARGIN_SECONDS: float = 60.0
+    SPOOL_BATCH_SIZE: int = 1000
+    SPOOL_LEASE_SECONDS: float = 300.0
+    SPOOL_POLL_INTERVAL_SECONDS: float = 1.0
+    SPOOL_MAX_BACKOFF_SECONDS: float = 60.0
+    METRICS_BATCH_SIZE: int = 500
+    FAST_JSON: bool = False
+    REQUEST_COMPRESSION: str | None = None
+    REQUEST_COMPRESSION_MIN_BYTES: int = 16 << 10
+    SIDECAR_SHM_MIN_BYTES: int = 1 << 20
+    SIDECAR_IDLE_TIMEOUT_SECONDS: float | None = 600.0
+    PARSED_CONFIG_CACHE_ENTRIES: int = 256
+    PARSED_SIDECAR_MIN_BYTES: int = 64 << 10
+
 
 settings = Settings()  # type: ignore
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from atria_hub.config import settings
+
+
+@dataclass(frozen=True)
+class ContentEntry:
+    """
+    A stored object that can be linked instead of uploading its bytes again.
+
+    Attributes:
+        physical_address (str): Address of the object in the object store.
+        checksum (str): Checksum of the object as reported by lakeFS.
+        size (int): Size of the object in bytes.
+        content_type (str | None): Content type of the object.
+        branch (str | None): Branch the object was uploaded to.
+        path (str | None): Path the object was uploaded to, which must still
+            reference it for the object to be linked.
+    """
+
+    physical_address: str
+    checksum: str
+    size: int
+    content_type: str | None = None
+    branch: str | None = None
+    path: str | None = None
+
+
+class ContentIndex:
+    """
+    A persistent index of uploaded content, keyed by repository and content hash.
+
+    Every object uploaded through the hub is recorded with its physical address
+    and the branch and path it was uploaded to, so uploading the same bytes
+    again to any branch or path of the repository only stages a link to the
+    existing object. The index is a SQLite database in the local cache
+    directory that is safe to share between threads and processes, so only
+    uploads made from the same machine are deduplicated.
+
+    Attributes:
+        path (Path): Location of the index database.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = Path(path or Path(settings.CACHE_DIR) / "content_index.sqlite")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, timeout=60
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS contents (
+                repo_id TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                physical_address TEXT NOT NULL,
+                checksum TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                content_type TEXT,
+                branch TEXT,
+                path TEXT,
+                PRIMARY KEY (repo_id, digest)
+            )
+            """
+        )
+        self._connection.commit()
+
+    def _execute(self, query: str, parameters: tuple = ()) -> list[tuple]:
+        with self._lock:
+            rows = self._connection.execute(query, parameters).fetchall()
+            self._connection.commit()
+            return rows
+
+    def get(self, repo_id: str, digest: str) -> ContentEntry | None:
+        """Return the stored object with the given content hash, if any."""
+        rows = self._execute(
+            "SELECT physical_address, checksum, size, content_type, branch, path FROM contents WHERE repo_id = ? AND digest = ?",
+            (repo_id, digest),
+        )
+        return ContentEntry(*rows[0]) if rows else None
+
+    def add(self, repo_id: str, digest: str, entry: ContentEntry) -> None:
+        """Record a stored object under its content hash."""
+        self._execute(
+            "INSERT OR REPLACE INTO contents (repo_id, digest, physical_address, checksum, size, content_type, branch, path) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                repo_id,
+                digest,
+                entry.physical_address,
+                entry.checksum,
+                entry.size,
+                entry.content_type,
+                entry.branch,
+                entry.path,
+            ),
+        )
+
+    def discard(self, repo_id: str, digest: str) -> None:
+        """Forget an object, e.g. once it can no longer be linked."""
+        self._execute(
+            "DELETE FROM contents WHERE repo_id = ? AND digest = ?", (repo_id, digest)
+        )
+
+    def move_branch(self, repo_id: str, branch: str, to_branch: str) -> None:
+        """Record the objects uploaded to `branch` as referenced by `to_branch`, e.g. after a merge."""
+        self._execute(
+            "UPDATE contents SET branch = ? WHERE repo_id = ? AND branch = ?",
+            (to_branch, repo_id, branch),
+        )
+
+    def discard_branch(self, repo_id: str, branch: str) -> None:
+        """Forget the objects uploaded to a branch, e.g. before deleting it."""
+        self._execute(
+            "DELETE FROM contents WHERE repo_id = ? AND branch = ?", (repo_id, branch)
+        )
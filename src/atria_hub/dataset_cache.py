@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import shutil
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from atria_hub.config import settings
+from atria_hub.utilities import file_lock, get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    import pyarrow as pa
+
+logger = get_logger(__name__)
+
+_COMPLETE_MARKER = "_COMPLETE"
+
+
+class MaterializedSplitCache:
+    """
+    A node-local cache of dataset splits stored as Arrow IPC files.
+
+    Each split is converted once from parquet into uncompressed Arrow IPC files
+    under `<cache_dir>/<repo>/<commit>/<config>/<split>/`. The files are opened
+    with `memory_map`, so every process on the node reads the same page-cache
+    copy without decoding or copying. A per-entry file lock guarantees that
+    only one process builds an entry while the others wait for it.
+
+    Attributes:
+        cache_dir (Path): Root directory of the cache.
+        max_bytes (int | None): Disk budget of the cache. Least recently used
+            entries are evicted once it is exceeded.
+    """
+
+    def __init__(self, cache_dir: str | None = None, max_bytes: int | None = None):
+        self.cache_dir = Path(cache_dir or Path(settings.CACHE_DIR) / "materialized")
+        self.max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else settings.MATERIALIZED_CACHE_MAX_BYTES
+        )
+
+    def entry_dir(
+        self, dataset_repo_id: str, commit_id: str, config_name: str, split: str
+    ) -> Path:
+        """Return the directory of a cache entry."""
+        return self.cache_dir / dataset_repo_id / commit_id / config_name / split
+
+    def _lock_path(self, entry_dir: Path) -> Path:
+        return (
+            self.cache_dir
+            / ".locks"
+            / ("_".join(entry_dir.relative_to(self.cache_dir).parts) + ".lock")
+        )
+
+    def get(
+        self, dataset_repo_id: str, commit_id: str, config_name: str, split: str
+    ) -> list[Path] | None:
+        """
+        Return the IPC files of a cached split, or None if it is not cached.
+
+        Side Effects:
+            Marks the entry as recently used.
+        """
+        entry_dir = self.entry_dir(dataset_repo_id, commit_id, config_name, split)
+        marker = entry_dir / _COMPLETE_MARKER
+        if not marker.exists():
+            return None
+        marker.touch()
+        return sorted(entry_dir.glob("*.arrow"))
+
+    def materialize(
+        self,
+        dataset_repo_id: str,
+        commit_id: str,
+        config_name: str,
+        split: str,
+        parquet_files: Sequence[str | Path] | Callable[[], Sequence[str | Path]],
+    ) -> list[Path]:
+        """
+        Convert the parquet files of a split to Arrow IPC files, once per node.
+
+        If another process is already building the entry this call blocks until
+        it is done and returns the finished entry.
+
+        Args:
+            dataset_repo_id (str): The repository of the dataset.
+            commit_id (str): The commit the files were downloaded from.
+            config_name (str): The dataset configuration.
+            split (str): The dataset split.
+            parquet_files (Sequence[str | Path] | Callable[[], Sequence[str | Path]]):
+                Local parquet files of the split in reading order, or a callable
+                returning them. The callable is only invoked by the process that
+                builds the entry, so it can be used to download the files.
+
+        Returns:
+            list[Path]: The IPC files of the entry, in reading order.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        entry_dir = self.entry_dir(dataset_repo_id, commit_id, config_name, split)
+        with file_lock(self._lock_path(entry_dir)):
+            cached = self.get(dataset_repo_id, commit_id, config_name, split)
+            if cached is not None:
+                return cached
+
+            if callable(parquet_files):
+                parquet_files = parquet_files()
+            logger.info(
+                f"Materializing {len(parquet_files)} files of {dataset_repo_id}/{commit_id[:7]}/{config_name}/{split} to {entry_dir}"
+            )
+            tmp_dir = entry_dir.with_name(f"{entry_dir.name}.tmp")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            tmp_dir.mkdir(parents=True)
+            for index, parquet_file in enumerate(parquet_files):
+                parquet = pq.ParquetFile(parquet_file)
+                with pa.OSFile(str(tmp_dir / f"{index:06d}.arrow"), "wb") as sink:
+                    with pa.ipc.new_file(sink, parquet.schema_arrow) as writer:
+                        for batch in parquet.iter_batches():
+                            writer.write_batch(batch)
+            (tmp_dir / _COMPLETE_MARKER).touch()
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            tmp_dir.rename(entry_dir)
+
+        self.evict(keep=entry_dir)
+        return sorted(entry_dir.glob("*.arrow"))
+
+    def open(self, ipc_files: Sequence[str | Path]) -> pa.Table:
+        """Open IPC files as a single memory-mapped table without copying."""
+        import pyarrow as pa
+
+        tables = [
+            pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+            for path in ipc_files
+        ]
+        return pa.concat_tables(tables)
+
+    def size(self) -> int:
+        """Return the total size of the cached IPC files in bytes."""
+        return sum(path.stat().st_size for path in self.cache_dir.rglob("*.arrow"))
+
+    def evict(self, keep: Path | None = None) -> None:
+        """
+        Remove least recently used entries until the cache fits the disk budget.
+
+        Entries that are being read stay valid for open readers, since removing a
+        memory-mapped file does not unmap it.
+
+        Args:
+            keep (Path | None): An entry that must not be evicted.
+        """
+        if self.max_bytes is None or not self.cache_dir.exists():
+            return
+
+        entries = []
+        for marker in self.cache_dir.rglob(_COMPLETE_MARKER):
+            entry_dir = marker.parent
+            entry_size = sum(path.stat().st_size for path in entry_dir.glob("*.arrow"))
+            entries.append((marker.stat().st_mtime, entry_dir, entry_size))
+
+        total = sum(entry_size for _, _, entry_size in entries)
+        for last_used, entry_dir, entry_size in sorted(entries, key=lambda x: x[0]):
+            if total <= self.max_bytes:
+                break
+            if entry_dir == keep:
+                continue
+            with file_lock(self._lock_path(entry_dir)):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= entry_size
+            logger.info(
+                f"Evicted {entry_dir} ({entry_size} bytes, last used {time.ctime(last_used)}) from the materialized cache."
+            )
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from urllib.parse import unquote
+
+if TYPE_CHECKING:
+    from fsspec import AbstractFileSystem
+
+
+@dataclass(frozen=True)
+class DeltaFile:
+    """A data file that is part of the current snapshot of a Delta table."""
+
+    path: str
+    size: int
+    num_records: int | None = None
+
+
+def _parse_add_action(add: dict) -> DeltaFile:
+    num_records = None
+    stats = add.get("stats")
+    if stats:
+        try:
+            num_records = json.loads(stats).get("numRecords")
+        except (TypeError, ValueError):
+            num_records = None
+    return DeltaFile(
+        path=unquote(add["path"]), size=int(add["size"]), num_records=num_records
+    )
+
+
+def _read_checkpoint(
+    fs: AbstractFileSystem, log_dir: str, version: int
+) -> dict[str, DeltaFile]:
+    import pyarrow.parquet as pq
+
+    files: dict[str, DeltaFile] = {}
+    with fs.open(f"{log_dir}{version:020d}.checkpoint.parquet", "rb") as f:
+        table = pq.read_table(f, columns=["add"])
+    for row in table.column("add").to_pylist():
+        if row is not None:
+            delta_file = _parse_add_action(row)
+            files[delta_file.path] = delta_file
+    return files
+
+
+def read_delta_files(fs: AbstractFileSystem, table_path: str) -> list[DeltaFile]:
+    """
+    List the data files of the latest snapshot of a Delta table.
+
+    The transaction log is replayed from the last checkpoint (if any) so that
+    files removed by later commits are not returned. The files are returned in
+    the order in which they were added to the table.
+
+    Args:
+        fs (AbstractFileSystem): The filesystem holding the table.
+        table_path (str): The path of the table root directory.
+
+    Returns:
+        list[DeltaFile]: The active data files of the table.
+    """
+    from pathlib import PurePosixPath
+
+    table_path = table_path.rstrip("/") + "/"
+    log_dir = f"{table_path}_delta_log/"
+
+    files: dict[str, DeltaFile] = {}
+    start_version = 0
+    if fs.exists(f"{log_dir}_last_checkpoint"):
+        last_checkpoint = json.loads(fs.cat_file(f"{log_dir}_last_checkpoint"))
+        files = _read_checkpoint(fs, log_dir, last_checkpoint["version"])
+        start_version = last_checkpoint["version"] + 1
+
+    commits = sorted(
+        (int(PurePosixPath(name).stem), name)
+        for name in fs.ls(log_dir, detail=False)
+        if name.endswith(".json") and PurePosixPath(name).stem.isdigit()
+    )
+    for version, name in commits:
+        if version < start_version:
+            continue
+        for line in fs.cat_file(name).decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            action = json.loads(line)
+            if "add" in action:
+                delta_file = _parse_add_action(action["add"])
+                files[delta_file.path] = delta_file
+            elif "remove" in action:
+                files.pop(unquote(action["remove"]["path"]), None)
+    return list(files.values())
@@ -26,6 +26,9 @@ class ApiResponseError(RuntimeError):
         self.status_code = status_code
         self.content = content
 
+    def __reduce__(self):
+        return type(self), (self.request_name, self.status_code, self.content)
+
 
 def api_error_handler(func: F) -> F:
     """Decorator to handle API response errors uniformly."""
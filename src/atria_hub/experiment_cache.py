@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import itertools
+import sqlite3
+import threading
+import uuid
+from dataclasses import astuple, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from atria_hub.config import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+@dataclass(frozen=True)
+class ExperimentSpec:
+    """
+    The full identity of an evaluation experiment.
+
+    Attributes:
+        dataset_id (uuid.UUID): The evaluated dataset.
+        dataset_branch (str): Branch of the dataset.
+        dataset_config_name (str): Configuration of the dataset.
+        dataset_split (str): The evaluated split.
+        model_id (uuid.UUID): The evaluated model.
+        model_branch (str): Branch of the model.
+        model_config_name (str): Configuration of the model.
+    """
+
+    dataset_id: uuid.UUID
+    dataset_branch: str
+    dataset_config_name: str
+    dataset_split: str
+    model_id: uuid.UUID
+    model_branch: str
+    model_config_name: str
+
+    @property
+    def key(self) -> str:
+        return "|".join(str(value) for value in astuple(self))
+
+
+def experiment_grid(
+    datasets: Iterable[tuple[uuid.UUID, str, str, str]],
+    models: Iterable[tuple[uuid.UUID, str, str]],
+) -> list[ExperimentSpec]:
+    """
+    Return the cross product of dataset splits and models.
+
+    Args:
+        datasets (Iterable[tuple[uuid.UUID, str, str, str]]): (dataset id, branch,
+            config name, split) of every evaluated dataset split.
+        models (Iterable[tuple[uuid.UUID, str, str]]): (model id, branch, config
+            name) of every evaluated model.
+
+    Returns:
+        list[ExperimentSpec]: One experiment per pair, without duplicates.
+    """
+    return list(
+        dict.fromkeys(
+            ExperimentSpec(*dataset, *model)
+            for dataset, model in itertools.product(datasets, list(models))
+        )
+    )
+
+
+class ExperimentCache:
+    """
+    A persistent mapping of experiment identities to their experiment IDs.
+
+    Experiments are never renamed, so once the hub has provisioned an
+    experiment its ID can be reused by every later sweep without asking the hub
+    again. Entries are scoped by hub URL.
+
+    Attributes:
+        path (Path): Location of the cache database.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = Path(path or Path(settings.CACHE_DIR) / "experiments.sqlite")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, timeout=60
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS experiments (
+                hub_url TEXT NOT NULL,
+                key TEXT NOT NULL,
+                experiment_id TEXT NOT NULL,
+                PRIMARY KEY (hub_url, key)
+            )
+            """
+        )
+        self._connection.commit()
+
+    def get_many(
+        self, hub_url: str, specs: Iterable[ExperimentSpec]
+    ) -> dict[ExperimentSpec, uuid.UUID]:
+        """Return the cached IDs of the given experiments that are known."""
+        specs = {spec.key: spec for spec in specs}
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key, experiment_id FROM experiments WHERE hub_url = ?",
+                (hub_url,),
+            ).fetchall()
+        return {
+            specs[key]: uuid.UUID(experiment_id)
+            for key, experiment_id in rows
+            if key in specs
+        }
+
+    def put_many(
+        self, hub_url: str, experiment_ids: dict[ExperimentSpec, uuid.UUID]
+    ) -> None:
+        """Record provisioned experiments."""
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO experiments (hub_url, key, experiment_id) VALUES (?, ?, ?)",
+                [
+                    (hub_url, spec.key, str(experiment_id))
+                    for spec, experiment_id in experiment_ids.items()
+                ],
+            )
+            self._connection.commit()
+
+    def discard(self, hub_url: str, experiment_id: uuid.UUID) -> None:
+        """Forget an experiment, e.g. after deleting it."""
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM experiments WHERE hub_url = ? AND experiment_id = ?",
+                (hub_url, str(experiment_id)),
+            )
+            self._connection.commit()
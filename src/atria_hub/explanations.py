@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from atria_hub.config import settings
+from atria_hub.utilities import get_logger
+
+if TYPE_CHECKING:
+    from atria_hub.api.evaluations import SampleExplanationsApi
+
+logger = get_logger(__name__)
+
+
+class ExplanationPayloadCache:
+    """
+    An on-disk LRU cache of explanation payloads.
+
+    Payloads are keyed by experiment, sample index, config snapshot and
+    explanation name, which identify an explanation. Writing an explanation
+    through `SampleExplanationsApi.write` discards the cached payloads of that
+    name and sample, since the write may replace them. Reading a payload
+    refreshes its modification time, and the least recently used payloads are
+    removed once the cache exceeds its disk budget.
+
+    The payload files are indexed in memory in recency order on first use and
+    the index is kept up to date with the reads and writes of this cache, so
+    eviction does not walk the directory. Payloads added by other processes
+    sharing the directory are indexed when they are first read.
+
+    Attributes:
+        cache_dir (Path): Directory of the cached payloads.
+        max_bytes (int | None): Disk budget of the cache.
+    """
+
+    def __init__(self, cache_dir: str | None = None, max_bytes: int | None = None):
+        self.cache_dir = Path(cache_dir or Path(settings.CACHE_DIR) / "explanations")
+        self.max_bytes = (
+            max_bytes if max_bytes is not None else settings.EXPLANATION_CACHE_MAX_BYTES
+        )
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Path, int] | None = None
+        self._size = 0
+
+    def _path(
+        self,
+        evaluation_experiment_id: uuid.UUID,
+        sample_index: int,
+        config_id: uuid.UUID,
+        name: str,
+    ) -> Path:
+        return (
+            self.cache_dir
+            / str(evaluation_experiment_id)
+            / str(sample_index)
+            / f"{config_id}.{self._name_digest(name)}"
+        )
+
+    @staticmethod
+    def _name_digest(name: str) -> str:
+        # names are free text, so hash them into a file name
+        return hashlib.sha256(name.encode()).hexdigest()[:32]
+
+    def _index(self) -> OrderedDict[Path, int]:
+        # called with the lock held
+        if self._entries is None:
+            entries = []
+            for path in self.cache_dir.rglob("*"):
+                if path.is_file() and not path.name.endswith(".tmp"):
+                    stat = path.stat()
+                    entries.append((stat.st_mtime, path, stat.st_size))
+            entries.sort()
+            self._entries = OrderedDict(
+                (path, entry_size) for _, path, entry_size in entries
+            )
+            self._size = sum(self._entries.values())
+        return self._entries
+
+    def _record(self, path: Path, entry_size: int) -> None:
+        # called with the lock held
+        entries = self._index()
+        self._size += entry_size - entries.pop(path, 0)
+        entries[path] = entry_size
+
+    def get(
+        self,
+        evaluation_experiment_id: uuid.UUID,
+        sample_index: int,
+        config_id: uuid.UUID,
+        name: str,
+    ) -> Path | None:
+        """Return the file of a cached payload, marking it as recently used."""
+        path = self._path(evaluation_experiment_id, sample_index, config_id, name)
+        try:
+            os.utime(path)
+            entry_size = path.stat().st_size
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._record(path, entry_size)
+        return path
+
+    def put(
+        self,
+        evaluation_experiment_id: uuid.UUID,
+        sample_index: int,
+        config_id: uuid.UUID,
+        name: str,
+        data: bytes,
+    ) -> Path:
+        """Add a payload to the cache and evict old payloads if needed."""
+        path = self._path(evaluation_experiment_id, sample_index, config_id, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._record(path, len(data))
+        self.evict(keep=path)
+        return path
+
+    def discard(
+        self, evaluation_experiment_id: uuid.UUID, sample_index: int, name: str
+    ) -> None:
+        """Remove the cached payloads of an explanation name of a sample, under any config."""
+        directory = self.cache_dir / str(evaluation_experiment_id) / str(sample_index)
+        with self._lock:
+            entries = self._index()
+            for path in directory.glob(f"*.{self._name_digest(name)}"):
+                path.unlink(missing_ok=True)
+                self._size -= entries.pop(path, 0)
+
+    def size(self) -> int:
+        """Return the total size of the cached payloads in bytes."""
+        with self._lock:
+            self._index()
+            return self._size
+
+    def evict(self, keep: Path | None = None) -> None:
+        """
+        Remove least recently used payloads until the cache fits the disk budget.
+
+        Args:
+            keep (Path | None): A payload that must not be evicted.
+        """
+        if self.max_bytes is None:
+            return
+        with self._lock:
+            entries = self._index()
+            if self._size <= self.max_bytes:
+                return
+            for path in list(entries):
+                if self._size <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                path.unlink(missing_ok=True)
+                self._size -= entries.pop(path)
+        logger.debug(f"Evicted explanation payloads down to {self._size} bytes.")
+
+
+@dataclass
+class ExplanationHandle:
+    """
+    The metadata of a sample explanation and a lazy handle to its payload.
+
+    The payload is only downloaded when it is first accessed, and whole
+    payloads are kept in the explanation payload cache of the client.
+
+    Attributes:
+        evaluation_experiment_id (uuid.UUID): The experiment of the explanation.
+        sample_index (int): The explained sample.
+        config_id (uuid.UUID): The config snapshot of the explanation.
+        name (str): Name of the explanation.
+        explanation_metadata (dict[str, Any]): The metadata of the explanation.
+        payload_url (str): URL of the payload.
+    """
+
+    evaluation_experiment_id: uuid.UUID
+    sample_index: int
+    config_id: uuid.UUID
+    name: str
+    explanation_metadata: dict[str, Any]
+    payload_url: str
+    _api: SampleExplanationsApi = field(repr=False, compare=False)
+
+    @classmethod
+    def from_record(
+        cls,
+        api: SampleExplanationsApi,
+        evaluation_experiment_id: uuid.UUID,
+        record: dict,
+    ) -> ExplanationHandle:
+        metadata = record.get("explanation_metadata") or {}
+        if isinstance(metadata, str):
+            metadata = json.loads(metadata)
+        return cls(
+            evaluation_experiment_id=evaluation_experiment_id,
+            sample_index=record["sample_index"],
+            config_id=uuid.UUID(str(record["config_id"])),
+            name=record["name"],
+            explanation_metadata=metadata,
+            payload_url=record["explanation_file_url"],
+            _api=api,
+        )
+
+    @property
+    def _cache(self) -> ExplanationPayloadCache:
+        return self._api._client.explanation_payload_cache
+
+    @property
+    def cached(self) -> bool:
+        """Whether the payload is in the local cache."""
+        return (
+            self._cache.get(
+                self.evaluation_experiment_id,
+                self.sample_index,
+                self.config_id,
+                self.name,
+            )
+            is not None
+        )
+
+    def payload(self) -> bytes:
+        """Return the payload, downloading and caching it on first access."""
+        cache = self._cache
+        path = cache.get(
+            self.evaluation_experiment_id, self.sample_index, self.config_id, self.name
+        )
+        if path is not None:
+            try:
+                return path.read_bytes()
+            except FileNotFoundError:
+                # evicted by another process in between
+                pass
+        data = self._api._fetch_payload(self.payload_url)
+        cache.put(
+            self.evaluation_experiment_id,
+            self.sample_index,
+            self.config_id,
+            self.name,
+            data,
+        )
+        return data
+
+    def read_range(self, offset: int, length: int) -> bytes:
+        """Return `length` bytes of the payload from `offset`, without downloading the rest."""
+        path = self._cache.get(
+            self.evaluation_experiment_id, self.sample_index, self.config_id, self.name
+        )
+        if path is not None:
+            try:
+                with open(path, "rb") as f:
+                    f.seek(offset)
+                    return f.read(length)
+            except FileNotFoundError:
+                pass
+        return self._api._fetch_payload(self.payload_url, offset=offset, length=length)
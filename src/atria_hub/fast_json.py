@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import uuid
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+    from atriax_client.types import Response
+
+    from atria_hub.client import AtriaHubClient
+
+try:
+    import orjson
+except ImportError:  # optional, install atria_hub[fast]
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    # numpy scalars and arrays, without importing numpy
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """Encode plain Python and NumPy values as JSON."""
+    if orjson is not None:
+        return orjson.dumps(
+            value,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(value, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """Decode JSON into plain Python values."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def request(
+    client: AtriaHubClient, endpoint: ModuleType, body: Any = None, **kwargs
+) -> Response:
+    """
+    Call a generated endpoint with a plain JSON body and return its plain JSON result.
+
+    The method and URL are taken from the endpoint's own request builder, so
+    the request matches the generated client, but the body is encoded and the
+    response decoded directly, without building a model object per item. The
+    result is a `Response` like the ones of `sync_detailed`, whose `parsed`
+    value holds dicts and lists instead of models.
+
+    Args:
+        client (AtriaHubClient): The hub client.
+        endpoint (ModuleType): The generated endpoint module, e.g.
+            `atriax_client.api.sample_evaluations.sample_evaluations_write`.
+        body (Any): The JSON body, or None if the endpoint takes none.
+        **kwargs: The path and query parameters of the endpoint.
+
+    Returns:
+        Response: The response, with the decoded body as `parsed`.
+    """
+    from http import HTTPStatus
+
+    from atriax_client.types import Response
+
+    if body is not None:
+        # only the method, URL and query are used, the body is encoded here
+        kwargs["body"] = []
+    request_kwargs = endpoint._get_kwargs(**kwargs)
+    headers = {"Accept": "application/json"}
+    if body is not None:
+        headers["Content-Type"] = "application/json"
+    with client.protected_api_client as api_client:
+        response = api_client.get_httpx_client().request(
+            request_kwargs["method"],
+            request_kwargs["url"],
+            params=request_kwargs.get("params"),
+            content=dumps(body) if body is not None else None,
+            headers=headers,
+        )
+    return Response(
+        status_code=HTTPStatus(response.status_code),
+        content=response.content,
+        headers=response.headers,
+        parsed=loads(response.content)
+        if response.status_code == 200 and response.content
+        else None,
+    )
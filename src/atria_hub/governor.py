@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+from atria_hub.config import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class Priority(IntEnum):
+    """Priority classes of storage requests, lower values are served first."""
+
+    INTERACTIVE = 0
+    BULK = 1
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket limiting a byte rate.
+
+    Attributes:
+        rate (float): Tokens (bytes) added per second.
+        capacity (float): Maximum number of tokens that can accumulate.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def consume(self, amount: int, block: bool = True) -> None:
+        """
+        Take `amount` tokens from the bucket.
+
+        Requests larger than the capacity are allowed and put the bucket into
+        debt, which later requests pay back by waiting.
+
+        Args:
+            amount (int): Number of bytes to account for.
+            block (bool): Wait until the bucket is out of debt. Non-blocking
+                consumers are still charged, so they slow down everybody else.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if block and wait > 0:
+            time.sleep(wait)
+
+
+class StorageGovernor:
+    """
+    Process-wide limits on the traffic sent to the storage servers.
+
+    The governor caps the number of requests in flight per host and the total
+    byte rate of bulk transfers. A number of request slots is reserved for
+    interactive requests, and waiting interactive requests are admitted before
+    waiting bulk requests, so metadata reads never queue behind data transfers.
+
+    Attributes:
+        max_in_flight_per_host (int): Maximum concurrent requests per host.
+        reserved_interactive (int): Slots per host only usable by interactive
+            requests.
+        bandwidth (TokenBucket | None): The byte rate limit, if any.
+    """
+
+    def __init__(
+        self,
+        max_bytes_per_sec: int | None = None,
+        max_in_flight_per_host: int = 16,
+        reserved_interactive: int = 2,
+    ):
+        if reserved_interactive >= max_in_flight_per_host:
+            raise ValueError(
+                "reserved_interactive must be smaller than max_in_flight_per_host."
+            )
+        self.max_in_flight_per_host = max_in_flight_per_host
+        self.reserved_interactive = reserved_interactive
+        self.bandwidth = (
+            TokenBucket(rate=max_bytes_per_sec) if max_bytes_per_sec else None
+        )
+        self._condition = threading.Condition()
+        self._in_flight: dict[str, int] = defaultdict(int)
+        self._waiting_interactive: dict[str, int] = defaultdict(int)
+
+    def _can_start(self, host: str, priority: Priority) -> bool:
+        in_flight = self._in_flight[host]
+        if priority == Priority.INTERACTIVE:
+            return in_flight < self.max_in_flight_per_host
+        return (
+            in_flight < self.max_in_flight_per_host - self.reserved_interactive
+            and self._waiting_interactive[host] == 0
+        )
+
+    @contextmanager
+    def request(
+        self, host: str, priority: Priority = Priority.BULK, nbytes: int = 0
+    ) -> Iterator[None]:
+        """
+        Hold a request slot on `host` for the duration of the block.
+
+        Args:
+            host (str): The host the request is sent to.
+            priority (Priority): The priority class of the request.
+            nbytes (int): Bytes the request is known to transfer upfront, charged
+                to the bandwidth limit before the request starts.
+        """
+        with self._condition:
+            if priority == Priority.INTERACTIVE:
+                self._waiting_interactive[host] += 1
+            try:
+                self._condition.wait_for(lambda: self._can_start(host, priority))
+            finally:
+                if priority == Priority.INTERACTIVE:
+                    self._waiting_interactive[host] -= 1
+            self._in_flight[host] += 1
+        try:
+            self.throttle(nbytes, priority)
+            yield
+        finally:
+            with self._condition:
+                self._in_flight[host] -= 1
+                self._condition.notify_all()
+
+    def throttle(self, nbytes: int, priority: Priority = Priority.BULK) -> None:
+        """Charge transferred bytes to the bandwidth limit, waiting for bulk traffic."""
+        if self.bandwidth is not None and nbytes > 0:
+            self.bandwidth.consume(nbytes, block=priority == Priority.BULK)
+
+
+_governor: StorageGovernor | None = None
+_governor_lock = threading.Lock()
+
+
+def get_storage_governor() -> StorageGovernor:
+    """Return the process-wide storage governor, configured from the settings."""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = StorageGovernor(
+                max_bytes_per_sec=settings.STORAGE_MAX_BYTES_PER_SEC,
+                max_in_flight_per_host=settings.STORAGE_MAX_IN_FLIGHT_PER_HOST,
+                reserved_interactive=settings.STORAGE_INTERACTIVE_RESERVED_SLOTS,
+            )
+        return _governor
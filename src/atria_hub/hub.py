@@ -15,6 +15,7 @@ if TYPE_CHECKING:
     from atria_hub.api.tasks import TasksApi
     from atria_hub.client import AtriaHubClient
     from atria_hub.models import AuthLoginModel
+    from atria_hub.sidecar import SidecarHub
 
 logger = get_logger(__name__)
 
@@ -69,6 +70,29 @@ class AtriaHub:
         # evaluation APIs
         self._evaluations = EvaluationsApi(client=self._client)
 
+    @staticmethod
+    def connect_sidecar(
+        base_url: str = settings.ATRIAX_URL,
+        storage_url: str = settings.ATRIAX_STORAGE_URL,
+        socket_path: str | None = None,
+        spawn: bool = True,
+    ) -> SidecarHub:
+        """
+        Return a thin hub that forwards its API calls to the sidecar of this host.
+
+        The sidecar holds one authenticated hub with its connection pools and
+        caches for all local processes, and is started if it is not running.
+        See `atria_hub.sidecar`.
+        """
+        from atria_hub.sidecar import connect
+
+        return connect(
+            socket_path=socket_path,
+            base_url=base_url,
+            storage_url=storage_url,
+            spawn=spawn,
+        )
+
     def initialize(
         self, credentials: AuthLoginModel | None = None, force_sign_in: bool = False
     ) -> AtriaHub:
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from atria_hub.index_ranges import IndexRanges
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from atria_hub.delta import DeltaFile
+
+
+@dataclass(frozen=True)
+class CarriedRun:
+    """
+    A run of samples that is unchanged between two versions of a split.
+
+    Attributes:
+        old_start (int): Index of the first sample of the run in the old version.
+        new_start (int): Index of the first sample of the run in the new version.
+        length (int): Number of samples of the run.
+    """
+
+    old_start: int
+    new_start: int
+    length: int
+
+    def pairs(self) -> Iterator[tuple[int, int]]:
+        """Yield the (old index, new index) pairs of the run."""
+        offset = self.new_start - self.old_start
+        for index in range(self.old_start, self.old_start + self.length):
+            yield index, index + offset
+
+
+@dataclass
+class IncrementalPlan:
+    """
+    How the evaluation of one version of a split carries over to another.
+
+    Attributes:
+        old_commit_id (str): The evaluated commit.
+        new_commit_id (str): The commit to evaluate.
+        num_samples (int): Number of samples of the split at the new commit.
+        carried (list[CarriedRun]): Samples whose results can be copied.
+        recompute (IndexRanges): Samples of the new commit that must be evaluated.
+    """
+
+    old_commit_id: str
+    new_commit_id: str
+    num_samples: int
+    carried: list[CarriedRun] = field(default_factory=list)
+    recompute: IndexRanges = field(default_factory=IndexRanges)
+
+    @property
+    def num_carried(self) -> int:
+        return sum(run.length for run in self.carried)
+
+
+def plan_incremental(
+    old_commit_id: str,
+    new_commit_id: str,
+    old_files: list[DeltaFile],
+    new_files: list[DeltaFile],
+    changed_paths: Iterable[str] = (),
+) -> IncrementalPlan:
+    """
+    Map the Delta files of two versions of a split to the samples to copy and to recompute.
+
+    Samples are numbered in the order of the files of the table, so a data file
+    present in both versions keeps its samples but may move them, e.g. when an
+    earlier file was removed. Delta data files are immutable and uniquely named,
+    so a file with the same path and row count holds the same samples unless the
+    commit diff reports it as changed.
+
+    Args:
+        old_commit_id (str): The evaluated commit.
+        new_commit_id (str): The commit to evaluate.
+        old_files (list[DeltaFile]): Data files of the split at the old commit, with
+            their row counts.
+        new_files (list[DeltaFile]): Data files of the split at the new commit, with
+            their row counts.
+        changed_paths (Iterable[str]): Data file paths, relative to the table, that
+            the commit diff reports as overwritten.
+
+    Returns:
+        IncrementalPlan: The plan.
+    """
+    changed = set(changed_paths)
+    old_runs = {}
+    position = 0
+    for delta_file in old_files:
+        old_runs[delta_file.path] = (position, delta_file.num_records)
+        position += delta_file.num_records
+
+    plan = IncrementalPlan(
+        old_commit_id=old_commit_id, new_commit_id=new_commit_id, num_samples=0
+    )
+    recompute = []
+    for delta_file in new_files:
+        start, length = plan.num_samples, delta_file.num_records
+        plan.num_samples += length
+        if not length:
+            continue
+        old_run = old_runs.get(delta_file.path)
+        if old_run is None or old_run[1] != length or delta_file.path in changed:
+            recompute.append((start, start + length))
+            continue
+        last = plan.carried[-1] if plan.carried else None
+        if (
+            last is not None
+            and last.old_start + last.length == old_run[0]
+            and last.new_start + last.length == start
+        ):
+            plan.carried[-1] = CarriedRun(
+                last.old_start, last.new_start, last.length + length
+            )
+        else:
+            plan.carried.append(CarriedRun(old_run[0], start, length))
+    plan.recompute = IndexRanges(recompute)
+    return plan
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+class IndexRanges:
+    """
+    A set of non-negative integers stored as sorted, disjoint runs.
+
+    Evaluated sample indices are mostly contiguous, so a split of millions of
+    samples typically collapses into a handful of `[start, end)` runs, which
+    makes membership tests, counting and finding the pending work cheap in both
+    memory and time compared to a Python set.
+    """
+
+    def __init__(self, ranges: Iterable[tuple[int, int]] = ()):
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        for start, end in sorted(ranges):
+            self._append(start, end)
+
+    def _append(self, start: int, end: int) -> None:
+        if start >= end:
+            return
+        if self._ends and start <= self._ends[-1]:
+            self._ends[-1] = max(self._ends[-1], end)
+        else:
+            self._starts.append(start)
+            self._ends.append(end)
+
+    @classmethod
+    def from_indices(cls, indices: Iterable[int]) -> IndexRanges:
+        """Build the runs of a collection of indices, in any order and with duplicates."""
+        ranges = cls()
+        for index in sorted(indices):
+            ranges._append(index, index + 1)
+        return ranges
+
+    def add(self, index: int) -> None:
+        """Add a single index, merging it with adjacent runs."""
+        position = bisect_right(self._starts, index) - 1
+        if position >= 0 and index < self._ends[position]:
+            return
+        joins_left = position >= 0 and self._ends[position] == index
+        joins_right = (
+            position + 1 < len(self._starts) and self._starts[position + 1] == index + 1
+        )
+        if joins_left and joins_right:
+            self._ends[position] = self._ends[position + 1]
+            del self._starts[position + 1]
+            del self._ends[position + 1]
+        elif joins_left:
+            self._ends[position] = index + 1
+        elif joins_right:
+            self._starts[position + 1] = index
+        else:
+            self._starts.insert(position + 1, index)
+            self._ends.insert(position + 1, index + 1)
+
+    def update(self, indices: Iterable[int]) -> None:
+        """Add several indices."""
+        indices = list(indices)
+        if len(indices) > len(self._starts):
+            # cheaper to merge everything in one sorted pass
+            merged = sorted(
+                [*zip(self._starts, self._ends, strict=True)]
+                + [(index, index + 1) for index in indices]
+            )
+            self._starts, self._ends = [], []
+            for start, end in merged:
+                self._append(start, end)
+        else:
+            for index in indices:
+                self.add(index)
+
+    def __contains__(self, index: int) -> bool:
+        position = bisect_right(self._starts, index) - 1
+        return position >= 0 and index < self._ends[position]
+
+    def __len__(self) -> int:
+        return sum(end - start for start, end in self.ranges())
+
+    def __iter__(self) -> Iterator[int]:
+        for start, end in self.ranges():
+            yield from range(start, end)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IndexRanges):
+            return NotImplemented
+        return self._starts == other._starts and self._ends == other._ends
+
+    def __repr__(self) -> str:
+        return f"IndexRanges({self.ranges()})"
+
+    def ranges(self) -> list[tuple[int, int]]:
+        """Return the runs as `[start, end)` tuples."""
+        return list(zip(self._starts, self._ends, strict=True))
+
+    def missing(self, start: int, stop: int) -> Iterator[tuple[int, int]]:
+        """
+        Yield the `[start, end)` runs of indices in `[start, stop)` that are not in the set.
+
+        Args:
+            start (int): First index of the interval.
+            stop (int): End of the interval, exclusive.
+        """
+        cursor = start
+        position = max(bisect_right(self._starts, start) - 1, 0)
+        for run_start, run_end in zip(
+            self._starts[position:], self._ends[position:], strict=True
+        ):
+            if run_start >= stop:
+                break
+            if run_start > cursor:
+                yield cursor, run_start
+            cursor = max(cursor, run_end)
+        if cursor < stop:
+            yield cursor, stop
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import copy
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from atria_hub import fast_json
+
+# parsed sidecars live outside the config directories, so they are never listed as configs
+SIDECAR_DIR = "_parsed"
+
+_COMMIT_ID = re.compile(r"[0-9a-f]{64}")
+
+_ITEMS = "__items__"
+_TUPLE = "__tuple__"
+
+
+def yaml_loads(data: bytes, unsafe: bool = False) -> Any:
+    """Parse YAML with the C loader of libyaml when PyYAML was built with it."""
+    import yaml
+
+    if unsafe:
+        loader = getattr(yaml, "CLoader", yaml.Loader)
+    else:
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(data, Loader=loader)  # unsafe load if asked for!!
+
+
+def is_commit_id(ref: str) -> bool:
+    """Whether a ref is a commit ID, whose objects never change, rather than a branch."""
+    return _COMMIT_ID.fullmatch(ref) is not None
+
+
+def sidecar_path(digest: str) -> str:
+    """Return the path of the parsed sidecar of the YAML with sha256 `digest`."""
+    return f"{SIDECAR_DIR}/{digest}.json"
+
+
+def sidecar_digest(path: str) -> str | None:
+    """Return the YAML digest of a sidecar path, or None for other objects."""
+    name = path.rsplit("/", 1)[-1]
+    if not name.endswith(".json"):
+        return None
+    return name.removesuffix(".json")
+
+
+def _encode(value: Any) -> Any:
+    # JSON loses tuples and non-string keys, e.g. the class ids of a label map
+    if isinstance(value, tuple):
+        return {_TUPLE: [_encode(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value) and not (
+            len(value) == 1 and (_ITEMS in value or _TUPLE in value)
+        ):
+            return {key: _encode(item) for key, item in value.items()}
+        return {_ITEMS: [[_encode(key), _encode(item)] for key, item in value.items()]}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if isinstance(value, dict):
+        if len(value) == 1 and _TUPLE in value:
+            return tuple(_decode(item) for item in value[_TUPLE])
+        if len(value) == 1 and _ITEMS in value:
+            return {_decode(key): _decode(item) for key, item in value[_ITEMS]}
+        return {key: _decode(item) for key, item in value.items()}
+    return value
+
+
+def encode_sidecar(value: Any) -> bytes | None:
+    """
+    Encode a parsed YAML value as its JSON sidecar.
+
+    Returns None if the value does not survive the round trip, e.g. because it
+    holds dates or Python objects, in which case readers parse the YAML.
+    """
+    try:
+        data = fast_json.dumps({"version": 1, "value": _encode(value)})
+    except (TypeError, ValueError):
+        return None
+    if decode_sidecar(data) != value:
+        return None
+    return data
+
+
+def decode_sidecar(data: bytes) -> Any:
+    """Decode a sidecar, or return None if it was written in another format."""
+    try:
+        raw = fast_json.loads(data)
+    except ValueError:
+        return None
+    if not isinstance(raw, dict) or raw.get("version") != 1:
+        return None
+    return _decode(raw["value"])
+
+
+class ParsedConfigCache:
+    """
+    An in-memory memo of parsed config files.
+
+    Files are memoized per repository commit, which never changes, and by the
+    sha256 of their content, so a file read again from a branch is not parsed
+    again. Entries are evicted when more than `max_entries` are held. Every
+    `get` returns a copy, so callers may modify the configs they load. The
+    sidecars listed per ref are kept too, for `ttl` seconds for branches.
+
+    Attributes:
+        max_entries (int): Number of parsed files kept.
+        ttl (float): Seconds the sidecars listed on a branch are trusted.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, Any] = OrderedDict()
+        self._sidecars: dict[tuple[str, str], tuple[float, set[str]]] = {}
+
+    def _get(self, key: tuple) -> Any:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def _put(self, key: tuple, value: Any) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, repo_id: str, commit_id: str, path: str) -> Any:
+        """Return a copy of the parsed file of a commit, or None if it is not cached."""
+        return self._get(("commit", repo_id, commit_id, path))
+
+    def put(self, repo_id: str, commit_id: str, path: str, value: Any) -> None:
+        self._put(("commit", repo_id, commit_id, path), value)
+
+    def get_content(self, digest: str, unsafe: bool) -> Any:
+        """Return a copy of the parsed YAML with sha256 `digest`, or None if it is not cached."""
+        return self._get(("content", digest, unsafe))
+
+    def put_content(self, digest: str, unsafe: bool, value: Any) -> None:
+        self._put(("content", digest, unsafe), value)
+
+    def sidecars(self, repo_id: str, ref: str) -> set[str] | None:
+        """Return the digests of the sidecars listed on a ref, or None if unknown or expired."""
+        with self._lock:
+            entry = self._sidecars.get((repo_id, ref))
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def put_sidecars(self, repo_id: str, ref: str, digests: set[str]) -> None:
+        expires = float("inf") if is_commit_id(ref) else time.monotonic() + self.ttl
+        with self._lock:
+            self._sidecars[(repo_id, ref)] = (expires, set(digests))
+
+    def add_sidecar(self, repo_id: str, ref: str, digest: str) -> None:
+        """Record a sidecar written to a branch by this process."""
+        with self._lock:
+            entry = self._sidecars.get((repo_id, ref))
+            if entry is not None:
+                entry[1].add(digest)
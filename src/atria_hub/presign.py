@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+from atria_hub.config import settings
+from atria_hub.governor import Priority
+from atria_hub.utilities import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    import httpx
+    from lakefs_sdk.models import ObjectStats
+
+    from atria_hub.client import AtriaHubClient
+
+logger = get_logger(__name__)
+
+_COMMIT_ID = re.compile(r"[0-9a-f]{64}")
+
+# lakeFS presigns for 15 minutes by default, assume less if it does not say
+_DEFAULT_EXPIRY_SECONDS = 300
+
+
+class PresignUnavailableError(Exception):
+    """Raised when an object cannot be moved with a presigned URL and the lakeFS API must be used."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class PresignedObject:
+    """
+    A presigned URL to read an object directly from the object store.
+
+    Attributes:
+        url (str): The presigned URL.
+        size (int): Size of the object in bytes.
+        checksum (str | None): Checksum of the object as reported by lakeFS.
+        valid_until (float): Time (`time.time()`) until which the URL may be used.
+    """
+
+    url: str
+    size: int
+    checksum: str | None
+    valid_until: float
+
+
+class PresignedUrlCache:
+    """
+    A thread-safe cache of presigned read URLs keyed by repository, ref and path.
+
+    URLs of commits are kept until shortly before they expire. URLs of branches
+    are also kept at most `settings.REF_CACHE_TTL_SECONDS`, since the object
+    behind a branch path can change, and are dropped when the hub writes to the
+    branch.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._urls: dict[tuple[str, str, str], PresignedObject] = {}
+
+    def get(self, repo_id: str, ref: str, path: str) -> PresignedObject | None:
+        with self._lock:
+            presigned = self._urls.get((repo_id, ref, path))
+            if presigned is None or presigned.valid_until < time.time():
+                return None
+            return presigned
+
+    def put(self, repo_id: str, ref: str, stats: ObjectStats) -> PresignedObject:
+        """Cache the presigned URL of an object listed or stat-ed with `presign=True`."""
+        now = time.time()
+        expiry = stats.physical_address_expiry or now + _DEFAULT_EXPIRY_SECONDS
+        valid_until = expiry - settings.PRESIGN_EXPIRY_MARGIN_SECONDS
+        if not _COMMIT_ID.fullmatch(ref):
+            valid_until = min(valid_until, now + settings.REF_CACHE_TTL_SECONDS)
+        presigned = PresignedObject(
+            url=stats.physical_address,
+            size=stats.size_bytes,
+            checksum=stats.checksum,
+            valid_until=valid_until,
+        )
+        with self._lock:
+            self._urls[(repo_id, ref, stats.path)] = presigned
+        return presigned
+
+    def invalidate(self, repo_id: str, ref: str, path: str | None = None) -> None:
+        """Drop the URLs of a ref, or of a single path of it."""
+        with self._lock:
+            for key in list(self._urls):
+                if key[:2] == (repo_id, ref) and (path is None or key[2] == path):
+                    del self._urls[key]
+
+
+class DirectTransport:
+    """
+    Moves object bytes directly between the client and the backing object store.
+
+    Reads resolve presigned URLs in batches, by listing the directory of the
+    requested object with `presign=True`, and cache them so that reading the
+    neighbouring objects (configs, metrics, shards) costs no further lakeFS
+    request. Writes upload to a presigned staging location and then link it to
+    the branch. All bytes go over one pooled HTTP client, and every transfer is
+    accounted to the object store host in the storage governor.
+
+    Methods raise `PresignUnavailableError` when the storage does not support
+    presigning, and `FileNotFoundError` when a listing shows that the object does
+    not exist; callers then fall back to the lakeFS API.
+    """
+
+    def __init__(self, client: AtriaHubClient):
+        self._client = client
+        self.urls = PresignedUrlCache()
+        self._supported: bool | None = None
+        self._http: httpx.Client | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def supported(self) -> bool:
+        """Whether the storage supports presigned URLs, asked once per client."""
+        if self._supported is None:
+            try:
+                config = self._client.lakefs_client.sdk_client.config_api.get_config()
+                self._supported = bool(config.storage_config.pre_sign_support)
+            except Exception as e:
+                logger.debug(f"Presigned transfers unavailable: {e}")
+                self._supported = False
+        return self._supported
+
+    @property
+    def http(self) -> httpx.Client:
+        with self._lock:
+            if self._http is None:
+                import httpx
+
+                self._http = httpx.Client(
+                    limits=httpx.Limits(
+                        max_keepalive_connections=settings.STORAGE_MAX_IN_FLIGHT_PER_HOST
+                    ),
+                    timeout=httpx.Timeout(300.0, connect=10.0),
+                )
+            return self._http
+
+    def _check_supported(self) -> None:
+        if not settings.STORAGE_DIRECT_TRANSFERS or not self.supported:
+            raise PresignUnavailableError("Presigned transfers are disabled.")
+
+    def _presign(self, repo_id: str, ref: str, path: str) -> PresignedObject:
+        """Return a presigned URL for an object, presigning its whole directory at once."""
+        presigned = self.urls.get(repo_id, ref, path)
+        if presigned is not None:
+            return presigned
+
+        objects_api = self._client.lakefs_client.sdk_client.objects_api
+        prefix = path.rsplit("/", 1)[0] + "/" if "/" in path else ""
+        listing = objects_api.list_objects(
+            repository=repo_id,
+            ref=ref,
+            prefix=prefix,
+            delimiter="/",
+            presign=True,
+            amount=settings.PRESIGN_BATCH_SIZE,
+        )
+        for stats in listing.results:
+            if stats.path_type == "object":
+                if not stats.physical_address.startswith(("http://", "https://")):
+                    self._supported = False
+                    raise PresignUnavailableError(
+                        "The storage returned no presigned URL."
+                    )
+                self.urls.put(repo_id, ref, stats)
+
+        presigned = self.urls.get(repo_id, ref, path)
+        if presigned is not None:
+            return presigned
+        if not listing.pagination.has_more:
+            raise FileNotFoundError(f"{repo_id}/{ref}/{path}")
+        # the directory is larger than a batch, presign the object alone
+        from lakefs_sdk.exceptions import NotFoundException
+
+        try:
+            stats = objects_api.stat_object(
+                repository=repo_id, ref=ref, path=path, presign=True
+            )
+        except NotFoundException:
+            raise FileNotFoundError(f"{repo_id}/{ref}/{path}")
+        return self.urls.put(repo_id, ref, stats)
+
+    @contextmanager
+    def _stream(
+        self,
+        repo_id: str,
+        ref: str,
+        path: str,
+        offset: int = 0,
+        length: int | None = None,
+    ) -> Iterator[httpx.Response]:
+        """Stream a GET of an object, presigning it again if its URL was rejected."""
+        headers = {}
+        ranged = bool(offset) or length is not None
+        if ranged:
+            end = "" if length is None else offset + length - 1
+            headers["Range"] = f"bytes={offset}-{end}"
+        for attempt in range(2):
+            presigned = self._presign(repo_id, ref, path)
+            with self.http.stream("GET", presigned.url, headers=headers) as response:
+                if response.status_code in (401, 403) and not attempt:
+                    # the URL expired or was revoked early
+                    self.urls.invalidate(repo_id, ref, path)
+                    continue
+                response.raise_for_status()
+                if ranged and response.status_code != 206:
+                    raise PresignUnavailableError(
+                        "The object store ignored the range request."
+                    )
+                yield response
+                return
+
+    def read(
+        self,
+        repo_id: str,
+        ref: str,
+        path: str,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> bytes:
+        """Read a whole object."""
+        self._check_supported()
+        presigned = self._presign(repo_id, ref, path)
+        governor = self._client.storage_governor
+        # reads charge the bytes as they arrive, not upfront
+        with governor.request(urlparse(presigned.url).netloc, priority=priority):
+            with self._stream(repo_id, ref, path) as response:
+                data = response.read()
+            governor.throttle(len(data), priority=priority)
+        return data
+
+    def read_range(
+        self,
+        repo_id: str,
+        ref: str,
+        path: str,
+        offset: int,
+        buffer: memoryview,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> None:
+        """Fill `buffer` with the bytes of an object starting at `offset`."""
+        self._check_supported()
+        presigned = self._presign(repo_id, ref, path)
+        governor = self._client.storage_governor
+        with governor.request(urlparse(presigned.url).netloc, priority=priority):
+            with self._stream(
+                repo_id, ref, path, offset=offset, length=len(buffer)
+            ) as response:
+                position = 0
+                for data in response.iter_bytes(1 << 20):
+                    buffer[position : position + len(data)] = data
+                    position += len(data)
+                    governor.throttle(len(data), priority=priority)
+            if position != len(buffer):
+                raise RuntimeError(
+                    f"Unexpected end of {path} at byte {offset + position}."
+                )
+
+    def download_file(
+        self,
+        repo_id: str,
+        ref: str,
+        path: str,
+        local_path: str | os.PathLike,
+        priority: Priority = Priority.BULK,
+    ) -> None:
+        """Stream an object to a local file."""
+        self._check_supported()
+        presigned = self._presign(repo_id, ref, path)
+        governor = self._client.storage_governor
+        with governor.request(urlparse(presigned.url).netloc, priority=priority):
+            with (
+                self._stream(repo_id, ref, path) as response,
+                open(local_path, "wb") as f,
+            ):
+                for data in response.iter_bytes(1 << 20):
+                    f.write(data)
+                    governor.throttle(len(data), priority=priority)
+
+    def write(
+        self,
+        repo_id: str,
+        branch: str,
+        path: str,
+        data: bytes | bytearray | memoryview | str | os.PathLike,
+        content_type: str | None = None,
+        priority: Priority = Priority.BULK,
+    ) -> ObjectStats:
+        """
+        Upload bytes, or the local file at `data` if it is a path, and link them to a branch.
+
+        Returns:
+            ObjectStats: The stats of the staged object.
+        """
+        from lakefs_sdk.models import StagingMetadata
+
+        self._check_supported()
+        staging_api = self._client.lakefs_client.sdk_client.staging_api
+        location = staging_api.get_physical_address(
+            repository=repo_id, branch=branch, path=path, presign=True
+        )
+        if not location.presigned_url:
+            self._supported = False
+            raise PresignUnavailableError("The storage returned no presigned URL.")
+
+        in_memory = isinstance(data, bytes | bytearray | memoryview)
+        size = len(data) if in_memory else os.path.getsize(data)
+        # Azure needs the blob type, the other object stores ignore it
+        headers = {"Content-Length": str(size), "x-ms-blob-type": "BlockBlob"}
+        if content_type is not None:
+            headers["Content-Type"] = content_type
+        # writes charge the bytes upfront, before they are sent
+        governor = self._client.storage_governor
+        with governor.request(
+            urlparse(location.presigned_url).netloc, priority=priority, nbytes=size
+        ):
+            if in_memory:
+                response = self.http.put(
+                    location.presigned_url, content=bytes(data), headers=headers
+                )
+            else:
+                with open(data, "rb") as f:
+                    response = self.http.put(
+                        location.presigned_url, content=f, headers=headers
+                    )
+            response.raise_for_status()
+
+        stats = staging_api.link_physical_address(
+            repository=repo_id,
+            branch=branch,
+            path=path,
+            staging_metadata=StagingMetadata(
+                staging=location,
+                checksum=response.headers.get("ETag", "").strip('"'),
+                size_bytes=size,
+                content_type=content_type,
+            ),
+        )
+        self.urls.invalidate(repo_id, branch, path)
+        return stats
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import threading
+import time
+
+
+class RefCache:
+    """
+    A short-lived cache of lakeFS branch resolutions.
+
+    Maps (repository, branch) to the branch's head commit and remembers
+    branches known to exist, so that repeated path and branch lookups do not
+    cost a round trip each. Entries expire after `ttl` seconds to pick up
+    commits made by other clients; commits made through the hub update the
+    cache explicitly.
+
+    Attributes:
+        ttl (float): Lifetime of an entry in seconds.
+    """
+
+    def __init__(self, ttl: float = 30.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._commits: dict[tuple[str, str], tuple[str, float]] = {}
+        self._branches: dict[tuple[str, str], float] = {}
+
+    def get_commit(self, repo_id: str, branch: str) -> str | None:
+        """Return the cached head commit of a branch, if still valid."""
+        with self._lock:
+            entry = self._commits.get((repo_id, branch))
+            if entry is None or entry[1] < time.monotonic():
+                return None
+            return entry[0]
+
+    def set_commit(self, repo_id: str, branch: str, commit_id: str) -> None:
+        """Record the head commit of a branch, which also proves it exists."""
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._commits[(repo_id, branch)] = (commit_id, expires_at)
+            self._branches[(repo_id, branch)] = expires_at
+
+    def has_branch(self, repo_id: str, branch: str) -> bool:
+        """Return whether the branch is known to exist."""
+        with self._lock:
+            expires_at = self._branches.get((repo_id, branch))
+            return expires_at is not None and expires_at >= time.monotonic()
+
+    def add_branch(self, repo_id: str, branch: str) -> None:
+        """Record that a branch exists."""
+        with self._lock:
+            self._branches[(repo_id, branch)] = time.monotonic() + self.ttl
+
+    def invalidate(self, repo_id: str, branch: str | None = None) -> None:
+        """Drop the entries of a branch, or of all branches of a repository."""
+        with self._lock:
+            for entries in (self._commits, self._branches):
+                for key in list(entries):
+                    if key[0] == repo_id and (branch is None or key[1] == branch):
+                        del entries[key]
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import heapq
+import random
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+@dataclass(frozen=True)
+class ShardUnit:
+    """
+    The smallest unit of work that is assigned to a rank.
+
+    Attributes:
+        path (str): Path of the data file relative to the table root.
+        size (int): Size of the unit in bytes.
+        row_group (int | None): Index of the parquet row group inside the file, or
+            None if the whole file is a single unit.
+        num_rows (int | None): Number of rows in the unit, if known.
+    """
+
+    path: str
+    size: int
+    row_group: int | None = None
+    num_rows: int | None = None
+
+
+@dataclass
+class SplitShard:
+    """
+    The portion of a dataset split that is read by a single rank.
+
+    The shard is pinned to a commit so that every rank sees the same set of
+    files. `position` counts the units of `units` that have already been
+    consumed and is what gets checkpointed to resume reading.
+
+    Attributes:
+        table_path (str): Filesystem path of the Delta table root, pinned to a commit.
+        commit_id (str): The commit the shard was computed against.
+        rank (int): Rank of the process reading the shard.
+        world_size (int): Total number of ranks.
+        epoch (int): Epoch the assignment was shuffled for.
+        seed (int): Seed the assignment was shuffled with.
+        units (list[ShardUnit]): The units assigned to this rank in reading order.
+        position (int): Number of units already consumed.
+    """
+
+    table_path: str
+    commit_id: str
+    rank: int
+    world_size: int
+    epoch: int
+    seed: int
+    units: list[ShardUnit] = field(default_factory=list)
+    position: int = 0
+
+    @property
+    def total_bytes(self) -> int:
+        """Return the total number of bytes assigned to this rank."""
+        return sum(unit.size for unit in self.units)
+
+    def remaining_units(self) -> list[ShardUnit]:
+        """Return the units that have not been consumed yet."""
+        return self.units[self.position :]
+
+    def advance(self, count: int = 1) -> None:
+        """Mark the next `count` units as consumed."""
+        self.position = min(self.position + count, len(self.units))
+
+    def state_dict(self) -> dict:
+        """Return the state required to resume reading this shard."""
+        return {
+            "commit_id": self.commit_id,
+            "rank": self.rank,
+            "world_size": self.world_size,
+            "epoch": self.epoch,
+            "seed": self.seed,
+            "position": self.position,
+        }
+
+    def load_state_dict(self, state: dict) -> None:
+        """
+        Restore the read position from a state returned by `state_dict`.
+
+        Raises:
+            ValueError: If the state was saved for a different assignment.
+        """
+        for key in ("commit_id", "rank", "world_size", "epoch", "seed"):
+            if state[key] != getattr(self, key):
+                raise ValueError(
+                    f"Cannot resume shard: saved {key}={state[key]!r} does not match "
+                    f"current {key}={getattr(self, key)!r}."
+                )
+        self.position = min(int(state["position"]), len(self.units))
+
+
+def assign_units_to_ranks(
+    units: Sequence[ShardUnit], world_size: int, epoch: int = 0, seed: int = 0
+) -> list[list[ShardUnit]]:
+    """
+    Deterministically assign units to ranks with balanced byte counts.
+
+    Units are shuffled with a generator seeded from `seed` and `epoch`, then
+    placed largest first on the rank with the fewest bytes so far. The result
+    only depends on the arguments, so every rank computes the same assignment
+    without communicating.
+
+    Args:
+        units (Sequence[ShardUnit]): The units to assign.
+        world_size (int): Number of ranks.
+        epoch (int): The epoch, used to reshuffle the assignment every epoch.
+        seed (int): The base seed of the shuffle.
+
+    Returns:
+        list[list[ShardUnit]]: The units of each rank, in reading order.
+
+    Raises:
+        ValueError: If `world_size` is not positive.
+    """
+    if world_size < 1:
+        raise ValueError(f"world_size must be positive, got {world_size}.")
+
+    rng = random.Random(seed * 1_000_003 + epoch)
+    order = sorted(units, key=lambda unit: (unit.path, unit.row_group or 0))
+    rng.shuffle(order)
+
+    # the sort is stable so units of equal size keep their shuffled order
+    by_size = sorted(range(len(order)), key=lambda i: order[i].size, reverse=True)
+    owner = [0] * len(order)
+    loads = [(0, rank) for rank in range(world_size)]
+    for i in by_size:
+        load, rank = heapq.heappop(loads)
+        owner[i] = rank
+        heapq.heappush(loads, (load + order[i].size, rank))
+
+    assignment: list[list[ShardUnit]] = [[] for _ in range(world_size)]
+    for i, unit in enumerate(order):
+        assignment[owner[i]].append(unit)
+    return assignment
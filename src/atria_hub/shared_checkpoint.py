@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import hashlib
+import itertools
+import mmap
+import os
+import threading
+import weakref
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from atria_hub.config import settings
+from atria_hub.utilities import file_lock, get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = get_logger(__name__)
+
+# numbers the handles of this process, so that each has its own user file
+_handle_ids = itertools.count()
+
+
+def _default_root() -> Path:
+    # tmpfs keeps the checkpoint in memory, fall back to the cache dir elsewhere
+    if Path("/dev/shm").is_dir():
+        return Path("/dev/shm") / f"atria_hub-{os.getuid()}"
+    return Path(settings.CACHE_DIR) / "shared_checkpoints"
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SharedCheckpoint:
+    """
+    A checkpoint mapped read-only from a file shared by every process on the host.
+
+    Each handle registers itself with a user file named `<pid>.<n>` next to
+    the checkpoint, so a process may hold several handles and closing one
+    leaves the others valid. When the last handle is closed the checkpoint
+    file is removed; users that died without closing are detected by their
+    PID and do not keep it alive.
+
+    Attributes:
+        path (Path): The shared checkpoint file.
+        buffer (memoryview): The read-only, zero-copy view of the checkpoint.
+    """
+
+    def __init__(self, path: Path, user: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self._mmap)
+        self._finalizer = weakref.finalize(
+            self, _release, user, path, self._mmap, self.buffer
+        )
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def __enter__(self) -> SharedCheckpoint:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the checkpoint and remove it if no other process uses it."""
+        self._finalizer()
+
+
+def _users_dir(path: Path) -> Path:
+    return path.with_name(f"{path.name}.users")
+
+
+def _lock_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.lock")
+
+
+def _release(user: Path, path: Path, mapping: mmap.mmap, buffer: memoryview):
+    try:
+        buffer.release()
+        mapping.close()
+    except BufferError:
+        # views of the buffer are still in use, the mapping is released with them
+        pass
+    with file_lock(_lock_path(path)):
+        user.unlink(missing_ok=True)
+        _remove_if_unused(user.parent, path)
+
+
+def _user_pid(user: Path) -> int | None:
+    pid = user.name.split(".", 1)[0]
+    return int(pid) if pid.isdigit() else None
+
+
+def _remove_if_unused(users_dir: Path, path: Path) -> bool:
+    """Remove a shared checkpoint if all of its users are gone. Call with the lock held."""
+    users = list(users_dir.iterdir()) if users_dir.exists() else []
+    alive = False
+    for user in users:
+        pid = _user_pid(user)
+        if pid is not None and _is_alive(pid):
+            alive = True
+        else:
+            user.unlink(missing_ok=True)
+    if alive:
+        return False
+    path.unlink(missing_ok=True)
+    if users_dir.exists():
+        users_dir.rmdir()
+    logger.debug(f"Removed the unused shared checkpoint {path}")
+    return True
+
+
+class SharedCheckpointStore:
+    """
+    Places checkpoints in host-wide shared files, one per checkpoint version.
+
+    The first process that asks for a checkpoint downloads it while holding a
+    file lock; the others wait for it and then map the same file, so the host
+    holds a single copy in memory regardless of the number of workers.
+    Checkpoints left behind by processes that all died without closing them
+    are swept when the store is first used.
+
+    Attributes:
+        root (Path): Directory of the shared checkpoints, on tmpfs when available.
+    """
+
+    def __init__(self, root: str | Path | None = None):
+        self.root = Path(root) if root is not None else _default_root()
+        self._lock = threading.Lock()
+        self._swept = False
+
+    def path(self, key: str) -> Path:
+        return self.root / hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def sweep(self) -> int:
+        """
+        Remove the shared checkpoints whose users all exited without closing them.
+
+        Checkpoints whose lock is held, e.g. while another process loads them,
+        are skipped.
+
+        Returns:
+            int: Number of checkpoints removed.
+        """
+        if not self.root.is_dir():
+            return 0
+        removed = 0
+        for entry in self.root.iterdir():
+            name = entry.name
+            if name.endswith(".tmp"):
+                # left by a process that died while writing a checkpoint
+                pid = name.rsplit(".", 2)[-2]
+                if pid.isdigit() and not _is_alive(int(pid)):
+                    entry.unlink(missing_ok=True)
+                continue
+            if "." in name:
+                continue
+            try:
+                with file_lock(_lock_path(entry), blocking=False):
+                    removed += _remove_if_unused(_users_dir(entry), entry)
+            except BlockingIOError:
+                continue
+        return removed
+
+    def open(self, key: str, load: Callable[[], bytes]) -> SharedCheckpoint:
+        """
+        Attach to the shared checkpoint of `key`, loading it with `load` if no process did yet.
+
+        Args:
+            key (str): Identity of the checkpoint version, e.g. repository, commit
+                and config.
+            load (Callable[[], bytes]): Returns the checkpoint bytes. Only called by
+                the process that creates the shared file.
+
+        Returns:
+            SharedCheckpoint: The mapped checkpoint, to be closed when done.
+        """
+        path = self.path(key)
+        users_dir = _users_dir(path)
+        self.root.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not self._swept:
+            self._swept = True
+            self.sweep()
+        with self._lock, file_lock(_lock_path(path)):
+            if not path.exists():
+                _remove_if_unused(users_dir, path)
+                data = load()
+                tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+                logger.info(f"Shared a {len(data)} byte checkpoint at {path}")
+            users_dir.mkdir(exist_ok=True)
+            user = users_dir / f"{os.getpid()}.{next(_handle_ids)}"
+            user.touch()
+            try:
+                return SharedCheckpoint(path, user)
+            except BaseException:
+                user.unlink(missing_ok=True)
+                raise
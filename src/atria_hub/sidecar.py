@@ -0,0 +1,551 @@
+"""
+A per-host sidecar process that serves one `AtriaHub` to many local processes.
+
+Every process that constructs an `AtriaHub` pays for its own auth session,
+keyring reads, lakeFS clients and connection pools, and starts with empty
+caches. The sidecar owns a single hub instead and the other processes call
+it over a UNIX domain socket through `SidecarHub`, which mirrors the API of
+`AtriaHub` (`hub.datasets.download_files(...)`, `hub.models.load_checkpoint(...)`,
+...). Large byte strings in arguments and results are passed through shared
+memory rather than the socket, and generators are streamed item by item.
+
+Local paths in arguments are resolved against the working directory of the
+calling process before they are sent. APIs returning objects bound to the
+hub, e.g. `read_metadata` handles, `spooled_writer` and `eval_output_session`,
+are rejected; use an `AtriaHub` in the calling process for them.
+
+Usage:
+    python -m atria_hub.sidecar [--socket PATH]
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+import types
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from atria_hub.config import settings
+from atria_hub.utilities import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+logger = get_logger(__name__)
+
+_HEADER = struct.Struct("!Q")
+
+# APIs whose results hold the hub's clients, threads or locks
+_HUB_BOUND_RESULTS = frozenset(
+    {"read_metadata", "spooled_writer", "eval_output_session"}
+)
+
+# arguments naming local files, by API; "pairs" are lists of (local path, target path)
+_LOCAL_PATH_ARGUMENTS: dict[tuple[str, ...], dict[str, str]] = {
+    ("datasets", "upload_files"): {"dataset_files": "pairs"},
+    ("datasets", "upload_and_commit"): {"dataset_files": "pairs"},
+    ("datasets", "download_files"): {"destination_path": "path"},
+    ("datasets", "materialize_split"): {"destination_path": "path"},
+    ("datasets", "download_shard"): {"destination_path": "path"},
+}
+
+
+def default_socket_path(base_url: str = settings.ATRIAX_URL) -> Path:
+    """Return the socket of the sidecar serving a hub URL for the current user."""
+    import hashlib
+
+    digest = hashlib.sha256(base_url.encode("utf-8")).hexdigest()[:12]
+    return Path(settings.CACHE_DIR) / f"sidecar-{digest}.sock"
+
+
+@dataclass(frozen=True)
+class _SharedBlob:
+    """A byte string moved through a shared memory segment owned by the receiver."""
+
+    name: str
+    size: int
+
+
+def _pack(value: Any, segments: list[str]) -> Any:
+    """
+    Move large byte strings nested in lists, tuples and dicts to shared memory.
+
+    The names of the created segments are appended to `segments`. The receiver
+    unlinks them once copied, and the sender releases any left over once the
+    receiver answered or the connection failed.
+    """
+    if isinstance(value, bytes | bytearray | memoryview):
+        if len(value) < settings.SIDECAR_SHM_MIN_BYTES:
+            return value
+        from multiprocessing import resource_tracker, shared_memory
+
+        segment = shared_memory.SharedMemory(create=True, size=len(value))
+        # the receiver unlinks the segment, do not let our tracker remove it
+        resource_tracker.unregister(segment._name, "shared_memory")
+        segments.append(segment.name)
+        segment.buf[: len(value)] = value
+        blob = _SharedBlob(segment.name, len(value))
+        segment.close()
+        return blob
+    if isinstance(value, list | tuple):
+        return type(value)(_pack(item, segments) for item in value)
+    if isinstance(value, dict):
+        return {key: _pack(item, segments) for key, item in value.items()}
+    return value
+
+
+def _release(segments: list[str]) -> None:
+    """Unlink the segments of sent messages that the receiver did not unlink."""
+    from multiprocessing import shared_memory
+
+    for name in segments:
+        try:
+            segment = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            continue
+        segment.close()
+        segment.unlink()
+    segments.clear()
+
+
+def _unpack(value: Any) -> Any:
+    """Copy shared memory blobs back into bytes and release their segments."""
+    if isinstance(value, _SharedBlob):
+        from multiprocessing import shared_memory
+
+        segment = shared_memory.SharedMemory(name=value.name)
+        try:
+            return bytes(segment.buf[: value.size])
+        finally:
+            segment.close()
+            segment.unlink()
+    if isinstance(value, list | tuple):
+        return type(value)(_unpack(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _unpack(item) for key, item in value.items()}
+    return value
+
+
+def _send(sock: socket.socket, message: Any) -> list[str]:
+    """Send a message and return the shared memory segments it references."""
+    segments: list[str] = []
+    try:
+        data = pickle.dumps(_pack(message, segments), protocol=pickle.HIGHEST_PROTOCOL)
+        sock.sendall(_HEADER.pack(len(data)) + data)
+    except BaseException:
+        _release(segments)
+        raise
+    return segments
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    position = 0
+    while position < size:
+        received = sock.recv_into(view[position:])
+        if not received:
+            raise ConnectionError("The sidecar connection was closed.")
+        position += received
+    return bytes(buffer)
+
+
+def _recv(sock: socket.socket) -> Any:
+    (size,) = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    return _unpack(pickle.loads(_recv_exactly(sock, size)))
+
+
+def _absolute(path: Any) -> Any:
+    if isinstance(path, str):
+        return os.path.abspath(path)
+    if isinstance(path, os.PathLike):
+        return type(path)(os.path.abspath(path))
+    return path
+
+
+def _resolve_local_paths(path: tuple[str, ...], args: tuple, kwargs: dict):
+    """Resolve the local path arguments of an API call against the working directory."""
+    import inspect
+
+    # path objects are always local paths, strings only where listed
+    args = tuple(
+        _absolute(value) if isinstance(value, os.PathLike) else value for value in args
+    )
+    kwargs = {
+        name: _absolute(value) if isinstance(value, os.PathLike) else value
+        for name, value in kwargs.items()
+    }
+    arguments = _LOCAL_PATH_ARGUMENTS.get(path)
+    if arguments is None:
+        return args, kwargs
+    import importlib
+
+    module = importlib.import_module(f"atria_hub.api.{path[0]}")
+    method = getattr(getattr(module, f"{path[0].capitalize()}Api"), path[-1])
+    bound = inspect.signature(method).bind(None, *args, **kwargs)
+    for name, kind in arguments.items():
+        if name not in bound.arguments:
+            continue
+        value = bound.arguments[name]
+        if kind == "pairs":
+            bound.arguments[name] = [
+                (_absolute(local), target) for local, target in value
+            ]
+        else:
+            bound.arguments[name] = _absolute(value)
+    return bound.args[1:], bound.kwargs
+
+
+def _portable_error(error: Exception) -> Exception:
+    """Return the error if it survives pickling, otherwise a RuntimeError with its message."""
+    try:
+        pickle.loads(pickle.dumps(error))
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+    return error
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    server: SidecarServer
+
+    def handle(self) -> None:
+        self.server.connection_opened()
+        # segments of sent replies, unlinked once the client sent its next request
+        pending: list[str] = []
+        try:
+            while True:
+                try:
+                    path, args, kwargs = _recv(self.request)
+                except (ConnectionError, OSError):
+                    return
+                finally:
+                    _release(pending)
+                try:
+                    result = self.server.call(path, args, kwargs)
+                except Exception as e:
+                    self._reply(path, ("error", _portable_error(e)), pending)
+                    continue
+                if isinstance(result, types.GeneratorType):
+                    self._stream(path, result, pending)
+                else:
+                    self._reply(path, ("ok", result), pending)
+        except OSError:
+            # the client went away
+            return
+        finally:
+            _release(pending)
+            self.server.connection_closed()
+
+    def _reply(self, path: tuple[str, ...], message: tuple, pending: list[str]) -> bool:
+        """Send a message, or an error if it cannot be pickled; return whether it was sent."""
+        try:
+            pending += _send(self.request, message)
+            return True
+        except OSError:
+            raise
+        except Exception as e:
+            pending += _send(
+                self.request,
+                (
+                    "error",
+                    RuntimeError(
+                        f"The result of {'.'.join(path)} cannot be sent by the sidecar: {e}"
+                    ),
+                ),
+            )
+            return False
+
+    def _stream(
+        self, path: tuple[str, ...], result: types.GeneratorType, pending: list[str]
+    ) -> None:
+        """Send the items of a generator as it produces them, ending with "end" or "error"."""
+        try:
+            pending += _send(self.request, ("stream", None))
+            while True:
+                try:
+                    item = next(result)
+                except StopIteration:
+                    break
+                except Exception as e:
+                    self._reply(path, ("error", _portable_error(e)), pending)
+                    return
+                if not self._reply(path, ("item", item), pending):
+                    return
+            pending += _send(self.request, ("end", None))
+        finally:
+            result.close()
+
+
+class SidecarServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serves the API of one `AtriaHub` over a UNIX domain socket.
+
+    Requests name a public attribute path of the hub, e.g.
+    `("datasets", "download_files")`, and are executed on a thread per
+    connection, so all clients share the hub's session, connection pools and
+    caches. Generators are streamed to the client as they produce items, so
+    the client consuming them slowly holds the generator back. The socket is
+    only accessible to the user running the sidecar.
+    The server stops once it had no connection for `idle_timeout` seconds.
+
+    Attributes:
+        hub (AtriaHub): The served hub.
+        socket_path (Path): The socket the server listens on.
+        idle_timeout (float | None): Seconds without connections after which the
+            server stops, or None to run until stopped.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, hub, socket_path: str | Path, idle_timeout: float | None = None):
+        self.hub = hub
+        self.socket_path = Path(socket_path)
+        self.idle_timeout = idle_timeout
+        self._connections = 0
+        self._last_active = time.monotonic()
+        self._lock = threading.Lock()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+        umask = os.umask(0o177)
+        try:
+            super().__init__(str(self.socket_path), _RequestHandler)
+        finally:
+            os.umask(umask)
+
+    def call(self, path: tuple[str, ...], args: tuple, kwargs: dict) -> Any:
+        if not path or any(name.startswith("_") for name in path):
+            raise AttributeError(f"{'.'.join(path)} is not a public hub API.")
+        if path[-1] in _HUB_BOUND_RESULTS:
+            raise TypeError(
+                f"{'.'.join(path)} returns objects bound to the hub, which cannot "
+                "be sent by the sidecar; call it on an AtriaHub in your process."
+            )
+        target = self.hub
+        for name in path:
+            target = getattr(target, name)
+        return target(*args, **kwargs)
+
+    def connection_opened(self) -> None:
+        with self._lock:
+            self._connections += 1
+
+    def connection_closed(self) -> None:
+        with self._lock:
+            self._connections -= 1
+            self._last_active = time.monotonic()
+
+    def _watch_idle(self) -> None:
+        while True:
+            time.sleep(min(self.idle_timeout, 10.0))
+            with self._lock:
+                idle = not self._connections and (
+                    time.monotonic() - self._last_active > self.idle_timeout
+                )
+            if idle:
+                logger.info(f"Sidecar at {self.socket_path} is idle, stopping")
+                self.shutdown()
+                return
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        if self.idle_timeout is not None:
+            threading.Thread(target=self._watch_idle, daemon=True).start()
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            self.socket_path.unlink(missing_ok=True)
+
+
+class _RemoteAttribute:
+    """An attribute path of the hub served by the sidecar, called remotely."""
+
+    def __init__(self, hub: SidecarHub, path: tuple[str, ...]):
+        self._hub = hub
+        self._path = path
+
+    def __getattr__(self, name: str) -> _RemoteAttribute:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _RemoteAttribute(self._hub, (*self._path, name))
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._hub._call(self._path, args, kwargs)
+
+    def __repr__(self) -> str:
+        return f"<sidecar {'.'.join(self._path)}>"
+
+
+class SidecarHub:
+    """
+    A thin `AtriaHub` that forwards every API call to the local sidecar.
+
+    Attribute access mirrors `AtriaHub`, so `hub.datasets.get(id)` calls
+    `DatasetsApi.get` in the sidecar. Arguments and results are pickled, and
+    byte strings larger than `settings.SIDECAR_SHM_MIN_BYTES` go through shared
+    memory. Every thread uses its own connection. A call returning a generator
+    returns an iterator reading the items from a connection of its own, which
+    is closed when the iterator is exhausted or closed.
+
+    Attributes:
+        socket_path (Path): The socket of the sidecar.
+    """
+
+    def __init__(self, socket_path: str | Path):
+        self.socket_path = Path(socket_path)
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "socket", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(str(self.socket_path))
+            self._local.socket = sock
+        return sock
+
+    def _call(self, path: tuple[str, ...], args: tuple, kwargs: dict) -> Any:
+        args, kwargs = _resolve_local_paths(path, args, kwargs)
+        sock = self._connection()
+        segments: list[str] = []
+        try:
+            segments = _send(sock, (path, args, kwargs))
+            status, value = _recv(sock)
+        except (ConnectionError, OSError):
+            sock.close()
+            self._local.socket = None
+            raise
+        finally:
+            _release(segments)
+        if status == "error":
+            raise value
+        if status == "stream":
+            # the stream keeps the connection, later calls open a new one
+            self._local.socket = None
+            return self._iterate(sock)
+        return value
+
+    @staticmethod
+    def _iterate(sock: socket.socket) -> Iterator[Any]:
+        try:
+            while True:
+                status, value = _recv(sock)
+                if status == "end":
+                    return
+                if status == "error":
+                    raise value
+                yield value
+        finally:
+            sock.close()
+
+    def __getattr__(self, name: str) -> _RemoteAttribute:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _RemoteAttribute(self, (name,))
+
+    def close(self) -> None:
+        """Close the connection of the calling thread."""
+        sock = getattr(self._local, "socket", None)
+        if sock is not None:
+            sock.close()
+            self._local.socket = None
+
+
+def _is_serving(socket_path: Path) -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+
+
+def connect(
+    socket_path: str | Path | None = None,
+    base_url: str = settings.ATRIAX_URL,
+    storage_url: str = settings.ATRIAX_STORAGE_URL,
+    spawn: bool = True,
+    timeout: float = 60.0,
+) -> SidecarHub:
+    """
+    Connect to the sidecar of this host, starting it if it is not running.
+
+    Args:
+        socket_path (str | Path | None): The socket of the sidecar. Defaults to
+            one per user and hub URL under `settings.CACHE_DIR`.
+        base_url (str): The hub URL served by a spawned sidecar.
+        storage_url (str): The storage URL served by a spawned sidecar.
+        spawn (bool): Start the sidecar if it is not running.
+        timeout (float): Seconds to wait for a spawned sidecar to listen.
+
+    Returns:
+        SidecarHub: The client of the sidecar.
+    """
+    import subprocess
+
+    from atria_hub.utilities import file_lock
+
+    socket_path = Path(socket_path or default_socket_path(base_url))
+    if not _is_serving(socket_path):
+        if not spawn:
+            raise ConnectionError(f"No sidecar is listening on {socket_path}.")
+        # the first process spawns the sidecar, the others wait for it
+        with file_lock(socket_path.with_suffix(".lock")):
+            if not _is_serving(socket_path):
+                logger.info(f"Starting the atria_hub sidecar on {socket_path}")
+                subprocess.Popen(
+                    [
+                        sys.executable,
+                        "-m",
+                        "atria_hub.sidecar",
+                        "--socket",
+                        str(socket_path),
+                        "--base-url",
+                        base_url,
+                        "--storage-url",
+                        storage_url,
+                    ],
+                    stdin=subprocess.DEVNULL,
+                    start_new_session=True,
+                )
+                deadline = time.monotonic() + timeout
+                while not _is_serving(socket_path):
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(
+                            f"The sidecar did not start on {socket_path} within {timeout}s."
+                        )
+                    time.sleep(0.1)
+    return SidecarHub(socket_path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    from atria_hub.hub import AtriaHub
+
+    parser = argparse.ArgumentParser(
+        description="Serve an AtriaHub to local processes."
+    )
+    parser.add_argument("--socket", type=Path, default=None)
+    parser.add_argument("--base-url", default=settings.ATRIAX_URL)
+    parser.add_argument("--storage-url", default=settings.ATRIAX_STORAGE_URL)
+    args = parser.parse_args(argv)
+
+    hub = AtriaHub(base_url=args.base_url, storage_url=args.storage_url).initialize()
+    server = SidecarServer(
+        hub,
+        args.socket or default_socket_path(args.base_url),
+        idle_timeout=settings.SIDECAR_IDLE_TIMEOUT_SECONDS,
+    )
+    logger.info(f"Sidecar serving {args.base_url} on {server.socket_path}")
+    server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
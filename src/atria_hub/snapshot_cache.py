@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from atria_hub.config import settings
+
+if TYPE_CHECKING:
+    from atriax_client.models.config_base import ConfigBase
+
+
+def config_digest(config: ConfigBase) -> str:
+    """Return the sha256 of the canonical JSON encoding of a config."""
+    return hashlib.sha256(
+        json.dumps(
+            config.to_dict(), sort_keys=True, separators=(",", ":"), default=str
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+class ConfigSnapshotCache:
+    """
+    A persistent mapping of config digests to the IDs of their hub snapshots.
+
+    Snapshots are immutable, so a config registered once can be referenced by
+    its ID by every later write, in this and any later process. Lookups are
+    served from memory and fall back to a SQLite database; entries are scoped
+    by hub URL.
+
+    Attributes:
+        path (Path): Location of the cache database.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = Path(path or Path(settings.CACHE_DIR) / "config_snapshots.sqlite")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._snapshot_ids: dict[tuple[str, str], uuid.UUID] = {}
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, timeout=60
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS config_snapshots (
+                hub_url TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                snapshot_id TEXT NOT NULL,
+                PRIMARY KEY (hub_url, digest)
+            )
+            """
+        )
+        self._connection.commit()
+
+    def get(self, hub_url: str, digest: str) -> uuid.UUID | None:
+        """Return the snapshot ID of a config digest, if it was registered."""
+        with self._lock:
+            snapshot_id = self._snapshot_ids.get((hub_url, digest))
+            if snapshot_id is None:
+                row = self._connection.execute(
+                    "SELECT snapshot_id FROM config_snapshots WHERE hub_url = ? AND digest = ?",
+                    (hub_url, digest),
+                ).fetchone()
+                if row is not None:
+                    snapshot_id = uuid.UUID(row[0])
+                    self._snapshot_ids[(hub_url, digest)] = snapshot_id
+            return snapshot_id
+
+    def put(self, hub_url: str, digest: str, snapshot_id: uuid.UUID) -> None:
+        """Record the snapshot of a config digest."""
+        with self._lock:
+            self._snapshot_ids[(hub_url, digest)] = snapshot_id
+            self._connection.execute(
+                "INSERT OR REPLACE INTO config_snapshots (hub_url, digest, snapshot_id) VALUES (?, ?, ?)",
+                (hub_url, digest, str(snapshot_id)),
+            )
+            self._connection.commit()
+
+    def discard(self, hub_url: str, snapshot_id: uuid.UUID) -> None:
+        """Forget a snapshot, e.g. after deleting it."""
+        with self._lock:
+            for key in [
+                key
+                for key, value in self._snapshot_ids.items()
+                if key[0] == hub_url and value == snapshot_id
+            ]:
+                del self._snapshot_ids[key]
+            self._connection.execute(
+                "DELETE FROM config_snapshots WHERE hub_url = ? AND snapshot_id = ?",
+                (hub_url, str(snapshot_id)),
+            )
+            self._connection.commit()
@@ -0,0 +1,457 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from atria_hub.config import settings
+from atria_hub.utilities import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from uuid import UUID
+
+    from atriax_client.models.config_base import ConfigBase
+
+    from atria_hub.api.evaluations import EvaluationsApi
+
+logger = get_logger(__name__)
+
+SAMPLE_EVALUATION = "sample_evaluation"
+METRIC = "metric"
+SAMPLE_EXPLANATION = "sample_explanation"
+
+
+@dataclass(frozen=True)
+class SpoolRecord:
+    """
+    A result waiting in the spool to be uploaded.
+
+    Attributes:
+        id (int): Row id, increasing in write order.
+        kind (str): One of `sample_evaluation`, `metric` or `sample_explanation`.
+        experiment_id (str): The evaluation experiment the result belongs to.
+        key (str): Idempotency key of the result inside the experiment, e.g. the
+            sample index. A newer write with the same key replaces the older one.
+        data (Any): The JSON-decoded result.
+        payload (bytes | None): Binary payload of a sample explanation.
+        attempts (int): Number of failed upload attempts.
+        version (int): Number of times the result was replaced.
+    """
+
+    id: int
+    kind: str
+    experiment_id: str
+    key: str
+    data: Any
+    payload: bytes | None
+    attempts: int
+    version: int = 0
+
+
+_RECORD_COLUMNS = "id, kind, experiment_id, key, data, payload, attempts, version"
+
+
+def _record(row: tuple) -> SpoolRecord:
+    return SpoolRecord(row[0], row[1], row[2], row[3], json.loads(row[4]), *row[5:])
+
+
+def default_spool_path(base_url: str = settings.ATRIAX_URL) -> Path:
+    """Return the spool of a hub URL, so that writers never upload results to another hub."""
+    import hashlib
+
+    digest = hashlib.sha256(base_url.encode("utf-8")).hexdigest()[:12]
+    return Path(settings.CACHE_DIR) / f"evaluation_spool-{digest}.sqlite"
+
+
+class EvaluationSpool:
+    """
+    A durable, multi-process queue of evaluation results stored in SQLite.
+
+    Writers append with local-disk latency. Uploaders claim batches with a
+    lease, so several processes can drain the same spool without uploading a
+    batch twice, and batches of an uploader that died are picked up again once
+    their lease expires. Results that the server rejects are kept as failed
+    rows instead of being dropped. A result written again while an older
+    version of it is being uploaded waits for that upload, so the older
+    version never reaches the server after the newer one.
+
+    A spool holds the results of one hub; the default path is derived from
+    the hub URL.
+
+    Attributes:
+        path (Path): Location of the spool database.
+    """
+
+    def __init__(self, path: str | None = None, base_url: str = settings.ATRIAX_URL):
+        self.path = Path(path or default_spool_path(base_url))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, timeout=60, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS records (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                experiment_id TEXT NOT NULL,
+                key TEXT NOT NULL,
+                data TEXT NOT NULL,
+                payload BLOB,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                version INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL DEFAULT 0,
+                UNIQUE (kind, experiment_id, key)
+            )
+            """
+        )
+
+    def put(
+        self,
+        kind: str,
+        experiment_id: UUID | str,
+        items: list[tuple[str, Any, bytes | None]],
+    ) -> None:
+        """
+        Append results as (key, data, payload) tuples, replacing pending results with the same key.
+
+        A replaced result keeps its lease, so it is only uploaded again once the
+        upload of the version it replaces has finished.
+        """
+        rows = [
+            (kind, str(experiment_id), key, json.dumps(data), payload)
+            for key, data, payload in items
+        ]
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.executemany(
+                    "INSERT INTO records (kind, experiment_id, key, data, payload) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (kind, experiment_id, key) DO UPDATE SET data = excluded.data, "
+                    "payload = excluded.payload, version = version + 1, attempts = 0, "
+                    "available_at = CASE WHEN failed = 1 THEN 0 ELSE available_at END, failed = 0",
+                    rows,
+                )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def claim(self, max_records: int, lease_seconds: float) -> list[SpoolRecord]:
+        """
+        Lease the oldest available batch of results of a single kind and experiment.
+
+        Returns:
+            list[SpoolRecord]: The leased records, empty if nothing is available.
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                head = self._connection.execute(
+                    "SELECT kind, experiment_id FROM records WHERE failed = 0 AND available_at <= ? ORDER BY id LIMIT 1",
+                    (now,),
+                ).fetchone()
+                rows = []
+                if head is not None:
+                    rows = self._connection.execute(
+                        f"SELECT {_RECORD_COLUMNS} FROM records "
+                        "WHERE failed = 0 AND available_at <= ? AND kind = ? AND experiment_id = ? ORDER BY id LIMIT ?",
+                        (now, *head, max_records),
+                    ).fetchall()
+                    self._connection.executemany(
+                        "UPDATE records SET available_at = ? WHERE id = ?",
+                        [(now + lease_seconds, row[0]) for row in rows],
+                    )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return [_record(row) for row in rows]
+
+    def _execute_many(self, *statements: tuple[str, list[tuple]]) -> None:
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                for query, parameters in statements:
+                    self._connection.executemany(query, parameters)
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def _release_replaced(self, records: list[SpoolRecord]) -> tuple[str, list[tuple]]:
+        # results replaced during the upload are uploaded next
+        return (
+            "UPDATE records SET available_at = 0 WHERE id = ? AND version != ?",
+            [(record.id, record.version) for record in records],
+        )
+
+    def ack(self, records: list[SpoolRecord]) -> None:
+        """Remove uploaded records, unless they were replaced in the meantime."""
+        self._execute_many(
+            (
+                "DELETE FROM records WHERE id = ? AND version = ?",
+                [(record.id, record.version) for record in records],
+            ),
+            self._release_replaced(records),
+        )
+
+    def retry(self, records: list[SpoolRecord], delay: float) -> None:
+        """Make records available again after `delay` seconds."""
+        self._execute_many(
+            (
+                "UPDATE records SET attempts = attempts + 1, available_at = ? WHERE id = ? AND version = ?",
+                [
+                    (time.time() + delay, record.id, record.version)
+                    for record in records
+                ],
+            ),
+            self._release_replaced(records),
+        )
+
+    def fail(self, records: list[SpoolRecord]) -> None:
+        """Keep records that cannot be uploaded out of the queue, for inspection."""
+        self._execute_many(
+            (
+                "UPDATE records SET attempts = attempts + 1, failed = 1 WHERE id = ? AND version = ?",
+                [(record.id, record.version) for record in records],
+            ),
+            self._release_replaced(records),
+        )
+
+    def pending(self, experiment_ids: Iterable[UUID | str] | None = None) -> int:
+        """Return the number of results still to be uploaded, of some experiments or all of them."""
+        query = "SELECT COUNT(*) FROM records WHERE failed = 0"
+        parameters: tuple = ()
+        if experiment_ids is not None:
+            parameters = tuple(str(experiment_id) for experiment_id in experiment_ids)
+            if not parameters:
+                return 0
+            query += f" AND experiment_id IN ({', '.join('?' * len(parameters))})"
+        with self._lock:
+            return self._connection.execute(query, parameters).fetchone()[0]
+
+    def failed(self) -> list[SpoolRecord]:
+        """Return the results the server rejected."""
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {_RECORD_COLUMNS} FROM records WHERE failed = 1 ORDER BY id"
+            ).fetchall()
+        return [_record(row) for row in rows]
+
+
+def _is_permanent(error: Exception) -> bool:
+    """Return whether retrying an upload cannot succeed, e.g. on validation errors."""
+    status_code = getattr(error, "status_code", None)
+    return (
+        status_code is not None
+        and 400 <= status_code < 500
+        and status_code not in (408, 429)
+    )
+
+
+class SpooledEvaluationWriter:
+    """
+    Writes evaluation results to a local spool and uploads them in the background.
+
+    The `write_*` methods return as soon as the results are durable on local
+    disk, so the evaluation loop never waits for the server. A daemon thread
+    drains the spool in batches, retrying with exponential backoff while the
+    server is unavailable. Sample evaluations and metrics are keyed by sample
+    index and metric name, so retried or replayed uploads overwrite rather than
+    duplicate results. Results spooled by a process that exited before they
+    were uploaded are uploaded by the next writer opened on the same spool.
+    `flush` and `close` only wait for the experiments this writer spooled
+    results of.
+
+    Attributes:
+        spool (EvaluationSpool): The spool results are written to.
+    """
+
+    def __init__(
+        self,
+        evaluations_api: EvaluationsApi,
+        spool: EvaluationSpool | None = None,
+        batch_size: int | None = None,
+    ):
+        self._api = evaluations_api
+        self.spool = spool or EvaluationSpool(base_url=evaluations_api._client.base_url)
+        self._experiments: set[str] = set()
+        self._batch_size = batch_size or settings.SPOOL_BATCH_SIZE
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="atria-hub-spool-uploader", daemon=True
+        )
+        self._thread.start()
+
+    def _put(
+        self,
+        kind: str,
+        evaluation_experiment_id: UUID,
+        items: list[tuple[str, Any, bytes | None]],
+    ) -> None:
+        self.spool.put(kind, evaluation_experiment_id, items)
+        self._experiments.add(str(evaluation_experiment_id))
+        self._wakeup.set()
+
+    def write_samples(
+        self, evaluation_experiment_id: UUID, data_per_sample_index: dict[int, dict]
+    ) -> None:
+        """Spool sample evaluation results, see `SampleEvaluationApi.write`."""
+        self._put(
+            SAMPLE_EVALUATION,
+            evaluation_experiment_id,
+            [(str(index), data, None) for index, data in data_per_sample_index.items()],
+        )
+
+    def write_metrics(
+        self, evaluation_experiment_id: UUID, metrics: dict[str, Any]
+    ) -> None:
+        """Spool evaluation metrics, see `EvaluationMetricsApi.write`."""
+        self._put(
+            METRIC,
+            evaluation_experiment_id,
+            [(key, value, None) for key, value in metrics.items()],
+        )
+
+    def write_explanation(
+        self,
+        evaluation_experiment_id: UUID,
+        name: str,
+        config: ConfigBase,
+        sample_index: int,
+        explanation_metadata: dict[str, Any],
+        explanation_payload: bytes,
+    ) -> None:
+        """Spool a sample explanation, see `SampleExplanationsApi.write`."""
+        config_dict = config.to_dict()
+        key = f"{name}:{sample_index}:{json.dumps(config_dict, sort_keys=True)}"
+        self._put(
+            SAMPLE_EXPLANATION,
+            evaluation_experiment_id,
+            [
+                (
+                    key,
+                    {
+                        "name": name,
+                        "config": config_dict,
+                        "sample_index": sample_index,
+                        "explanation_metadata": explanation_metadata,
+                    },
+                    explanation_payload,
+                )
+            ],
+        )
+
+    def _upload(self, records: list[SpoolRecord]) -> None:
+        kind = records[0].kind
+        experiment_id = uuid.UUID(records[0].experiment_id)
+        if kind == SAMPLE_EVALUATION:
+            self._api.sample_evaluations.write(
+                experiment_id, {int(record.key): record.data for record in records}
+            )
+        elif kind == METRIC:
+            self._api.metrics.write(
+                experiment_id, {record.key: record.data for record in records}
+            )
+        else:
+            from atriax_client.models.config_base import ConfigBase
+
+            for record in records:
+                self._api.sample_explanations.write(
+                    experiment_id,
+                    name=record.data["name"],
+                    config=ConfigBase.from_dict(record.data["config"]),
+                    sample_index=record.data["sample_index"],
+                    explanation_metadata=record.data["explanation_metadata"],
+                    explanation_payload=record.payload,
+                )
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            records = self.spool.claim(
+                self._batch_size, lease_seconds=settings.SPOOL_LEASE_SECONDS
+            )
+            if not records:
+                self._wakeup.wait(settings.SPOOL_POLL_INTERVAL_SECONDS)
+                self._wakeup.clear()
+                continue
+            try:
+                self._upload(records)
+            except Exception as e:
+                if _is_permanent(e):
+                    logger.error(
+                        f"The hub rejected {len(records)} spooled {records[0].kind} results, "
+                        f"they are kept in {self.spool.path}: {e}"
+                    )
+                    self.spool.fail(records)
+                    continue
+                attempts = max(record.attempts for record in records) + 1
+                delay = min(settings.SPOOL_MAX_BACKOFF_SECONDS, 2**attempts * 0.5)
+                logger.warning(
+                    f"Uploading {len(records)} spooled results failed, retrying in {delay:.1f}s: {e}"
+                )
+                self.spool.retry(records, delay)
+                continue
+            self.spool.ack(records)
+
+    def flush(
+        self, evaluation_experiment_id: UUID | None = None, timeout: float | None = None
+    ) -> bool:
+        """
+        Wait until the spooled results have been uploaded.
+
+        Args:
+            evaluation_experiment_id (UUID | None): Only wait for the results of
+                this experiment, instead of those of every experiment this writer
+                spooled results of.
+            timeout (float | None): Give up after this many seconds.
+
+        Returns:
+            bool: Whether all results were uploaded before the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self._wakeup.set()
+        experiments = (
+            list(self._experiments)
+            if evaluation_experiment_id is None
+            else [evaluation_experiment_id]
+        )
+        while self.spool.pending(experiments):
+            if not self._thread.is_alive() or (
+                deadline is not None and time.monotonic() >= deadline
+            ):
+                return False
+            time.sleep(0.05)
+        return True
+
+    def close(self, timeout: float | None = None) -> bool:
+        """Upload the remaining results and stop the uploader thread."""
+        uploaded = self.flush(timeout=timeout)
+        self._stopped.set()
+        self._wakeup.set()
+        self._thread.join(timeout=None if timeout is None else max(timeout, 1.0))
+        if not uploaded:
+            logger.warning(
+                f"{self.spool.pending(list(self._experiments))} evaluation results are still spooled in "
+                f"{self.spool.path} (pid {os.getpid()}), they will be uploaded by the next writer."
+            )
+        return uploaded
+
+    def __enter__(self) -> SpooledEvaluationWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from atria_hub.config import settings
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    """
+    The journal record of a single object of a transfer.
+
+    Attributes:
+        path (str): Path of the object relative to the transfer root.
+        state (str): `pending` while the object is being transferred, `done` once
+            it has been transferred completely.
+        size (int | None): Size of the transferred object in bytes.
+        mtime_ns (int | None): Modification time of the local file when it was
+            transferred.
+        checksum (str | None): Checksum of the transferred object.
+    """
+
+    path: str
+    state: str
+    size: int | None = None
+    mtime_ns: int | None = None
+    checksum: str | None = None
+
+
+class TransferJournal:
+    """
+    A persistent journal of the objects moved by uploads and downloads.
+
+    Transfers are keyed by direction, repository, branch and config, so an
+    interrupted transfer can be resumed from the objects it already completed.
+    The journal is a SQLite database that is safe to share between threads and
+    processes.
+
+    Attributes:
+        path (Path): Location of the journal database.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = Path(path or Path(settings.CACHE_DIR) / "transfers.sqlite")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, timeout=60
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS objects (
+                transfer_key TEXT NOT NULL,
+                path TEXT NOT NULL,
+                state TEXT NOT NULL,
+                size INTEGER,
+                mtime_ns INTEGER,
+                checksum TEXT,
+                PRIMARY KEY (transfer_key, path)
+            )
+            """
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def key(direction: str, repo_id: str, branch: str, config_dir: str) -> str:
+        """Return the key identifying a transfer."""
+        return f"{direction}:{repo_id}/{branch}/{config_dir}"
+
+    def _execute(self, query: str, parameters: tuple = ()) -> list[tuple]:
+        with self._lock:
+            rows = self._connection.execute(query, parameters).fetchall()
+            self._connection.commit()
+            return rows
+
+    def entries(self, transfer_key: str) -> dict[str, JournalEntry]:
+        """Return all entries of a transfer keyed by object path."""
+        rows = self._execute(
+            "SELECT path, state, size, mtime_ns, checksum FROM objects WHERE transfer_key = ?",
+            (transfer_key,),
+        )
+        return {row[0]: JournalEntry(*row) for row in rows}
+
+    def mark_pending(self, transfer_key: str, path: str) -> None:
+        """Record that an object is about to be transferred."""
+        self._execute(
+            "INSERT OR REPLACE INTO objects (transfer_key, path, state) VALUES (?, ?, 'pending')",
+            (transfer_key, path),
+        )
+
+    def mark_done(
+        self,
+        transfer_key: str,
+        path: str,
+        size: int,
+        checksum: str | None,
+        mtime_ns: int | None = None,
+    ) -> None:
+        """Record that an object has been transferred completely."""
+        self._execute(
+            "INSERT OR REPLACE INTO objects (transfer_key, path, state, size, mtime_ns, checksum) VALUES (?, ?, 'done', ?, ?, ?)",
+            (transfer_key, path, size, mtime_ns, checksum),
+        )
+
+    def clear(self, transfer_key: str) -> None:
+        """Remove all entries of a finished transfer."""
+        self._execute("DELETE FROM objects WHERE transfer_key = ?", (transfer_key,))
@@ -1,4 +1,7 @@
 import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
 
 from atria_hub.config import settings
 
@@ -25,3 +28,52 @@ def _get_content_type_from_filename(filename: str) -> str:
     if content_type is None:
         content_type = "application/octet-stream"
     return content_type
+
+
+def compute_file_hash(path: str | Path, algorithm: str = "md5") -> str:
+    """Return the hex digest of a file, read in chunks."""
+    return compute_file_hashes(path, algorithm)[algorithm]
+
+
+def compute_file_hashes(path: str | Path, *algorithms: str) -> dict[str, str]:
+    """Return the hex digests of a file for several algorithms, in a single read."""
+    import hashlib
+
+    digests = {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            for digest in digests.values():
+                digest.update(chunk)
+    return {algorithm: digest.hexdigest() for algorithm, digest in digests.items()}
+
+
+@contextmanager
+def file_lock(
+    path: str | Path, shared: bool = False, blocking: bool = True
+) -> Iterator[None]:
+    """
+    Hold an advisory lock on `path` for the duration of the block.
+
+    The lock is taken with `flock`, so it is shared between all processes on the
+    host and released automatically if the holder dies.
+
+    Args:
+        path (str | Path): The lock file, created if missing.
+        shared (bool): Take a shared instead of an exclusive lock.
+        blocking (bool): Wait for the lock, otherwise raise `BlockingIOError` if
+            another process holds it.
+    """
+    import fcntl
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(
+            f,
+            (fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            | (0 if blocking else fcntl.LOCK_NB),
+        )
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)